@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+"""DSpace Python Client benchmarks package."""
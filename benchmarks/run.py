@@ -0,0 +1,205 @@
+# benchmarks/run.py
+"""Benchmark runner.
+
+Runs client workloads against a local :class:`FakeDSpaceServer` and reports throughput,
+latency percentiles and peak memory use. Run ``python -m benchmarks.run --help`` for
+options.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from benchmarks.server import FakeDSpaceServer
+from dspace.bitstream import Bitstream
+from dspace.cache import HandleCache
+from dspace.client import DSpaceClient
+from dspace.item import Item, MetadataEntry
+from dspace.retry import default_retry_policies
+from dspace.utils import select_identifier
+
+WORKLOADS = ("item_post", "bitstream_post", "select_identifier")
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Return the value below which `fraction` of the sorted values fall."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MiB.
+
+    The fake server runs in the same process, so this includes its memory use.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_workload(
+    workload: str,
+    client: DSpaceClient,
+    server: FakeDSpaceServer,
+    count: int = 200,
+    workers: int = 8,
+    bitstream_size: int = 1024 * 1024,
+) -> Dict[str, Any]:
+    """Run a workload and return its measurements.
+
+    Args:
+        workload: One of "item_post", "bitstream_post" or "select_identifier"
+        client: An authenticated :class:`DSpaceClient` for the fake server
+        server: The running :class:`FakeDSpaceServer`
+        count: The number of operations to run, defaults to 200
+        workers: The number of threads running operations, defaults to 8
+        bitstream_size: The size in bytes of each posted bitstream, defaults to 1 MiB
+
+    Returns:
+        Dict of the workload's measurements
+    """
+    operation: Callable[[int], None]
+    payload_bytes = 0
+    cleanup: List[str] = []
+    if workload == "item_post":
+
+        def operation(i: int) -> None:
+            item = Item(metadata=[MetadataEntry(key="dc.title", value=f"Item {i}")])
+            item.post(client, collection_uuid=server.collection_uuid)
+
+    elif workload == "bitstream_post":
+        item = Item(metadata=[MetadataEntry(key="dc.title", value="Bitstreams")])
+        item.post(client, collection_uuid=server.collection_uuid)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".bin") as f:
+            f.write(os.urandom(bitstream_size))
+        cleanup.append(f.name)
+        payload_bytes = bitstream_size * count
+
+        def operation(i: int) -> None:
+            bitstream = Bitstream(name=f"file-{i}.bin", file_path=f.name)
+            bitstream.post(client, item_uuid=item.uuid)
+
+    elif workload == "select_identifier":
+        handles: List[Optional[str]] = []
+        for i in range(min(count, 100)):
+            item = Item(metadata=[MetadataEntry(key="dc.title", value=f"Item {i}")])
+            item.post(client, collection_uuid=server.collection_uuid)
+            handles.append(item.handle)
+
+        def operation(i: int) -> None:
+            select_identifier(client, handles[i % len(handles)], None)
+
+    else:
+        raise ValueError(f"Unknown workload {workload!r}, expected one of {WORKLOADS}")
+
+    latencies: List[float] = []
+    errors: List[Exception] = []
+
+    def timed(i: int) -> None:
+        started = time.perf_counter()
+        try:
+            operation(i)
+        except Exception as e:
+            errors.append(e)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(timed, range(count)))
+    finally:
+        for path in cleanup:
+            os.remove(path)
+    elapsed = time.perf_counter() - started
+    return {
+        "workload": workload,
+        "operations": count,
+        "errors": len(errors),
+        "seconds": round(elapsed, 3),
+        "operations_per_second": round(count / elapsed, 1),
+        "mb_per_second": round(payload_bytes / elapsed / (1024 * 1024), 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """Run the benchmarks requested on the command line and print the results."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the DSpace client against a local fake DSpace server."
+    )
+    parser.add_argument(
+        "workloads", nargs="*", default=WORKLOADS, help="workloads to run"
+    )
+    parser.add_argument("--count", type=int, default=200, help="operations per run")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent threads")
+    parser.add_argument(
+        "--bitstream-size", type=int, default=1024 * 1024, help="bytes per bitstream"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.005, help="server latency in seconds"
+    )
+    parser.add_argument(
+        "--bandwidth", type=float, default=None, help="server bytes per second"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="fraction of requests to fail"
+    )
+    parser.add_argument(
+        "--retry", action="store_true", help="retry with the default retry policies"
+    )
+    parser.add_argument(
+        "--no-handle-cache", action="store_true", help="disable the handle cache"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="error injection seed")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    for workload in args.workloads:
+        with FakeDSpaceServer(
+            latency=args.latency,
+            bandwidth=args.bandwidth,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        ) as server, DSpaceClient(
+            server.base_url,
+            timeout=30.0,
+            pool_maxsize=args.workers,
+            handle_cache=HandleCache(maxsize=0) if args.no_handle_cache else None,
+            retry_policies=default_retry_policies() if args.retry else None,
+        ) as client:
+            client.login("benchmark@example.com", "password")
+            results.append(
+                run_workload(
+                    workload,
+                    client,
+                    server,
+                    count=args.count,
+                    workers=args.workers,
+                    bitstream_size=args.bitstream_size,
+                )
+            )
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        columns = list(results[0]) if results else []
+        widths = [max(len(column), 8) for column in columns]
+        print("  ".join(f"{c:>{w}}" for c, w in zip(columns, widths)))
+        for result in results:
+            print("  ".join(f"{result[c]!s:>{w}}" for c, w in zip(columns, widths)))
+    return results
+
+
+if __name__ == "__main__":
+    main()
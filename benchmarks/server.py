@@ -0,0 +1,290 @@
+# benchmarks/server.py
+"""Fake DSpace REST server for benchmarks.
+
+This module includes a FakeDSpaceServer class implementing the subset of the DSpace 6
+REST API used by the client, with configurable latency, bandwidth and error injection,
+so client performance can be measured locally under repeatable conditions.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+CHUNK_SIZE = 64 * 1024
+
+
+class FakeDSpaceServer:
+    """An in-process HTTP server imitating a DSpace 6 REST API.
+
+    Implements "/login", "/status", "/handle/{handle}", "/collections/{id}/items",
+    "/items/{id}", "/items/{id}/bitstreams" and "/bitstreams/{id}". Objects are kept
+    in memory; posted bitstream content is hashed and discarded. One collection
+    exists when the server starts, see `collection_uuid` and `collection_handle`.
+
+    Args:
+        latency: Seconds to wait before responding to each request, defaults to 0.0
+        bandwidth: Maximum bytes per second to read request bodies and write response
+            bodies at, per connection, defaults to None (unlimited)
+        error_rate: Fraction of requests, between 0.0 and 1.0, to answer with a 503
+            status, defaults to 0.0
+        seed: Seed for the random error injection, defaults to None
+        host: Host to listen on, defaults to "127.0.0.1"
+        port: Port to listen on, defaults to 0 (any free port)
+
+    Attributes:
+        collection_handle (str): Handle of the collection the server starts with
+        collection_uuid (str): UUID of the collection the server starts with
+        request_count (int): Number of requests received
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        bandwidth: Optional[float] = None,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.request_count = 0
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        self.handles: Dict[str, str] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.parents: Dict[str, str] = {}
+        self._random = random.Random(seed)  # nosec B311
+        self._lock = threading.Lock()
+        self._next_handle = 1
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.dspace = self  # type: ignore[attr-defined]
+        self._thread: Optional[threading.Thread] = None
+        collection = self._create("collection", {"name": "Benchmark Collection"})
+        self.collection_uuid: str = collection["uuid"]
+        self.collection_handle: str = collection["handle"]
+
+    def __enter__(self) -> FakeDSpaceServer:
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def __repr__(self):
+        return (
+            f"FakeDSpaceServer(base_url='{self.base_url}', latency={self.latency}, "
+            f"bandwidth={self.bandwidth}, error_rate={self.error_rate})"
+        )
+
+    @property
+    def base_url(self) -> str:
+        """The base url of the fake DSpace API, to pass to :class:`DSpaceClient`."""
+        host, port = self._httpd.server_address[:2]
+        host = host.decode() if isinstance(host, bytes) else host
+        return f"http://{host}:{port}/rest"
+
+    def start(self) -> None:
+        """Start serving requests in a background thread."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fake-dspace", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving requests and close the listening socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def handle(
+        self, method: str, path: str, query: Dict[str, List[str]], body: bytes
+    ) -> Tuple[int, Any, Dict[str, str]]:
+        """Return the status, JSON body and headers of the response to a request."""
+        with self._lock:
+            self.request_count += 1
+            fail = self._random.random() < self.error_rate
+        if fail:
+            return 503, {"error": "Injected failure"}, {}
+        parts = path.strip("/").split("/")[1:]
+        route = (method, parts[0] if parts else "", len(parts))
+        if route == ("POST", "login", 1):
+            session = uuid.uuid4().hex
+            return 200, None, {"Set-Cookie": f"JSESSIONID={session}; Path=/rest"}
+        if route == ("GET", "status", 1):
+            return 200, {"okay": True, "authenticated": True}, {}
+        if route == ("GET", "handle", 3):
+            object_uuid = self.handles.get(f"{parts[1]}/{parts[2]}")
+            if object_uuid is None:
+                # DSpace 6 responds to unknown handles with a server error
+                return 500, {"error": "Handle not found"}, {}
+            return 200, self.objects[object_uuid], {}
+        if len(parts) < 2 or parts[1] not in self.objects:
+            return 404, {"error": "Not found"}, {}
+        parent = parts[1]
+        if route == ("GET", "collections", 3) and parts[2] == "items":
+            limit = int(query.get("limit", ["100"])[0])
+            offset = int(query.get("offset", ["0"])[0])
+            page = self.children.get(parent, [])[offset : offset + limit]
+            return 200, [self.objects[child] for child in page], {}
+        if route == ("POST", "collections", 3) and parts[2] == "items":
+            metadata = json.loads(body or b"{}").get("metadata", [])
+            title = next((m["value"] for m in metadata if m["key"] == "dc.title"), "")
+            item = self._create("item", {"name": title}, parent)
+            item["metadata"] = metadata
+            return 200, item, {}
+        if route == ("GET", "items", 3) and parts[2] == "bitstreams":
+            return 200, [self.objects[b] for b in self.children.get(parent, [])], {}
+        if route == ("POST", "items", 3) and parts[2] == "bitstreams":
+            bitstream = self._create(
+                "bitstream",
+                {
+                    "name": query.get("name", [None])[0],
+                    "description": query.get("description", [None])[0],
+                    "bundleName": "ORIGINAL",
+                    "checkSum": {
+                        "value": hashlib.md5(  # nosec B324
+                            body, usedforsecurity=False
+                        ).hexdigest(),
+                        "checkSumAlgorithm": "MD5",
+                    },
+                    "format": "Unknown",
+                    "mimeType": "application/octet-stream",
+                    "parentObject": None,
+                    "policies": None,
+                    "sequenceId": len(self.children.get(parent, [])) + 1,
+                    "sizeBytes": len(body),
+                },
+                parent,
+            )
+            bitstream["retrieveLink"] = f"/bitstreams/{bitstream['uuid']}/retrieve"
+            return 200, bitstream, {}
+        if route in (("GET", "items", 2), ("GET", "bitstreams", 2)):
+            return 200, self.objects[parent], {}
+        if route in (("DELETE", "items", 2), ("DELETE", "bitstreams", 2)):
+            self._delete(parent)
+            return 200, None, {}
+        return 404, {"error": "Not found"}, {}
+
+    def _create(
+        self, object_type: str, fields: Dict[str, Any], parent: Optional[str] = None
+    ) -> Dict[str, Any]:
+        object_uuid = str(uuid.uuid4())
+        endpoint = "collections" if object_type == "collection" else f"{object_type}s"
+        obj = {
+            "uuid": object_uuid,
+            "type": object_type,
+            "link": f"/rest/{endpoint}/{object_uuid}",
+            "expand": ["all"],
+            "handle": None,
+            "lastModified": datetime.now(timezone.utc).strftime(
+                "%a %b %d %H:%M:%S UTC %Y"
+            ),
+            "parentCollection": None,
+            "parentCollectionList": None,
+            "parentCommunityList": None,
+            "archived": "true",
+            "withdrawn": "false",
+            **fields,
+        }
+        with self._lock:
+            if object_type != "bitstream":
+                obj["handle"] = f"0000.0/{self._next_handle}"
+                self._next_handle += 1
+                self.handles[obj["handle"]] = object_uuid
+            self.objects[object_uuid] = obj
+            if parent:
+                self.parents[object_uuid] = parent
+                self.children.setdefault(parent, []).append(object_uuid)
+        return obj
+
+    def _delete(self, object_uuid: str) -> None:
+        with self._lock:
+            obj = self.objects.pop(object_uuid)
+            self.handles.pop(obj["handle"], None)
+            parent = self.parents.pop(object_uuid, None)
+            if parent in self.children:
+                self.children[parent].remove(object_uuid)
+            for child in self.children.pop(object_uuid, []):
+                self.objects.pop(child, None)
+                self.parents.pop(child, None)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    disable_nagle_algorithm = True
+    protocol_version = "HTTP/1.1"
+
+    def do_DELETE(self) -> None:
+        self._respond()
+
+    def do_GET(self) -> None:
+        self._respond()
+
+    def do_POST(self) -> None:
+        self._respond()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _respond(self) -> None:
+        dspace: FakeDSpaceServer = self.server.dspace  # type: ignore[attr-defined]
+        url = urlsplit(self.path)
+        body = self._read_body(dspace.bandwidth)
+        if dspace.latency:
+            time.sleep(dspace.latency)
+        status, content, headers = dspace.handle(
+            self.command, url.path, parse_qs(url.query), body
+        )
+        payload = b"" if content is None else json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        _throttle(self.wfile.write, payload, dspace.bandwidth)
+
+    def _read_body(self, bandwidth: Optional[float]) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks: List[bytes] = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return b"".join(chunks)
+                chunks.append(_throttled_read(self.rfile.read, size, bandwidth))
+                self.rfile.readline()
+        length = int(self.headers.get("Content-Length") or 0)
+        return _throttled_read(self.rfile.read, length, bandwidth)
+
+
+def _throttle(write: Any, payload: bytes, bandwidth: Optional[float]) -> None:
+    for start in range(0, len(payload), CHUNK_SIZE):
+        chunk = payload[start : start + CHUNK_SIZE]
+        write(chunk)
+        if bandwidth:
+            time.sleep(len(chunk) / bandwidth)
+
+
+def _throttled_read(read: Any, length: int, bandwidth: Optional[float]) -> bytes:
+    chunks: List[bytes] = []
+    remaining = length
+    while remaining > 0:
+        chunk = read(min(CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+        if bandwidth:
+            time.sleep(len(chunk) / bandwidth)
+    return b"".join(chunks)
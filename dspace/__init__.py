@@ -2,8 +2,13 @@
 """DSpace Python Client package."""
 import logging
 
+from dspace.async_client import AsyncDSpaceClient  # noqa
 from dspace.bitstream import Bitstream  # noqa
+from dspace.cache import HandleCache  # noqa
 from dspace.client import DSpaceClient  # noqa
+from dspace.collection import Collection  # noqa
+from dspace.community import Community  # noqa
 from dspace.item import Item, MetadataEntry  # noqa
+from dspace.metadata import MetadataTable  # noqa
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -0,0 +1,224 @@
+# dspace/async_client.py
+"""DSpace async client module.
+
+This module includes an AsyncDSpaceClient class, an asyncio counterpart to
+:class:`DSpaceClient` for sending many requests to the DSpace REST API concurrently.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Iterable, Optional, TypeVar, Union
+
+import requests
+
+from dspace.bitstream import Bitstream
+from dspace.client import DSpaceClient
+from dspace.item import Item
+from dspace.utils import select_identifier
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncDSpaceClient:
+    """An asyncio client class for interacting with the DSpace REST API.
+
+    Each awaitable method runs the equivalent blocking call on a wrapped
+    :class:`DSpaceClient` in a bounded pool of worker threads, so up to
+    `max_concurrency` requests can be in flight at once while sharing the wrapped
+    client's keep-alive connection pool and authentication cookie.
+
+    Args:
+        base_url: The base url of the DSpace API
+        accept_header: The response type to use in the requests "accept" header -- one
+            of "application/json" or "application/xml", defaults to "application/json"
+        timeout: The timeout, in seconds, to use for all requests sent to the DSpace
+            API, defaults to 3.0
+        max_concurrency: The maximum number of operations to run against the DSpace
+            API at once, defaults to 10. Also used as the size of the wrapped client's
+            connection pool
+        client: An existing :class:`DSpaceClient` instance to wrap instead of creating
+            a new one from the other arguments. It is not closed by :meth:`close`;
+            its owner remains responsible for closing it
+
+    Attributes:
+        client: The wrapped :class:`DSpaceClient` instance
+        max_concurrency: The maximum number of concurrent operations
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        accept_header: str = "application/json",
+        timeout: float = 3.0,
+        max_concurrency: int = 10,
+        client: Optional[DSpaceClient] = None,
+    ):
+        self._owns_client = client is None
+        if client is None:
+            if base_url is None:
+                raise ValueError("Either base_url or client must be provided.")
+            client = DSpaceClient(
+                base_url,
+                accept_header=accept_header,
+                timeout=timeout,
+                pool_maxsize=max_concurrency,
+            )
+        self.client: DSpaceClient = client
+        self.max_concurrency: int = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="dspace-async"
+        )
+        logger.debug(
+            f"Async client initialized with params base_url={self.client.base_url}, "
+            f"max_concurrency={self.max_concurrency}"
+        )
+
+    async def __aenter__(self) -> AsyncDSpaceClient:
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def __repr__(self):
+        return (
+            f"AsyncDSpaceClient(base_url='{self.client.base_url}', "
+            f"max_concurrency={self.max_concurrency})"
+        )
+
+    @property
+    def base_url(self) -> str:
+        """The base url of the wrapped client."""
+        return self.client.base_url
+
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def close(self) -> None:
+        """Wait for in-flight operations to finish and close the connection pool.
+
+        The connection pool is only closed if the wrapped client was created by this
+        instance, not if it was passed in as `client`.
+        """
+        await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self._executor.shutdown, wait=True)
+        )
+        if self._owns_client:
+            self.client.close()
+
+    async def delete(self, endpoint: str) -> requests.Response:
+        """Awaitable version of :meth:`DSpaceClient.delete`."""
+        return await self._run(self.client.delete, endpoint)
+
+    async def get(
+        self, endpoint: str, params: Optional[dict] = None
+    ) -> requests.Response:
+        """Awaitable version of :meth:`DSpaceClient.get`."""
+        return await self._run(self.client.get, endpoint, params=params)
+
+    async def get_object_by_handle(self, handle: str) -> requests.Response:
+        """Awaitable version of :meth:`DSpaceClient.get_object_by_handle`."""
+        return await self._run(self.client.get_object_by_handle, handle)
+
+    async def login(self, email: str, password: str) -> None:
+        """Awaitable version of :meth:`DSpaceClient.login`."""
+        await self._run(self.client.login, email, password)
+
+    async def post(
+        self,
+        endpoint: str,
+        data: Optional[Union[bytes, dict, BinaryIO, Iterable[bytes]]] = None,
+        json: Optional[Union[dict, list]] = None,
+        params: Optional[dict] = None,
+    ) -> requests.Response:
+        """Awaitable version of :meth:`DSpaceClient.post`."""
+        return await self._run(
+            self.client.post, endpoint, data=data, json=json, params=params
+        )
+
+    async def put(
+        self,
+        endpoint: str,
+        data: Optional[Union[bytes, dict, BinaryIO, Iterable[bytes]]] = None,
+        json: Optional[Union[dict, list]] = None,
+        params: Optional[dict] = None,
+    ) -> requests.Response:
+        """Awaitable version of :meth:`DSpaceClient.put`."""
+        return await self._run(
+            self.client.put, endpoint, data=data, json=json, params=params
+        )
+
+    async def status(self) -> requests.Response:
+        """Awaitable version of :meth:`DSpaceClient.status`."""
+        return await self._run(self.client.status)
+
+    async def delete_item(self, item: Item) -> None:
+        """Awaitable version of :meth:`Item.delete`.
+
+        Args:
+            item: The :class:`Item` to delete
+        """
+        await self._run(item.delete, self.client)
+
+    async def post_bitstream(
+        self,
+        bitstream: Bitstream,
+        item_handle: Optional[str] = None,
+        item_uuid: Optional[str] = None,
+    ) -> None:
+        """Awaitable version of :meth:`Bitstream.post`.
+
+        Args:
+            bitstream: The :class:`Bitstream` to post
+            item_handle: The handle of an existing item in DSpace to post the bitstream
+                to
+            item_uuid: The UUID of an existing item in DSpace to post the bitstream to
+        """
+        await self._run(
+            bitstream.post, self.client, item_handle=item_handle, item_uuid=item_uuid
+        )
+
+    async def post_item(
+        self,
+        item: Item,
+        collection_handle: Optional[str] = None,
+        collection_uuid: Optional[str] = None,
+    ) -> None:
+        """Awaitable version of :meth:`Item.post`.
+
+        Args:
+            item: The :class:`Item` to post
+            collection_handle: The handle of an existing collection in DSpace to post
+                the item to
+            collection_uuid: The UUID of an existing collection in DSpace to post the
+                item to
+        """
+        await self._run(
+            item.post,
+            self.client,
+            collection_handle=collection_handle,
+            collection_uuid=collection_uuid,
+        )
+
+    async def select_identifier(
+        self, handle: Optional[str], uuid: Optional[str]
+    ) -> str:
+        """Awaitable version of :func:`dspace.utils.select_identifier`.
+
+        Args:
+            handle: Handle of a DSpace object
+            uuid: UUID of a DSpace object
+
+        Returns:
+            UUID of DSpace object
+        """
+        if uuid:
+            return uuid
+        return await self._run(select_identifier, self.client, handle, uuid)
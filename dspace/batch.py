@@ -0,0 +1,540 @@
+# dspace/batch.py
+"""DSpace batch module.
+
+This module includes functions for running many DSpace REST API operations
+concurrently, such as ingesting a batch of items and their bitstreams or deleting the
+items of a collection.
+"""
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import chain
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from dspace.bitstream import Bitstream
+from dspace.client import DSpaceClient
+from dspace.duplicates import DuplicateIndex, DuplicateMatch
+from dspace.item import Item, MetadataDiff, MetadataEntry
+from dspace.journal import DONE, IngestJournal, item_key
+from dspace.utils import select_identifier
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class DeleteResult:
+    """Class representing the outcome of deleting a single item or bitstream.
+
+    Args:
+        object_type: The type of the object, "item" or "bitstream"
+        uuid: The UUID of the object, if known
+        handle: The handle of the object, if known
+        error: The exception raised while deleting the object, if any
+        dry_run: Whether the object was only listed and not deleted
+
+    Attributes:
+        dry_run (bool): Whether the object was only listed and not deleted
+        error (Optional[Exception]): The exception raised while deleting the object,
+            or while resolving its handle
+        handle (Optional[str]): The handle of the object, if known
+        object_type (str): The type of the object, "item" or "bitstream"
+        uuid (Optional[str]): The UUID of the object. None if its handle could not
+            be resolved
+    """
+
+    def __init__(
+        self,
+        object_type: str,
+        uuid: Optional[str],
+        handle: Optional[str] = None,
+        error: Optional[Exception] = None,
+        dry_run: bool = False,
+    ):
+        self.object_type = object_type
+        self.uuid = uuid
+        self.handle = handle
+        self.error = error
+        self.dry_run = dry_run
+
+    def __repr__(self):
+        return (
+            f"DeleteResult(object_type={self.object_type!r}, uuid={self.uuid}, "
+            f"handle={self.handle}, error={self.error!r}, dry_run={self.dry_run})"
+        )
+
+    @property
+    def deleted(self) -> bool:
+        """True if the object was deleted from DSpace."""
+        return self.error is None and not self.dry_run
+
+    @property
+    def ok(self) -> bool:
+        """True if the object was deleted, or listed in a dry run, without error."""
+        return self.error is None
+
+
+class IngestResult:
+    """Class representing the outcome of ingesting a single item.
+
+    Args:
+        item: The :class:`Item` that was ingested
+        error: The exception raised while ingesting the item, if any
+        skipped: Whether the item was skipped because a journal recorded it as
+            already ingested, or because it duplicates an item already in DSpace
+        duplicate: The item already in DSpace that the item duplicates, if any
+
+    Attributes:
+        item (:obj:`Item`): The ingested item. If the item itself was posted, its
+            attributes (including `uuid`) are set to the DSpace response values even
+            when posting one of its bitstreams subsequently failed
+        duplicate (Optional[:obj:`DuplicateMatch`]): The item already in DSpace that
+            the item duplicates. The item was skipped or updated instead of posted
+        error (Optional[Exception]): The exception raised while ingesting the item
+        skipped (bool): Whether the item was skipped because a journal recorded it as
+            already ingested, or because it duplicates an item already in DSpace
+    """
+
+    def __init__(
+        self,
+        item: Item,
+        error: Optional[Exception] = None,
+        skipped: bool = False,
+        duplicate: Optional[DuplicateMatch] = None,
+    ):
+        self.item = item
+        self.error = error
+        self.skipped = skipped
+        self.duplicate = duplicate
+
+    def __repr__(self):
+        return (
+            f"IngestResult(item={self.item.uuid}, error={self.error!r}, "
+            f"skipped={self.skipped}, duplicate={self.duplicate!r})"
+        )
+
+    @property
+    def ok(self) -> bool:
+        """True if the item and all of its bitstreams were posted successfully."""
+        return self.error is None
+
+
+class UpdateResult:
+    """Class representing the outcome of updating a single item's metadata.
+
+    Args:
+        item: The :class:`Item` that was updated
+        diff: The :class:`MetadataDiff` of the changes sent, if any
+        error: The exception raised while updating the item, if any
+
+    Attributes:
+        item (:obj:`Item`): The updated item
+        diff (Optional[:obj:`MetadataDiff`]): The changes sent. None if the item was
+            skipped or the update failed
+        error (Optional[Exception]): The exception raised while updating the item
+    """
+
+    def __init__(
+        self,
+        item: Item,
+        diff: Optional[MetadataDiff] = None,
+        error: Optional[Exception] = None,
+    ):
+        self.item = item
+        self.diff = diff
+        self.error = error
+
+    def __repr__(self):
+        return (
+            f"UpdateResult(item={self.item.uuid}, diff={self.diff!r}, "
+            f"error={self.error!r})"
+        )
+
+    @property
+    def changed(self) -> bool:
+        """True if any changes were sent to DSpace for the item."""
+        return bool(self.diff)
+
+    @property
+    def ok(self) -> bool:
+        """True if the item was updated or skipped without error."""
+        return self.error is None
+
+
+def run_concurrently(
+    func: Callable[[T], R], tasks: Iterable[T], max_workers: int
+) -> Iterator[R]:
+    """Run a function over tasks in a bounded pool of threads, yielding as completed.
+
+    Tasks are consumed from the iterable lazily, so no more than twice `max_workers`
+    tasks are held in memory at once.
+
+    Args:
+        func: Function to call with each task. It should handle its own errors and
+            return a result object, as any exception raised is re-raised to the caller
+        tasks: Iterable of tasks
+        max_workers: Maximum number of threads to run `func` in
+
+    Yields:
+        The return value of `func` for each task, in order of completion
+    """
+    pending = iter(tasks)
+    exhausted = False
+    in_flight: Dict[Future, T] = {}
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="dspace-batch"
+    )
+    try:
+        while True:
+            while not exhausted and len(in_flight) < max_workers * 2:
+                try:
+                    task = next(pending)
+                except StopIteration:
+                    exhausted = True
+                else:
+                    in_flight[executor.submit(func, task)] = task
+            if not in_flight:
+                return
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                del in_flight[future]
+                yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def ingest_items(
+    client: DSpaceClient,
+    items: Iterable[Item],
+    collection_handle: Optional[str] = None,
+    collection_uuid: Optional[str] = None,
+    max_workers: int = 8,
+    journal: Optional[IngestJournal] = None,
+    key_func: Callable[[Item], str] = item_key,
+    duplicate_index: Optional[DuplicateIndex] = None,
+    on_duplicate: str = "skip",
+) -> Iterator[IngestResult]:
+    """Post items and their bitstreams to a collection concurrently.
+
+    Each item is posted to the collection, followed by each of the bitstreams in its
+    `bitstreams` list. Up to `max_workers` items are ingested at once. A failure to
+    ingest one item is reported in its result and does not stop the rest of the batch.
+
+    Requires either the `collection_handle` or the `collection_uuid`, but not both.
+    If both are passed, defaults to using the UUID. The collection handle is only
+    resolved once for the whole batch.
+
+    If a `journal` is provided, the progress of each item is recorded in it. Running
+    the same batch again with the same journal skips items already done, and resumes
+    items that were posted but not all of whose bitstreams were, using the recorded
+    item UUID instead of posting a duplicate item.
+
+    If a `duplicate_index` is provided, each item is first looked up in it, without
+    a request to DSpace. An item matching an indexed item is not posted: with
+    `on_duplicate` "skip" it is reported as skipped, and with "update" the indexed
+    item's metadata is updated to the item's (see :meth:`Item.update_metadata`) and
+    its bitstreams are not posted. Either way the result's `duplicate` is the match.
+    Each item is added to the index as soon as it is posted or updated, even if
+    posting one of its bitstreams then fails, so a retry or a later batch finds it
+    rather than posting it again. Items a journal records as posted are resumed
+    rather than looked up. Duplicates within a batch are only detected once the
+    first of them has been posted.
+
+    Args:
+        client: An authenticated instance of the :class:`DSpaceClient` class. Its
+            `pool_maxsize` should be at least `max_workers`
+        items: Iterable of :class:`Item` objects to post
+        collection_handle: The handle of an existing collection in DSpace to post
+            the items to
+        collection_uuid: The UUID of an existing collection in DSpace to post the
+            items to
+        max_workers: The maximum number of items to ingest at once, defaults to 8
+        journal: Optional :class:`IngestJournal` to record and resume progress with
+        key_func: Function returning the key identifying each item in the journal,
+            defaults to :func:`dspace.journal.item_key`
+        duplicate_index: Optional :class:`DuplicateIndex` of the items already in
+            DSpace
+        on_duplicate: What to do with an item matching an indexed item, "skip" or
+            "update", defaults to "skip"
+
+    Yields:
+        :class:`IngestResult` for each item, in order of completion
+
+    Raises:
+        :class:`requests.HTTPError`: 404 Not Found if no collection matching
+            provided handle
+        MissingIdentifierError: if neither `collection_handle` nor `collection_uuid`
+            parameter is provided
+        ValueError: if `on_duplicate` is not "skip" or "update"
+    """
+    if on_duplicate not in ("skip", "update"):
+        raise ValueError(
+            f"on_duplicate must be 'skip' or 'update', not {on_duplicate!r}"
+        )
+    collection_id = select_identifier(client, collection_handle, collection_uuid)
+    logger.debug(
+        "Ingesting items to collection %s with %d workers", collection_id, max_workers
+    )
+
+    def ingest(item: Item) -> IngestResult:
+        try:
+            duplicate = find_duplicate(item)
+            if duplicate is not None:
+                return ingest_duplicate(item, duplicate)
+            if journal is not None:
+                return ingest_with_journal(item, journal)
+            post_item(item)
+            for bitstream in item.bitstreams:
+                bitstream.post(client, item_uuid=item.uuid)
+            return IngestResult(item)
+        except Exception as e:
+            logger.debug("Error ingesting item %s: %s", item.uuid, e)
+            return IngestResult(item, error=e)
+
+    def post_item(item: Item) -> None:
+        item.post(client, collection_uuid=collection_id)
+        # Index the item as soon as it exists, so that if posting a bitstream fails,
+        # retrying the item finds it rather than posting it again
+        if duplicate_index is not None:
+            duplicate_index.add(item)
+
+    def find_duplicate(item: Item) -> Optional[DuplicateMatch]:
+        if duplicate_index is None:
+            return None
+        if journal is not None and journal.get(key_func(item))[1]:
+            return None
+        return duplicate_index.find(item)
+
+    def ingest_duplicate(item: Item, duplicate: DuplicateMatch) -> IngestResult:
+        item.uuid = duplicate.uuid
+        item.handle = duplicate.handle
+        if on_duplicate == "skip":
+            logger.debug("Skipping item duplicating %s", duplicate)
+            return IngestResult(item, skipped=True, duplicate=duplicate)
+        logger.debug("Updating item duplicated by %s", duplicate)
+        item.update_metadata(client, item.metadata)
+        cast(DuplicateIndex, duplicate_index).add(item)
+        return IngestResult(item, duplicate=duplicate)
+
+    def ingest_with_journal(item: Item, journal: IngestJournal) -> IngestResult:
+        key = key_func(item)
+        state, uuid = journal.get(key)
+        if state == DONE:
+            logger.debug("Skipping item %s, already ingested", uuid)
+            item.uuid = uuid
+            return IngestResult(item, skipped=True)
+        if uuid:
+            logger.debug("Resuming partially ingested item %s", uuid)
+            item.uuid = uuid
+            if duplicate_index is not None:
+                duplicate_index.add(item)
+        else:
+            journal.record_pending(key)
+            post_item(item)
+            journal.record_item_posted(key, cast(str, item.uuid))
+        posted = journal.posted_bitstreams(key)
+        for position, bitstream in enumerate(item.bitstreams):
+            if position in posted:
+                bitstream.uuid = posted[position]
+                continue
+            bitstream.post(client, item_uuid=item.uuid)
+            journal.record_bitstream_posted(key, position, bitstream.uuid)
+        journal.record_done(key)
+        return IngestResult(item)
+
+    yield from run_concurrently(ingest, items, max_workers)
+
+
+def update_items_metadata(
+    client: DSpaceClient,
+    items: Iterable[Item],
+    transform: Callable[[Item], Optional[List[MetadataEntry]]],
+    max_workers: int = 8,
+    remove_missing: bool = False,
+) -> Iterator[UpdateResult]:
+    """Update the metadata of many items concurrently, sending only what has changed.
+
+    For each item, `transform` is called with the item and returns its desired
+    metadata, or None to leave the item unchanged. The desired metadata is compared
+    with the item's `metadata` attribute and only the differences are sent, see
+    :meth:`Item.update_metadata`. Items should therefore be retrieved from DSpace with
+    :meth:`Item.get` or :meth:`Item.iter_collection`, ideally with
+    `expand=["metadata"]` so no further request is needed to read their metadata.
+    Up to `max_workers` items are updated at once. A failure to update one item is
+    reported in its result and does not stop the rest of the batch.
+
+    For example, to correct a field across a collection::
+
+        def fix_type(item):
+            if not any(m.value == "Thesis " for m in item.metadata):
+                return None
+            return [
+                MetadataEntry(m.key, m.value.strip(), m.language)
+                if m.key == "dc.type" else m
+                for m in item.metadata
+            ]
+
+        items = Item.iter_collection(client, collection_handle, expand=["metadata"])
+        for result in update_items_metadata(client, items, fix_type):
+            ...
+
+    Args:
+        client: An authenticated instance of the :class:`DSpaceClient` class. Its
+            `pool_maxsize` should be at least `max_workers`
+        items: Iterable of :class:`Item` objects to update
+        transform: Function returning the desired metadata of an item, or None to
+            skip it
+        max_workers: The maximum number of items to update at once, defaults to 8
+        remove_missing: Whether to remove keys missing from the desired metadata,
+            defaults to False. Removing keys replaces all of an item's metadata in
+            two requests, which is not atomic; an item whose replacement fails is
+            restored and its result's `error` is a :class:`MetadataUpdateError`
+
+    Yields:
+        :class:`UpdateResult` for each item, in order of completion
+    """
+
+    def update(item: Item) -> UpdateResult:
+        try:
+            metadata = transform(item)
+            if metadata is None:
+                return UpdateResult(item)
+            diff = item.update_metadata(
+                client,
+                metadata,
+                current=item.metadata,
+                remove_missing=remove_missing,
+            )
+        except Exception as e:
+            logger.debug("Error updating item %s: %s", item.uuid, e)
+            return UpdateResult(item, error=e)
+        return UpdateResult(item, diff=diff)
+
+    yield from run_concurrently(update, items, max_workers)
+
+
+def delete_objects(
+    client: DSpaceClient,
+    item_uuids: Iterable[str] = (),
+    item_handles: Iterable[str] = (),
+    bitstream_uuids: Iterable[str] = (),
+    collection_handle: Optional[str] = None,
+    collection_uuid: Optional[str] = None,
+    max_workers: int = 8,
+    dry_run: bool = False,
+    limit: int = 100,
+) -> Iterator[DeleteResult]:
+    """Delete many items and bitstreams concurrently.
+
+    Deletes the items and bitstreams identified by the given UUIDs and handles,
+    followed by every item in a collection if `collection_handle` or
+    `collection_uuid` is passed (deleting an item also deletes its bitstreams). Up to
+    `max_workers` objects are deleted at once, subject to the client's
+    `rate_limiter` if it has one. A failure to delete one object is reported in its
+    result and does not stop the rest. All arguments are consumed lazily, so
+    generators of millions of UUIDs can be passed.
+
+    The collection is listed one page of `limit` items at a time, and each page is
+    deleted before the next is requested. As deleting items shifts the positions of
+    the remaining items in the listing, each page is requested at an offset equal to
+    the number of items listed so far that were not deleted, which relies on DSpace
+    listing a collection's items in a stable order. Pages are never served from the
+    client's `response_cache`, as deleting items makes cached pages stale.
+
+    With `dry_run`, nothing is deleted: handles are resolved and the collection is
+    listed, and a result is yielded for each object that would be deleted.
+
+    Args:
+        client: An authenticated instance of the :class:`DSpaceClient` class. Its
+            `pool_maxsize` should be at least `max_workers`
+        item_uuids: UUIDs of items to delete
+        item_handles: Handles of items to delete. A handle of any other type of
+            object is reported as an error rather than deleted
+        bitstream_uuids: UUIDs of bitstreams to delete
+        collection_handle: The handle of a collection whose items to delete
+        collection_uuid: The UUID of a collection whose items to delete. If both are
+            passed, defaults to using the UUID
+        max_workers: The maximum number of objects to delete at once, defaults to 8
+        dry_run: Whether to only list the objects that would be deleted, defaults to
+            False
+        limit: The number of collection items to request per page, defaults to 100
+
+    Yields:
+        :class:`DeleteResult` for each object, in order of completion
+
+    Raises:
+        :class:`requests.HTTPError`: if the collection or one of its pages cannot be
+            retrieved
+    """
+    tasks: Iterator[Tuple[str, Optional[str], Optional[str]]] = chain(
+        (("item", uuid, None) for uuid in item_uuids),
+        (("handle", None, handle) for handle in item_handles),
+        (("bitstream", uuid, None) for uuid in bitstream_uuids),
+    )
+
+    def delete(task: Tuple[str, Optional[str], Optional[str]]) -> DeleteResult:
+        object_type, uuid, handle = task
+        try:
+            if object_type == "handle":
+                object_type = "item"
+                resolved = client.get_object_by_handle(cast(str, handle)).json()
+                if resolved.get("type") != "item":
+                    raise ValueError(
+                        f"Handle {handle} is a {resolved.get('type')}, not an item."
+                    )
+                uuid = resolved["uuid"]
+            if dry_run:
+                return DeleteResult(object_type, uuid, handle, dry_run=True)
+            if object_type == "bitstream":
+                bitstream = Bitstream()
+                bitstream.uuid = uuid
+                bitstream.delete(client)
+            else:
+                item = Item()
+                item.uuid, item.handle = uuid, handle
+                item.delete(client)
+        except Exception as e:
+            logger.debug("Error deleting %s %s: %s", object_type, uuid or handle, e)
+            return DeleteResult(object_type, uuid, handle, error=e)
+        return DeleteResult(object_type, uuid, handle)
+
+    yield from run_concurrently(delete, tasks, max_workers)
+    if not (collection_handle or collection_uuid):
+        return
+    collection_id = select_identifier(client, collection_handle, collection_uuid)
+    logger.debug("Deleting items of collection %s", collection_id)
+    listed: Set[str] = set()
+    remaining = 0
+    while True:
+        if client.response_cache is not None:
+            # Deleting items changes the listing, so a cached page would be stale
+            client.response_cache.invalidate(f"/collections/{collection_id}")
+        page = client.get(
+            f"/collections/{collection_id}/items",
+            params={"limit": limit, "offset": remaining},
+        ).json()
+        new = [item for item in page if item["uuid"] not in listed]
+        listed.update(item["uuid"] for item in new)
+        # Items listed before but not deleted are still in the listing
+        remaining += len(page) - len(new)
+        for result in run_concurrently(
+            delete,
+            (("item", item["uuid"], item.get("handle")) for item in new),
+            max_workers,
+        ):
+            if not result.deleted:
+                remaining += 1
+            yield result
+        if len(page) < limit:
+            return
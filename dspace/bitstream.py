@@ -4,17 +4,60 @@
 This module includes a Bitstream class representing DSpace Bitstream objects, along
 with functions for interacting with the DSpace REST API "/bitstreams" endpoint.
 """
+from __future__ import annotations
+
 import logging
-from typing import Optional
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    BinaryIO,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
+import requests
 import smart_open
 
 from dspace.client import DSpaceClient
-from dspace.errors import MissingFilePathError
-from dspace.utils import select_identifier
+from dspace.errors import (
+    ChecksumMismatchError,
+    MissingFilePathError,
+    MissingIdentifierError,
+)
+from dspace.progress import ProgressMeter
+from dspace.streams import BufferReader, HashingReader, ReadAheadReader, map_file
+from dspace.utils import LazyRelation, select_identifier
 
 logger = logging.getLogger(__name__)
 
+BITSTREAM_RELATIONS = {"parentObject": "parent", "policies": "policies"}
+
+BITSTREAM_EXPAND = ("parent", "policies", "all")
+
+COMPRESSED_EXTENSIONS = (".bz2", ".gz", ".lz4", ".xz", ".zst")
+
+Content = Union[bytes, bytearray, memoryview, BinaryIO]
+
+
+def _write_stream(
+    response: requests.Response,
+    f: BinaryIO,
+    chunk_size: int,
+    progress: Optional[ProgressMeter] = None,
+) -> None:
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        f.write(chunk)
+        if progress is not None:
+            progress.update(len(chunk))
+
 
 class Bitstream:
     """Class representing a DSpace Bitstream object and its associated API calls.
@@ -22,13 +65,23 @@ class Bitstream:
     Args:
         description: Description of the bitstream
         file_path: File path to the bitstream. Required to post bitstream to DSpace
+            unless `content` is set
         name: Name of the Bitstream
+        content: The bitstream's bytes, as a bytes-like object or a binary file-like
+            object, to post in place of a file at `file_path`
 
     Attributes:
         bundleName(Optional[str]): The name of the DSpace bundle of the bitstream
         checkSum (Optional[dict[str:str]]): The DSpace-calculated checksum for the
             bitstream, e.g. {"value":"62778292a3a6dccbe2662a2bfca3b86e",
             "checkSumAlgorithm":"MD5"}
+        checksums (Optional[Dict[str, str]]): Hex digests of the bytes sent to DSpace
+            when the bitstream was posted, keyed by lowercase algorithm name, e.g.
+            {"md5": "62778292a3a6dccbe2662a2bfca3b86e"}. Not part of the DSpace object
+            model
+        content (Optional[Union[bytes, bytearray, memoryview, BinaryIO]]): The
+            bitstream's bytes, posted in place of a file at `file_path`. Not part of
+            the DSpace object model
         description (Optional[str]): Description of the bitstream
         format (Optional[str]): The DSpace-identified file format of the bitstream
         expand (List[str]: The expand options for the DSpace REST object
@@ -46,31 +99,67 @@ class Bitstream:
         sizeBytes (Optional[int]): The DSpace-identified size of the bitstream in bytes
         type (Optional[str]): The DSpace object type
         uuid (Optional[str]): UUID of the bitstream in DSpace
+
+    For bitstreams retrieved with :meth:`get`, the relations `parentObject` and
+    `policies` that were not requested with `expand` are requested from DSpace the
+    first time they are accessed.
     """
 
+    __slots__ = (
+        "__dict__",
+        "_client",
+        "_parentObject",
+        "_policies",
+        "_unloaded",
+        "bundleName",
+        "checkSum",
+        "checksums",
+        "content",
+        "description",
+        "expand",
+        "file_path",
+        "format",
+        "link",
+        "mimeType",
+        "name",
+        "retrieveLink",
+        "sequenceId",
+        "sizeBytes",
+        "type",
+        "uuid",
+    )
+
+    parentObject = LazyRelation()
+    policies = LazyRelation()
+
     def __init__(
         self,
         description: Optional[str] = None,
         file_path: Optional[str] = None,
         name: Optional[str] = None,
+        content: Optional[Content] = None,
     ):
+        self._client: Optional[DSpaceClient] = None
+        self._unloaded: Set[str] = set()
+        self.content = content
         self.description = description
         self.file_path = file_path
         self.name = name
 
-        self.bundleName = None
-        self.checkSum = None
-        self.format = None
-        self.expand = ["parent", "policies", "all"]
-        self.link = None
-        self.mimeType = None
+        self.bundleName: Optional[str] = None
+        self.checkSum: Optional[Dict[str, str]] = None
+        self.checksums: Optional[Dict[str, str]] = None
+        self.expand: List[str] = list(BITSTREAM_EXPAND)
+        self.format: Optional[str] = None
+        self.link: Optional[str] = None
+        self.mimeType: Optional[str] = None
         self.parentObject = None
         self.policies = None
-        self.retrieveLink = None
-        self.sequenceId = None
-        self.sizeBytes = None
+        self.retrieveLink: Optional[str] = None
+        self.sequenceId: Optional[int] = None
+        self.sizeBytes: Optional[int] = None
         self.type = "bitstream"
-        self.uuid = None
+        self.uuid: Optional[str] = None
 
     def delete(
         self,
@@ -90,8 +179,10 @@ class Bitstream:
         )
         response = client.delete(f"/bitstreams/{self.uuid}")
         logger.debug("Delete response: %s", response)
+        self._unloaded.clear()
         self.bundleName = None
         self.checkSum = None
+        self.checksums = None
         self.format = None
         self.link = None
         self.mimeType = None
@@ -102,19 +193,223 @@ class Bitstream:
         self.sizeBytes = None
         self.uuid = None
 
+    def download(
+        self,
+        client: DSpaceClient,
+        destination: str,
+        chunk_size: int = 1024 * 1024,
+        max_workers: int = 1,
+        range_size: int = 16 * 1024 * 1024,
+        progress: Optional[ProgressMeter] = None,
+    ) -> None:
+        """Download the bitstream's file from DSpace to a local or remote destination.
+
+        The `smart_open library <https://pypi.org/project/smart-open/>`_ is used to
+        open the destination, so it can be a local file path or a remote URI such as
+        "s3://bucket/key". The file is streamed to the destination in `chunk_size`
+        chunks, so memory use does not depend on the size of the file.
+
+        If `max_workers` is greater than 1 and the bitstream's `sizeBytes` is known,
+        byte ranges of `range_size` are requested concurrently and written to the
+        destination in order, holding at most `max_workers` + 1 ranges in memory. If
+        the server does not honor range requests, the download falls back to a single
+        stream.
+
+        If a :class:`dspace.progress.ProgressMeter` is passed as `progress`, it
+        counts the bytes as they are written to the destination.
+
+        Args:
+            client: An authenticated instance of the :class:`DSpaceClient` class
+            destination: Local file path or smart_open URI to write the file to
+            chunk_size: The number of bytes to read from the response at a time,
+                defaults to 1 MiB
+            max_workers: The number of byte ranges to request concurrently, defaults
+                to 1 (a single stream)
+            range_size: The number of bytes to request per range when downloading in
+                parallel, defaults to 16 MiB
+            progress: A meter to report the download's progress to, defaults to None
+
+        Raises:
+            :class:`requests.HTTPError`: 404 Not Found if no bitstream matching
+                the bitstream's UUID
+            MissingIdentifierError: if `uuid` attribute is not set on Bitstream
+                instance
+            TransferStalledError: if the download's throughput stays below the
+                minimum rate of `progress`
+        """
+        if not self.uuid:
+            raise MissingIdentifierError(f"bitstream.download({client}, {destination})")
+        endpoint = f"/bitstreams/{self.uuid}/retrieve"
+        logger.debug(
+            "Downloading bitstream from %s to %s",
+            client.base_url + endpoint,
+            destination,
+        )
+        if progress is not None:
+            progress.start(
+                self.sizeBytes, f"bitstream.download({client}, {destination})"
+            )
+        with smart_open.open(destination, "wb") as f:
+            if max_workers > 1 and self.sizeBytes and self.sizeBytes > range_size:
+                self._download_ranges(
+                    client,
+                    endpoint,
+                    f,
+                    self.sizeBytes,
+                    chunk_size,
+                    max_workers,
+                    range_size,
+                    progress,
+                )
+            else:
+                with client.get(endpoint, stream=True) as response:
+                    _write_stream(response, f, chunk_size, progress)
+        if progress is not None:
+            progress.finish()
+
+    def _download_ranges(
+        self,
+        client: DSpaceClient,
+        endpoint: str,
+        f: BinaryIO,
+        size: int,
+        chunk_size: int,
+        max_workers: int,
+        range_size: int,
+        progress: Optional[ProgressMeter],
+    ) -> None:
+        def get_range(start: int) -> requests.Response:
+            end = min(start + range_size, size) - 1
+            return client.get(
+                endpoint, headers={"Range": f"bytes={start}-{end}"}, stream=True
+            )
+
+        with get_range(0) as response:
+            if response.status_code != 206:
+                logger.debug("Range request not honored, downloading as one stream")
+                _write_stream(response, f, chunk_size, progress)
+                return
+            _write_stream(response, f, chunk_size, progress)
+        starts = iter(range(range_size, size, range_size))
+        in_flight: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+            def fetch(start: int) -> bytes:
+                with get_range(start) as response:
+                    if response.status_code != 206:
+                        raise requests.HTTPError(
+                            f"Expected 206 Partial Content for range starting at "
+                            f"{start}, got {response.status_code}",
+                            response=response,
+                        )
+                    return response.content
+
+            def write(content: bytes) -> None:
+                f.write(content)
+                if progress is not None:
+                    progress.update(len(content))
+
+            for start in starts:
+                in_flight.append(executor.submit(fetch, start))
+                if len(in_flight) >= max_workers:
+                    write(in_flight.popleft().result())
+            while in_flight:
+                write(in_flight.popleft().result())
+
+    @classmethod
+    def from_dict(cls, bitstream: Dict[str, Any]) -> Bitstream:
+        """Class method to create a Bitstream object from a DSpace REST response.
+
+        Args:
+            bitstream: A dict representation of a DSpace Bitstream object, as returned
+                by the DSpace REST API
+
+        Returns:
+            :class:`Bitstream` object
+        """
+        new_bitstream = cls(
+            description=bitstream.get("description"), name=bitstream.get("name")
+        )
+        new_bitstream.bundleName = bitstream.get("bundleName")
+        new_bitstream.checkSum = bitstream.get("checkSum")
+        new_bitstream.format = bitstream.get("format")
+        new_bitstream.link = bitstream.get("link")
+        new_bitstream.mimeType = bitstream.get("mimeType")
+        new_bitstream.parentObject = bitstream.get("parentObject")
+        new_bitstream.policies = bitstream.get("policies")
+        new_bitstream.retrieveLink = bitstream.get("retrieveLink")
+        new_bitstream.sequenceId = bitstream.get("sequenceId")
+        new_bitstream.sizeBytes = bitstream.get("sizeBytes")
+        new_bitstream.uuid = bitstream.get("uuid")
+        return new_bitstream
+
+    @classmethod
+    def get(
+        cls,
+        client: DSpaceClient,
+        bitstream_uuid: str,
+        expand: Optional[Sequence[str]] = None,
+    ) -> Bitstream:
+        """Class method to retrieve a bitstream's metadata from DSpace.
+
+        Only the relations named in `expand` are included in the response; the others
+        are requested the first time they are accessed on the returned bitstream.
+
+        Args:
+            client: An authenticated instance of the :class:`DSpaceClient` class
+            bitstream_uuid: The UUID of an existing bitstream in DSpace
+            expand: The relations to include in the response, any of "parent",
+                "policies" or "all", defaults to None (no relations)
+
+        Returns:
+            :class:`Bitstream` object
+
+        Raises:
+            :class:`requests.HTTPError`: 404 Not Found if no bitstream matching
+                provided UUID
+        """
+        params = {"expand": ",".join(expand)} if expand else None
+        response = client.get(f"/bitstreams/{bitstream_uuid}", params=params).json()
+        bitstream = cls.from_dict(response)
+        bitstream._client = client
+        expand = expand or []
+        if "all" not in expand:
+            bitstream._unloaded = {
+                attribute
+                for attribute, option in BITSTREAM_RELATIONS.items()
+                if option not in expand
+            }
+        return bitstream
+
     def post(
         self,
         client: DSpaceClient,
         item_handle: Optional[str] = None,
         item_uuid: Optional[str] = None,
+        checksum_algorithms: Sequence[str] = ("md5",),
+        verify_checksum: bool = True,
+        read_ahead_buffer_size: int = 1024 * 1024,
+        read_ahead_depth: int = 4,
+        progress: Optional[ProgressMeter] = None,
     ) -> None:
         """Post bitstream to an item and set bitstream attributes to response object values.
 
         Requires either the `item_handle` or the `item_uuid`, but not both. If
         both are passed, defaults to using the UUID.
 
-        The `smart_open library <https://pypi.org/project/smart-open/>`_ replaces the
-        standard open function to stream local or remote files for the POST request.
+        The bytes are sent from the `content` attribute if it is set, otherwise from
+        the file at `file_path`:
+
+        * Bytes-like `content`, and the buffer of an :class:`io.BytesIO`, are sent
+          from memory without being copied.
+        * Other file-like `content` is read from its current position. It is left
+          open, as it belongs to the caller.
+        * Uncompressed local files are memory-mapped and sent without being copied
+          into Python buffers.
+        * Other files, e.g. remote or compressed ones, are streamed through the
+          `smart_open library <https://pypi.org/project/smart-open/>`_.
+
+        Files opened by this method are closed before it returns.
 
         Note: DSpace internally uses the file extension from the provided "name"
         parameter (the `bitstream.name` attribute) to assign a format and mimeType when
@@ -122,32 +417,77 @@ class Bitstream:
         "test-file.pdf") is not provided, DSpace will assign a format of "Unknown" and
         a mimeType of "application/octet-stream".
 
+        Checksums of the file are computed while it is being sent and stored in the
+        `checksums` attribute. If `verify_checksum` is True, the checksum DSpace
+        returns is compared with the matching local checksum (DSpace 6 uses MD5).
+
+        Streamed sources are read ahead in a background thread into a bounded set of
+        buffers (see :class:`dspace.streams.ReadAheadReader`) so reading from the
+        source and sending to DSpace overlap.
+
+        If a :class:`dspace.progress.ProgressMeter` is passed as `progress`, it
+        counts the bytes as they are sent to DSpace.
+
         Args:
             client: An authenticated instance of the :class:`DSpaceClient` class
             item_handle: The handle of an existing item in DSpace to post the bitstream
                 to
             item_uuid: The UUID of an existing item in DSpace to post the bitstream to
+            checksum_algorithms: Names of the :mod:`hashlib` algorithms to compute
+                while uploading, defaults to ("md5",). Add "sha256" to also record a
+                SHA-256 digest for fixity checks
+            verify_checksum: Whether to verify the DSpace-calculated checksum against
+                the local checksum, defaults to True
+            read_ahead_buffer_size: The number of bytes to read from the file at a
+                time, defaults to 1 MiB
+            read_ahead_depth: The maximum number of buffers to read ahead of the
+                upload, defaults to 4. Set to 0 to read the file directly
+            progress: A meter to report the upload's progress to, defaults to None
 
         Raises:
+            ChecksumMismatchError: if `verify_checksum` is True and the DSpace checksum
+                does not match the bytes sent. The bitstream attributes are set to the
+                response values before this is raised, so the bitstream can be deleted
             :class:`requests.HTTPError`: 404 Not Found if no item matching
                 provided handle/UUID
-            MissingFilePathError: if `file_path` attribute is not set on Bitstream
-                instance
+            MissingFilePathError: if neither the `file_path` nor the `content`
+                attribute is set on Bitstream instance
             MissingIdentifierError: if neither `item_handle` nor `item_uuid`
                 parameter is provided
+            TransferStalledError: if the upload's throughput stays below the minimum
+                rate of `progress`
         """
-        if not self.file_path:
+        if self.content is None and not self.file_path:
             raise MissingFilePathError(f"bitstream.post({client}, {item_uuid})")
         item_id = select_identifier(client, item_handle, item_uuid)
         endpoint = f"/items/{item_id}/bitstreams"
         params = {"name": self.name, "description": self.description}
-        data = smart_open.open(self.file_path, "rb")
+        source: Union[BinaryIO, BufferReader, ReadAheadReader]
+        source, owned = self._open_source()
+        if read_ahead_depth > 0 and not isinstance(source, BufferReader):
+            source = ReadAheadReader(
+                source,
+                buffer_size=read_ahead_buffer_size,
+                depth=read_ahead_depth,
+                close_raw=owned,
+            )
+            owned = True
+        data = HashingReader(
+            source, algorithms=checksum_algorithms, close_raw=owned, progress=progress
+        )
+        if progress is not None:
+            progress.start(data.len or None, f"bitstream.post({client}, {item_id})")
         logger.debug(
             "Posting new bitstream to %s with info %s",
             client.base_url + endpoint,
             params,
         )
-        response = client.post(endpoint, data=data, params=params).json()
+        try:
+            response = client.post(endpoint, data=data, params=params).json()
+        finally:
+            data.close()
+        if progress is not None:
+            progress.finish()
         logger.debug("Post response: %s", response)
         self.bundleName = response["bundleName"]
         self.checkSum = response["checkSum"]
@@ -160,3 +500,50 @@ class Bitstream:
         self.sequenceId = response["sequenceId"]
         self.sizeBytes = response["sizeBytes"]
         self.uuid = response["uuid"]
+        self.checksums = data.hexdigests()
+        if verify_checksum:
+            self._verify_checksum(client)
+
+    def _open_source(self) -> Tuple[Union[BinaryIO, BufferReader], bool]:
+        """Return a reader for the bytes to post and whether it should be closed."""
+        content = self.content
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return BufferReader(content), True
+        if content is not None:
+            if hasattr(content, "getbuffer"):
+                return BufferReader(content.getbuffer()[content.tell() :]), True
+            return content, False
+        path = str(self.file_path)
+        if path.startswith("file://"):
+            path = path[len("file://") :]
+        elif "://" in path:
+            return smart_open.open(path, "rb"), True
+        if path.lower().endswith(COMPRESSED_EXTENSIONS) or not os.path.isfile(path):
+            return smart_open.open(path, "rb"), True
+        return map_file(path), True
+
+    def _load_relation(self, name: str) -> Any:
+        if self._client is None:
+            raise AttributeError(f"Cannot load {name} of a bitstream without a client")
+        response = self._client.get(
+            f"/bitstreams/{self.uuid}", params={"expand": BITSTREAM_RELATIONS[name]}
+        ).json()
+        return response.get(name)
+
+    def _verify_checksum(self, client: DSpaceClient) -> None:
+        if not self.checkSum or not self.checksums:
+            return
+        algorithm = self.checkSum.get("checkSumAlgorithm", "")
+        expected = self.checksums.get(algorithm.lower())
+        if expected is None:
+            logger.debug(
+                "No local %s checksum computed, skipping verification", algorithm
+            )
+            return
+        if expected != self.checkSum.get("value", "").lower():
+            raise ChecksumMismatchError(
+                f"bitstream.post({client}, {self.uuid})",
+                algorithm,
+                expected,
+                self.checkSum.get("value", ""),
+            )
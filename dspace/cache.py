@@ -0,0 +1,162 @@
+# dspace/cache.py
+"""DSpace cache module.
+
+This module includes a HandleCache class for caching the resolution of DSpace handles
+to UUIDs.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class HandleCache:
+    """A thread-safe LRU cache of DSpace handle to UUID mappings with expiry.
+
+    Entries expire `ttl` seconds after they are set. When the cache holds `maxsize`
+    entries, the least recently used entry is evicted to make room for a new one. If a
+    `path` is provided, entries are loaded from that file when the cache is created and
+    written back to it by :meth:`save`.
+
+    Args:
+        maxsize: The maximum number of handles to cache, defaults to 1024. A maxsize of
+            0 disables caching
+        ttl: The number of seconds a cached handle stays valid, defaults to 3600.0
+        path: Optional local file path to persist the cache to as JSON
+
+    Attributes:
+        hits (int): Number of lookups answered from the cache
+        maxsize (int): The maximum number of handles to cache
+        misses (int): Number of lookups not answered from the cache
+        path (Optional[str]): Local file path the cache is persisted to
+        ttl (float): The number of seconds a cached handle stays valid
+    """
+
+    def __init__(
+        self, maxsize: int = 1024, ttl: float = 3600.0, path: Optional[str] = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __contains__(self, handle: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(handle)
+            return entry is not None and entry[1] > time.time()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __repr__(self):
+        return (
+            f"HandleCache(maxsize={self.maxsize}, ttl={self.ttl}, "
+            f"path={self.path!r})"
+        )
+
+    def clear(self) -> None:
+        """Remove all entries from the cache and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get(self, handle: str) -> Optional[str]:
+        """Return the cached UUID for a handle, or None if not cached or expired.
+
+        Args:
+            handle: Handle of a DSpace object, e.g. '1721.1/130883'
+        """
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                self.misses += 1
+                return None
+            uuid, expires = entry
+            if expires <= time.time():
+                del self._entries[handle]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(handle)
+            self.hits += 1
+            return uuid
+
+    def invalidate(self, handle: str) -> None:
+        """Remove a handle from the cache if present.
+
+        Args:
+            handle: Handle of a DSpace object, e.g. '1721.1/130883'
+        """
+        with self._lock:
+            self._entries.pop(handle, None)
+
+    def load(self, path: str) -> None:
+        """Load unexpired entries from a JSON file written by :meth:`save`.
+
+        Args:
+            path: Local file path to load the cache from
+        """
+        with open(path) as f:
+            entries = json.load(f)
+        now = time.time()
+        with self._lock:
+            for handle, (uuid, expires) in entries.items():
+                if expires > now:
+                    self._set(handle, uuid, expires)
+        logger.debug("Loaded %d cached handles from %s", len(self._entries), path)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Atomically write the unexpired cache entries to a JSON file.
+
+        Args:
+            path: Local file path to save the cache to, defaults to `self.path`
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No path provided to save the handle cache to.")
+        now = time.time()
+        with self._lock:
+            entries = {
+                handle: [uuid, expires]
+                for handle, (uuid, expires) in self._entries.items()
+                if expires > now
+            }
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, delete=False, suffix=".tmp"
+        ) as f:
+            json.dump(entries, f)
+        os.replace(f.name, path)
+        logger.debug("Saved %d cached handles to %s", len(entries), path)
+
+    def set(self, handle: str, uuid: str) -> None:
+        """Cache the UUID for a handle.
+
+        Args:
+            handle: Handle of a DSpace object, e.g. '1721.1/130883'
+            uuid: UUID of the DSpace object
+        """
+        with self._lock:
+            self._set(handle, uuid, time.time() + self.ttl)
+
+    def _set(self, handle: str, uuid: str, expires: float) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[handle] = (uuid, expires)
+        self._entries.move_to_end(handle)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
@@ -3,13 +3,39 @@
 
 This module includes a Client class for interacting with the DSpace REST API.
 """
+from __future__ import annotations
+
+import functools
 import logging
-from typing import Dict, Optional, Union
+import threading
+import time
+from concurrent.futures import Future
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from dspace.cache import HandleCache
+from dspace.codec import JSONCodec, default_codec, iter_json_array
+from dspace.metrics import ClientMetrics, endpoint_template
+from dspace.response_cache import UNCACHED_ENDPOINTS, ResponseCache
+from dspace.retry import RetryPolicy
+from dspace.throttle import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+BytesLike = Union[bytes, memoryview]
+
 
 class DSpaceClient:
     """A Client class for interacting with the DSpace REST API.
@@ -20,14 +46,61 @@ class DSpaceClient:
             of "application/json" or "application/xml", defaults to "application/json"
         timeout: The `timeout`_, in seconds, to use for all requests sent to the DSpace
             API, defaults to 3.0
+        pool_connections: The number of per-host connection pools to cache, defaults
+            to 10
+        pool_maxsize: The maximum number of keep-alive connections to hold open per
+            host, defaults to 10. Should be at least the number of threads sharing the
+            client
+        pool_block: Whether requests should wait for a free connection when the pool
+            for a host is exhausted instead of opening a throwaway connection,
+            defaults to False
+        handle_cache: The :class:`HandleCache` to use for resolving handles to UUIDs,
+            defaults to a new in-memory cache. Pass `HandleCache(maxsize=0)` to disable
+            caching
+        retry_policies: :class:`RetryPolicy` objects keyed by uppercase HTTP method,
+            used to retry failed requests with exponential backoff. Defaults to no
+            retries. See :func:`dspace.retry.default_retry_policies` for a
+            recommended set of policies
+        reauthenticate: Whether to log in again with the credentials last passed to
+            :meth:`login` and replay the request when a request is rejected with a 401
+            or 403 status, e.g. because the session cookie has expired, defaults to
+            True
+        rate_limiter: A :class:`RateLimiter` limiting the rate and concurrency of all
+            requests sent by the client, defaults to None (no limit). May be shared
+            between clients to limit their combined load on one server
+        json_codec: The :class:`JSONCodec` used to encode JSON request bodies and to
+            decode the pages of listings (see :func:`dspace.utils.paginate`), defaults to
+            :func:`dspace.codec.default_codec` (orjson if installed, else the standard
+            library)
+        response_cache: A :class:`ResponseCache` to serve repeated GET requests from,
+            defaults to None (no caching). POST, PUT and DELETE requests invalidate the
+            cached responses for the objects they change
+        coalesce_gets: Whether concurrent identical GET requests from different
+            threads should share a single request to DSpace and its response,
+            defaults to True
 
     Attributes:
         base_url: The base url of the DSpace API
+        coalesce_gets: Whether concurrent identical GET requests are coalesced
         cookies: Cookies for use in client requests
+        handle_cache: Cache of handle to UUID mappings used by
+            :func:`dspace.utils.select_identifier`
         headers: Headers for use in client requests
+        json_codec: Codec used to encode and decode JSON
+        metrics: :class:`ClientMetrics` recording the count, status, latency and size
+            of every request sent by the client, grouped by endpoint
+        rate_limiter: Limiter applied to every request, if any
+        reauthenticate: Whether to log in again and replay rejected requests
+        response_cache: Cache of GET responses, if any
+        retry_policies: Retry policies keyed by uppercase HTTP method
+        session: The :class:`requests.Session` holding the client's `connection
+            pool`_. Connections are kept alive and reused across requests, and the pool
+            is safe to share between threads
         timeout: Timeout value for use in client requests
 
     .. _timeout: https://docs.python-requests.org/en/latest/user/quickstart/#timeouts
+    .. _connection pool: https://docs.python-requests.org/en/latest/user/advanced/\
+        #session-objects
     """
 
     def __init__(
@@ -35,17 +108,68 @@ class DSpaceClient:
         base_url: str,
         accept_header: str = "application/json",
         timeout: float = 3.0,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        handle_cache: Optional[HandleCache] = None,
+        retry_policies: Optional[Dict[str, RetryPolicy]] = None,
+        reauthenticate: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        json_codec: Optional[JSONCodec] = None,
+        response_cache: Optional[ResponseCache] = None,
+        coalesce_gets: bool = True,
     ):
         self.base_url: str = base_url.rstrip("/")
         self.headers: Dict[str, str] = {"accept": accept_header}
         self.timeout: float = timeout
         self.cookies: dict = {}
+        self.session: requests.Session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.handle_cache: HandleCache = (
+            handle_cache if handle_cache is not None else HandleCache()
+        )
+        self.retry_policies: Dict[str, RetryPolicy] = {
+            method.upper(): policy for method, policy in (retry_policies or {}).items()
+        }
+        self.reauthenticate: bool = reauthenticate
+        self.rate_limiter: Optional[RateLimiter] = rate_limiter
+        self.response_cache: Optional[ResponseCache] = response_cache
+        self.coalesce_gets: bool = coalesce_gets
+        self.metrics: ClientMetrics = ClientMetrics(
+            handle_cache=self.handle_cache, response_cache=self.response_cache
+        )
+        self.json_codec: JSONCodec = json_codec or default_codec()
+        self._credentials: Optional[Tuple[str, str]] = None
+        self._login_lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
         logger.debug(
             f"Client initialized with params base_url={self.base_url}, "
             f"accept_header={self.headers}, "
-            f"timeout={self.timeout}"
+            f"timeout={self.timeout}, "
+            f"pool_connections={pool_connections}, "
+            f"pool_maxsize={pool_maxsize}, "
+            f"pool_block={pool_block}, "
+            f"retry_policies={self.retry_policies}, "
+            f"reauthenticate={self.reauthenticate}, "
+            f"rate_limiter={self.rate_limiter}, "
+            f"json_codec={self.json_codec}, "
+            f"response_cache={self.response_cache}, "
+            f"coalesce_gets={self.coalesce_gets}"
         )
 
+    def __enter__(self) -> DSpaceClient:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
     def __repr__(self):
         return (
             f"DSpaceClient(base_url='{self.base_url}', "
@@ -53,6 +177,16 @@ class DSpaceClient:
             f"timeout={self.timeout})"
         )
 
+    def close(self) -> None:
+        """Close all pooled connections held by the client's session.
+
+        If the client's handle cache has a `path`, the cache is saved to it.
+        """
+        logger.debug(f"Closing connection pool for {self.base_url}")
+        self.session.close()
+        if self.handle_cache.path:
+            self.handle_cache.save()
+
     def delete(self, endpoint: str) -> requests.Response:
         """Send a DELETE request to the specified endpoint and return the result.
 
@@ -73,23 +207,39 @@ class DSpaceClient:
             :class:`requests.exceptions.Timeout`: if server takes longer than the
                 client's timeout value to respond
         """
-        url = self.base_url + endpoint
-        response = requests.delete(
-            url, cookies=self.cookies, headers=self.headers, timeout=self.timeout
-        )
-        response.raise_for_status()
-        return response
+        return self._request("DELETE", endpoint)
 
-    def get(self, endpoint: str, params: Optional[dict] = None) -> requests.Response:
+    def get(
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> requests.Response:
         """Send a GET request to the specified endpoint and return the result.
 
         This method is internal to the library (although not private to this class)
         and should generally not be called directly. It is used by other classes to send
         GET requests using the client's stored authentication cookie and headers.
 
+        If the client has a `response_cache`, a fresh cached response is returned
+        without contacting DSpace, and a stale one is revalidated with a conditional
+        request where possible. Requests with extra `headers` or `stream`, and
+        requests for the authentication status, are never cached.
+
+        Unless `coalesce_gets` is disabled, a request identical to one already in
+        flight from another thread is not sent again: it waits for the in-flight
+        request and returns the same response, or raises the same error. Requests
+        with `stream` are never coalesced, as a streamed body can only be read once.
+
         Args:
             endpoint: The DSPace REST endpoint to get, e.g. "/status"
             params: Additional params that should be submitted with the request
+            headers: Additional headers that should be submitted with the request, e.g.
+                {"Range": "bytes=0-1023"}
+            stream: Whether to defer downloading the response body until it is
+                accessed, e.g. with :meth:`requests.Response.iter_content`. The
+                response should be closed by the caller when done
 
         Returns:
             :class:`requests.Response` object
@@ -100,16 +250,14 @@ class DSpaceClient:
             :class:`requests.exceptions.Timeout`: if server takes longer than the
                 client's timeout value to respond
         """
-        url = self.base_url + endpoint
-        response = requests.get(
-            url,
-            cookies=self.cookies,
-            headers=self.headers,
-            params=params,
-            timeout=self.timeout,
+        if stream or not self.coalesce_gets:
+            return self._get(endpoint, params, headers, stream)
+        key = repr(
+            (endpoint, sorted((params or {}).items()), sorted((headers or {}).items()))
+        )
+        return self._single_flight(
+            key, endpoint, lambda: self._get(endpoint, params, headers, stream)
         )
-        response.raise_for_status()
-        return response
 
     def get_object_by_handle(self, handle: str) -> requests.Response:
         """Get a DSpace object based on its handle instead of its UUID.
@@ -132,11 +280,47 @@ class DSpaceClient:
         response = self.get(endpoint)
         return response
 
+    def iter_json(
+        self, endpoint: str, params: Optional[dict] = None, chunk_size: int = 65536
+    ) -> Iterator[Any]:
+        """Send a GET request for a JSON array and lazily yield each of its elements.
+
+        The response body is streamed and decoded incrementally with
+        :func:`dspace.codec.iter_json_array`, so a large listing is never held in
+        memory whole, and the first elements are yielded before the rest of the body
+        has arrived. The response is closed when the iterator is exhausted or closed.
+
+        Args:
+            endpoint: The DSPace REST listing endpoint to get, e.g.
+                "/collections/72dfcada-de27-4ce7-99cc-68266ebfd00c/items"
+            params: Additional params that should be submitted with the request
+            chunk_size: The number of bytes to read from the response at a time,
+                defaults to 65536
+
+        Yields:
+            The decoded value of each element of the JSON array
+
+        Raises:
+            :class:`requests.exceptions.HTTPError`: if response status code is 4xx or
+                5xx
+            ValueError: if the response body is not a JSON array
+        """
+        # The caller runs between chunks and may send requests of its own, so the
+        # rate limiter slot is released once the headers arrive to avoid deadlock
+        response = self._request(
+            "GET", endpoint, params=params, stream=True, hold_slot=False
+        )
+        try:
+            yield from iter_json_array(response.iter_content(chunk_size))
+        finally:
+            response.close()
+
     def login(self, email: str, password: str) -> None:
         """Authenticate a user to the DSpace REST API.
 
         If authentication is successful, adds an object to `self.cookies` equal to the
-        response 'JSESSIONID' cookie.
+        response 'JSESSIONID' cookie. The credentials are kept so the client can log in
+        again if the session expires (see the `reauthenticate` argument).
 
         Args:
             email: The email address of the DSpace user
@@ -151,13 +335,14 @@ class DSpaceClient:
         data = {"email": email, "password": password}
         response = self.post(endpoint, data=data)
         self.cookies["JSESSIONID"] = response.cookies.get("JSESSIONID")
+        self._credentials = (email, password)
         logger.debug(f"Successfully authenticated to {self.base_url} as {email}")
 
     def post(
         self,
         endpoint: str,
-        data: Optional[Union[bytes, dict]] = None,
-        json: Optional[dict] = None,
+        data: Optional[Union[bytes, dict, BinaryIO, Iterable[BytesLike]]] = None,
+        json: Optional[Union[dict, list]] = None,
         params: Optional[dict] = None,
     ) -> requests.Response:
         """Send a POST request to a specified endpoint and return the result.
@@ -169,7 +354,7 @@ class DSpaceClient:
         Args:
             endpoint: The DSPace REST endpoint to post to, e.g. "/login"
             data: The data to post
-            json: Data to post as JSON (uses requests' built-in JSON encoder)
+            json: Data to post as JSON, encoded with the client's `json_codec`
             params: Additional params that should be submitted with the request
 
         Returns:
@@ -181,18 +366,38 @@ class DSpaceClient:
             :class:`requests.exceptions.Timeout`: if server takes longer than the
                 client's timeout value to respond
         """
-        url = self.base_url + endpoint
-        response = requests.post(
-            url,
-            cookies=self.cookies,
-            data=data,
-            headers=self.headers,
-            json=json,
-            params=params,
-            timeout=self.timeout,
-        )
-        response.raise_for_status()
-        return response
+        return self._request("POST", endpoint, data=data, json=json, params=params)
+
+    def put(
+        self,
+        endpoint: str,
+        data: Optional[Union[bytes, dict, BinaryIO, Iterable[BytesLike]]] = None,
+        json: Optional[Union[dict, list]] = None,
+        params: Optional[dict] = None,
+    ) -> requests.Response:
+        """Send a PUT request to a specified endpoint and return the result.
+
+        This method is internal to the library (although not private to this class)
+        and should generally not be called directly. It is used by other classes to send
+        PUT requests using the client's stored authentication cookie and headers.
+
+        Args:
+            endpoint: The DSPace REST endpoint to put to, e.g.
+                "/items/7c8e7bbc-e36b-4194-87e5-5347e3a69a57/metadata"
+            data: The data to put
+            json: Data to put as JSON, encoded with the client's `json_codec`
+            params: Additional params that should be submitted with the request
+
+        Returns:
+            :class:`requests.Response` object
+
+        Raises:
+            :class:`requests.exceptions.HTTPError`: if response status code is 4xx or
+                5xx
+            :class:`requests.exceptions.Timeout`: if server takes longer than the
+                client's timeout value to respond
+        """
+        return self._request("PUT", endpoint, data=data, json=json, params=params)
 
     def status(self) -> requests.Response:
         """Get current authentication status of :class:`DSpaceClient` instance.
@@ -208,3 +413,268 @@ class DSpaceClient:
         endpoint = "/status"
         response = self.get(endpoint)
         return response
+
+    def _get(
+        self,
+        endpoint: str,
+        params: Optional[dict],
+        headers: Optional[Dict[str, str]],
+        stream: bool,
+    ) -> requests.Response:
+        if (
+            self.response_cache is None
+            or headers
+            or stream
+            or endpoint in UNCACHED_ENDPOINTS
+        ):
+            return self._request(
+                "GET", endpoint, params=params, headers=headers, stream=stream
+            )
+        return self._cached_get(self.response_cache, endpoint, params)
+
+    def _single_flight(
+        self, key: str, endpoint: str, send: Callable[[], requests.Response]
+    ) -> requests.Response:
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if future is None:
+                future = self._in_flight[key] = Future()
+        if not leader:
+            logger.debug(f"Waiting for identical in-flight GET {endpoint}")
+            self.metrics.record_coalesced("GET", endpoint)
+            return future.result()
+        try:
+            response = send()
+        except BaseException as e:
+            self._land(key)
+            future.set_exception(e)
+            raise
+        self._land(key)
+        future.set_result(response)
+        return response
+
+    def _land(self, key: str) -> None:
+        # Remove the request before waking waiters, so later requests are sent anew
+        with self._in_flight_lock:
+            del self._in_flight[key]
+
+    def _cached_get(
+        self, cache: ResponseCache, endpoint: str, params: Optional[dict]
+    ) -> requests.Response:
+        request = requests.Request("GET", self.base_url + endpoint, params=params)
+        url = request.prepare().url or ""
+        # Responses depend on the user's permissions, so each user has their own
+        user = self._credentials[0] if self._credentials else ""
+        key = f"{self.headers['accept']} {user} {url}"
+        entry, fresh = cache.lookup(key)
+        if entry is not None and fresh:
+            logger.debug(f"Serving GET {url} from cache")
+            return entry.to_response(url)
+        validators = entry.validators() if entry is not None else {}
+        response = self._request(
+            "GET", endpoint, params=params, headers=validators or None
+        )
+        if response.status_code == 304 and entry is not None:
+            logger.debug(f"Cached response to GET {url} revalidated")
+            cache.revalidated(key, entry, response.headers)
+            return entry.to_response(url)
+        cache.store(key, endpoint, response)
+        return response
+
+    def _reauthenticate(self, rejected_session: Optional[str]) -> None:
+        with self._login_lock:
+            if self.cookies.get("JSESSIONID") != rejected_session:
+                logger.debug("Session already renewed by another request")
+                return
+            if self._credentials:
+                logger.debug(f"Session rejected, re-authenticating to {self.base_url}")
+                self.login(*self._credentials)
+
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        if method != "GET" and self.response_cache is not None:
+            try:
+                return self._request_uncached(method, endpoint, headers, **kwargs)
+            finally:
+                self.response_cache.invalidate(endpoint)
+        return self._request_uncached(method, endpoint, headers, **kwargs)
+
+    def _request_uncached(
+        self,
+        method: str,
+        endpoint: str,
+        headers: Optional[Dict[str, str]] = None,
+        hold_slot: bool = True,
+        **kwargs: Any,
+    ) -> requests.Response:
+        url = self.base_url + endpoint
+        policy = self.retry_policies.get(method)
+        if kwargs.get("json") is not None:
+            kwargs["data"] = self.json_codec.dumps(kwargs.pop("json"))
+            headers = {**(headers or {}), "Content-Type": "application/json"}
+        data = kwargs.get("data")
+        body_position = _body_position(data)
+        replayable = body_position is not None
+        attempt = 0
+        reauthenticated = False
+        while True:
+            session_cookie = self.cookies.get("JSESSIONID")
+            try:
+                response = self._send(method, endpoint, headers, kwargs, hold_slot)
+            except requests.RequestException as e:
+                if not (replayable and policy and policy.retries_error(e, attempt)):
+                    raise
+                delay = policy.delay(attempt)
+                logger.debug(
+                    f"{method} {url} raised {e!r}, retrying in {delay:.2f}s "
+                    f"(retry {attempt + 1} of {policy.total})"
+                )
+            else:
+                if (
+                    response.status_code in (401, 403)
+                    and self.reauthenticate
+                    and self._credentials
+                    and endpoint != "/login"
+                    and replayable
+                    and not reauthenticated
+                ):
+                    response.close()
+                    self._reauthenticate(session_cookie)
+                    reauthenticated = True
+                    _rewind(data, body_position)
+                    continue
+                if not (
+                    replayable and policy and policy.retries_response(response, attempt)
+                ):
+                    response.raise_for_status()
+                    return response
+                delay = policy.delay(attempt, response)
+                logger.debug(
+                    f"{method} {url} returned {response.status_code}, retrying in "
+                    f"{delay:.2f}s (retry {attempt + 1} of {policy.total})"
+                )
+                response.close()
+            self.metrics.record_retry(method, endpoint)
+            time.sleep(delay)
+            attempt += 1
+            _rewind(data, body_position)
+
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        headers: Optional[Dict[str, str]],
+        kwargs: Dict[str, Any],
+        hold_slot: bool = True,
+    ) -> requests.Response:
+        started = self.rate_limiter.acquire() if self.rate_limiter else 0.0
+        sent = time.perf_counter()
+        response = None
+        try:
+            response = self.session.request(
+                method,
+                self.base_url + endpoint,
+                cookies=self.cookies,
+                headers={**self.headers, **headers} if headers else self.headers,
+                timeout=self.timeout,
+                **kwargs,
+            )
+            return response
+        finally:
+            status = response.status_code if response is not None else None
+            if self.rate_limiter:
+                release = functools.partial(
+                    self.rate_limiter.release,
+                    started,
+                    overloaded=status is None or status == 429 or status >= 500,
+                    sample_latency=not hasattr(kwargs.get("data"), "read"),
+                    key=f"{method} {endpoint_template(endpoint)}",
+                    latency=time.monotonic() - started,
+                )
+                if (
+                    hold_slot
+                    and kwargs.get("stream")
+                    and response is not None
+                    and response.status_code < 400
+                ):
+                    # A streamed body is downloaded after the headers arrive, so the
+                    # request keeps its slot until the response is closed
+                    _release_on_close(response, release)
+                else:
+                    release()
+            self.metrics.record_request(
+                method,
+                endpoint,
+                status,
+                time.perf_counter() - sent,
+                bytes_sent=_sent_length(response),
+                bytes_received=_received_length(response, kwargs.get("stream", False)),
+            )
+
+
+def _body_position(data: Any) -> Optional[int]:
+    """Return the position to rewind a request body to before replaying it.
+
+    Returns 0 for bodies that can be sent again as-is, the current position for
+    seekable file-like bodies, and None for bodies that cannot be replayed, such as
+    non-seekable streams and iterables, which are used up by the first attempt.
+    """
+    if data is None or isinstance(
+        data, (bytes, bytearray, memoryview, str, dict, list, tuple)
+    ):
+        return 0
+    if not hasattr(data, "read"):
+        return None
+    try:
+        return data.tell() if data.seekable() else None
+    except (AttributeError, OSError):
+        return None
+
+
+def _rewind(data: Any, position: Optional[int]) -> None:
+    if hasattr(data, "read") and position is not None:
+        data.seek(position)
+
+
+def _release_on_close(response: requests.Response, release: Callable[[], None]) -> None:
+    """Call `release` once, when a streamed response is closed."""
+    close = response.close
+    released = threading.Event()
+
+    def close_and_release() -> None:
+        try:
+            close()
+        finally:
+            if not released.is_set():
+                released.set()
+                release()
+
+    response.close = close_and_release  # type: ignore[method-assign]
+
+
+def _content_length(headers: Any) -> int:
+    try:
+        return int(headers.get("Content-Length") or 0)
+    except ValueError:
+        return 0
+
+
+def _received_length(response: Optional[requests.Response], stream: bool) -> int:
+    if response is None:
+        return 0
+    if stream:
+        # Reading the content here would defeat streaming, so use its declared size
+        return _content_length(response.headers)
+    return len(response.content)
+
+
+def _sent_length(response: Optional[requests.Response]) -> int:
+    if response is None:
+        return 0
+    return _content_length(response.request.headers)
@@ -0,0 +1,185 @@
+# dspace/codec.py
+"""DSpace codec module.
+
+This module includes JSON codec classes used by :class:`DSpaceClient` to encode
+request bodies and decode responses, and an iter_json_array function for decoding the
+elements of a large JSON array incrementally.
+"""
+from __future__ import annotations
+
+import abc
+import codecs
+import json
+import logging
+import re
+from typing import Any, Iterable, Iterator, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# States of iter_json_array: expecting the opening bracket, the first element or the
+# closing bracket, an element after a comma, a comma or the closing bracket, and done
+_OPEN, _FIRST, _ELEMENT, _SEPARATOR, _CLOSED = range(5)
+
+
+class JSONCodec(abc.ABC):
+    """Abstract base class for the JSON codec used by a :class:`DSpaceClient`.
+
+    Subclasses implement :meth:`dumps` and :meth:`loads`.
+
+    Attributes:
+        name (str): Name of the codec, e.g. "json"
+    """
+
+    name = "base"
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
+
+    @abc.abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        """Return the UTF-8 encoded JSON representation of an object."""
+
+    @abc.abstractmethod
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Return the object represented by a JSON document.
+
+        Raises:
+            ValueError: if the data is not valid JSON
+        """
+
+
+class StdlibJSONCodec(JSONCodec):
+    """JSON codec using the standard library :mod:`json` module."""
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        """Return the UTF-8 encoded JSON representation of an object."""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Return the object represented by a JSON document."""
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec using the `orjson`_ package, several times faster than the stdlib.
+
+    Raises:
+        ImportError: if orjson is not installed
+
+    .. _orjson: https://github.com/ijl/orjson
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires the orjson package.")
+
+    def dumps(self, obj: Any) -> bytes:
+        """Return the UTF-8 encoded JSON representation of an object."""
+        return orjson.dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Return the object represented by a JSON document."""
+        return orjson.loads(data)
+
+
+def default_codec() -> JSONCodec:
+    """Return an :class:`OrjsonCodec` if orjson is installed, else a stdlib codec."""
+    if orjson is not None:
+        return OrjsonCodec()
+    return StdlibJSONCodec()
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Lazily decode each element of a JSON array from chunks of its encoded text.
+
+    Each element is decoded as soon as the chunks containing it have arrived, so
+    memory use is bounded by the size of the largest element and the chunk size rather
+    than by the size of the whole array. Elements are decoded with the standard
+    library's C scanner, since orjson cannot decode a partial document.
+
+    Args:
+        chunks: Iterable of byte strings that together form a UTF-8 encoded JSON
+            array, e.g. :meth:`requests.Response.iter_content`
+
+    Yields:
+        The decoded value of each element of the array
+
+    Raises:
+        ValueError: if the chunks do not form a valid JSON array
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = iter(chunks)
+    buffer = ""
+    position = 0
+    state = _OPEN
+    # Length the buffer must reach before retrying an element that failed to decode,
+    # so a large element split across many chunks is not decoded again for each one
+    retry_at = 0
+    final = False
+    while not final:
+        chunk = next(pending, None)
+        final = chunk is None
+        buffer = buffer[position:] + decoder.decode(chunk or b"", final=final)
+        position = 0
+        if len(buffer) < retry_at and not final:
+            continue
+        retry_at = 0
+        while True:
+            position = _skip_whitespace(buffer, position)
+            if position == len(buffer):
+                break
+            char = buffer[position]
+            if state == _CLOSED:
+                raise ValueError("Unexpected data after end of JSON array.")
+            if state == _OPEN:
+                if char != "[":
+                    raise ValueError("JSON document is not an array.")
+                position, state = position + 1, _FIRST
+            elif char == "]" and state != _ELEMENT:
+                position, state = position + 1, _CLOSED
+            elif state == _SEPARATOR:
+                if char != ",":
+                    raise ValueError(
+                        f"Expected ',' or ']' in JSON array, got {char!r}."
+                    )
+                position, state = position + 1, _ELEMENT
+            elif char == "]":
+                raise ValueError("Empty element in JSON array.")
+            else:
+                try:
+                    value, end = _DECODER.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    retry_at = 2 * len(buffer)
+                    break
+                if not final and char not in '{["' and _unterminated(buffer, end):
+                    # A number or literal may continue in the next chunk
+                    break
+                position, state = end, _SEPARATOR
+                yield value
+    if state != _CLOSED:
+        raise ValueError("JSON array is incomplete.")
+
+
+def _skip_whitespace(buffer: str, position: int) -> int:
+    match = _WHITESPACE.match(buffer, position)
+    return match.end() if match else position
+
+
+def _unterminated(buffer: str, end: int) -> bool:
+    """Return whether a value ending at `end` is not yet followed by ',' or ']'."""
+    after = _skip_whitespace(buffer, end)
+    return after == len(buffer) or buffer[after] not in ",]"
@@ -0,0 +1,176 @@
+# dspace/collection.py
+"""DSpace collection module.
+
+This module includes a Collection class representing DSpace Collection objects, along
+with functions for interacting with the DSpace REST API "/collections" endpoint.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, ClassVar, Dict, List, Optional, Sequence, Set
+
+from dspace.client import DSpaceClient
+from dspace.utils import LazyRelation, select_identifier
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_RELATIONS = ("parentCommunity", "parentCommunityList")
+
+
+class Collection:
+    """Class representing a DSpace Collection object and its associated API calls.
+
+    Attributes:
+        copyrightText (Optional[str]): The copyright text of the collection
+        expand (List[str]): The expand options for the DSpace REST object
+        handle (Optional[str]): The handle of the collection in DSpace
+        introductoryText (Optional[str]): The introductory text of the collection
+        link (Optional[str]): The DSpace REST API path for the collection
+        name (Optional[str]): The name of the collection in DSpace
+        numberItems (Optional[int]): The number of items in the collection
+        parentCommunity (Optional[dict]): Parent community of the collection in DSpace
+        parentCommunityList (Optional[List[dict]]): List of parent communities of the
+            collection in DSpace
+        shortDescription (Optional[str]): The short description of the collection
+        sidebarText (Optional[str]): The sidebar text of the collection
+        type (str): The DSpace object type
+        uuid (Optional[str]): The internal UUID of the collection in DSpace
+
+    For collections retrieved with :meth:`get`, the relations `parentCommunity` and
+    `parentCommunityList` that were not requested with `expand` are requested from
+    DSpace the first time they are accessed. Use :meth:`Item.iter_collection` to
+    iterate over the items of a collection.
+    """
+
+    __slots__ = (
+        "_client",
+        "_parentCommunity",
+        "_parentCommunityList",
+        "_unloaded",
+        "copyrightText",
+        "handle",
+        "introductoryText",
+        "link",
+        "name",
+        "numberItems",
+        "shortDescription",
+        "sidebarText",
+        "uuid",
+    )
+
+    parentCommunity = LazyRelation()
+    parentCommunityList = LazyRelation()
+
+    expand: ClassVar[List[str]] = [
+        "parentCommunityList",
+        "parentCommunity",
+        "items",
+        "license",
+        "logo",
+        "all",
+    ]
+    type: ClassVar[str] = "collection"
+
+    def __init__(self) -> None:
+        self._client: Optional[DSpaceClient] = None
+        self._unloaded: Set[str] = set()
+        self.copyrightText: Optional[str] = None
+        self.handle: Optional[str] = None
+        self.introductoryText: Optional[str] = None
+        self.link: Optional[str] = None
+        self.name: Optional[str] = None
+        self.numberItems: Optional[int] = None
+        self.parentCommunity = None
+        self.parentCommunityList = None
+        self.shortDescription: Optional[str] = None
+        self.sidebarText: Optional[str] = None
+        self.uuid: Optional[str] = None
+
+    def __repr__(self):
+        return f"Collection(handle={self.handle}, uuid={self.uuid}, name={self.name!r})"
+
+    @classmethod
+    def from_dict(cls, collection: Dict[str, Any]) -> Collection:
+        """Class method to create a Collection object from a DSpace REST response.
+
+        Args:
+            collection: A dict representation of a DSpace Collection object, as
+                returned by the DSpace REST API
+
+        Returns:
+            :class:`Collection` object
+        """
+        new_collection = cls()
+        new_collection.copyrightText = collection.get("copyrightText")
+        new_collection.handle = collection.get("handle")
+        new_collection.introductoryText = collection.get("introductoryText")
+        new_collection.link = collection.get("link")
+        new_collection.name = collection.get("name")
+        new_collection.numberItems = collection.get("numberItems")
+        new_collection.parentCommunity = collection.get("parentCommunity")
+        new_collection.parentCommunityList = collection.get("parentCommunityList")
+        new_collection.shortDescription = collection.get("shortDescription")
+        new_collection.sidebarText = collection.get("sidebarText")
+        new_collection.uuid = collection.get("uuid")
+        return new_collection
+
+    @classmethod
+    def get(
+        cls,
+        client: DSpaceClient,
+        collection_handle: Optional[str] = None,
+        collection_uuid: Optional[str] = None,
+        expand: Optional[Sequence[str]] = None,
+    ) -> Collection:
+        """Class method to retrieve a collection from DSpace with selected relations.
+
+        Requires either the `collection_handle` or the `collection_uuid`, but not both.
+        If both are passed, defaults to using the UUID. Only the relations named in
+        `expand` are included in the response; the others are requested the first time
+        they are accessed on the returned collection.
+
+        Args:
+            client: An authenticated instance of the :class:`DSpaceClient` class
+            collection_handle: The handle of an existing collection in DSpace
+            collection_uuid: The UUID of an existing collection in DSpace
+            expand: The relations to include in the response, any of
+                "parentCommunity", "parentCommunityList" or "all", defaults to None
+                (no relations)
+
+        Returns:
+            :class:`Collection` object
+
+        Raises:
+            :class:`requests.HTTPError`: 404 Not Found if no collection matching
+                provided handle/UUID
+            MissingIdentifierError: if neither `collection_handle` nor
+                `collection_uuid` parameter is provided
+        """
+        params = {"expand": ",".join(expand)} if expand else None
+        if (
+            not collection_uuid
+            and collection_handle
+            and collection_handle not in client.handle_cache
+        ):
+            # The handle endpoint returns the collection itself, saving a second request
+            response = client.get(f"/handle/{collection_handle}", params=params).json()
+            client.handle_cache.set(collection_handle, response["uuid"])
+        else:
+            collection_id = select_identifier(
+                client, collection_handle, collection_uuid
+            )
+            response = client.get(f"/collections/{collection_id}", params=params).json()
+        collection = cls.from_dict(response)
+        collection._client = client
+        expand = expand or []
+        if "all" not in expand:
+            collection._unloaded = {r for r in COLLECTION_RELATIONS if r not in expand}
+        return collection
+
+    def _load_relation(self, name: str) -> Any:
+        if self._client is None:
+            raise AttributeError(f"Cannot load {name} of a collection without a client")
+        response = self._client.get(
+            f"/collections/{self.uuid}", params={"expand": name}
+        ).json()
+        return response.get(name)
@@ -0,0 +1,232 @@
+# dspace/community.py
+"""DSpace community module.
+
+This module includes a Community class representing DSpace Community objects, along
+with functions for interacting with the DSpace REST API "/communities" endpoint.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Sequence, Set
+
+from dspace.client import DSpaceClient
+from dspace.collection import Collection
+from dspace.utils import LazyRelation, paginate, select_identifier
+
+logger = logging.getLogger(__name__)
+
+COMMUNITY_RELATIONS = {
+    "collections": "collections",
+    "parentCommunity": "parentCommunity",
+    "subcommunities": "subCommunities",
+}
+
+
+class Community:
+    """Class representing a DSpace Community object and its associated API calls.
+
+    Attributes:
+        collections (Optional[List[:obj:`Collection`]]): List of :class:`Collection`
+            objects belonging to the community
+        copyrightText (Optional[str]): The copyright text of the community
+        countItems (Optional[int]): The number of items in the community
+        expand (List[str]): The expand options for the DSpace REST object
+        handle (Optional[str]): The handle of the community in DSpace
+        introductoryText (Optional[str]): The introductory text of the community
+        link (Optional[str]): The DSpace REST API path for the community
+        name (Optional[str]): The name of the community in DSpace
+        parentCommunity (Optional[dict]): Parent community of the community in DSpace,
+            None for a top-level community
+        shortDescription (Optional[str]): The short description of the community
+        sidebarText (Optional[str]): The sidebar text of the community
+        subcommunities (Optional[List[:obj:`Community`]]): List of :class:`Community`
+            objects directly below the community
+        type (str): The DSpace object type
+        uuid (Optional[str]): The internal UUID of the community in DSpace
+
+    For communities retrieved with :meth:`get` or :meth:`iter_top`, the relations
+    `collections`, `parentCommunity` and `subcommunities` that were not requested with
+    `expand` are requested from DSpace the first time they are accessed. To retrieve
+    the whole hierarchy at once, see :func:`dspace.hierarchy.crawl_hierarchy`.
+    """
+
+    __slots__ = (
+        "_client",
+        "_collections",
+        "_parentCommunity",
+        "_subcommunities",
+        "_unloaded",
+        "copyrightText",
+        "countItems",
+        "handle",
+        "introductoryText",
+        "link",
+        "name",
+        "shortDescription",
+        "sidebarText",
+        "uuid",
+    )
+
+    collections = LazyRelation()
+    parentCommunity = LazyRelation()
+    subcommunities = LazyRelation()
+
+    expand: ClassVar[List[str]] = [
+        "parentCommunity",
+        "collections",
+        "subCommunities",
+        "logo",
+        "all",
+    ]
+    type: ClassVar[str] = "community"
+
+    def __init__(self) -> None:
+        self._client: Optional[DSpaceClient] = None
+        self._unloaded: Set[str] = set()
+        self.collections = []
+        self.copyrightText: Optional[str] = None
+        self.countItems: Optional[int] = None
+        self.handle: Optional[str] = None
+        self.introductoryText: Optional[str] = None
+        self.link: Optional[str] = None
+        self.name: Optional[str] = None
+        self.parentCommunity = None
+        self.shortDescription: Optional[str] = None
+        self.sidebarText: Optional[str] = None
+        self.subcommunities = []
+        self.uuid: Optional[str] = None
+
+    def __repr__(self):
+        return f"Community(handle={self.handle}, uuid={self.uuid}, name={self.name!r})"
+
+    @classmethod
+    def from_dict(cls, community: Dict[str, Any]) -> Community:
+        """Class method to create a Community object from a DSpace REST response.
+
+        Expanded collections and subcommunities included in the response are
+        converted to :class:`Collection` and :class:`Community` objects.
+
+        Args:
+            community: A dict representation of a DSpace Community object, as returned
+                by the DSpace REST API
+
+        Returns:
+            :class:`Community` object
+        """
+        new_community = cls()
+        new_community.collections = [
+            Collection.from_dict(c) for c in community.get("collections") or []
+        ]
+        new_community.copyrightText = community.get("copyrightText")
+        new_community.countItems = community.get("countItems")
+        new_community.handle = community.get("handle")
+        new_community.introductoryText = community.get("introductoryText")
+        new_community.link = community.get("link")
+        new_community.name = community.get("name")
+        new_community.parentCommunity = community.get("parentCommunity")
+        new_community.shortDescription = community.get("shortDescription")
+        new_community.sidebarText = community.get("sidebarText")
+        new_community.subcommunities = [
+            cls.from_dict(c) for c in community.get("subcommunities") or []
+        ]
+        new_community.uuid = community.get("uuid")
+        return new_community
+
+    @classmethod
+    def get(
+        cls,
+        client: DSpaceClient,
+        community_handle: Optional[str] = None,
+        community_uuid: Optional[str] = None,
+        expand: Optional[Sequence[str]] = None,
+    ) -> Community:
+        """Class method to retrieve a community from DSpace with selected relations.
+
+        Requires either the `community_handle` or the `community_uuid`, but not both.
+        If both are passed, defaults to using the UUID. Only the relations named in
+        `expand` are included in the response; the others are requested the first time
+        they are accessed on the returned community.
+
+        Args:
+            client: An authenticated instance of the :class:`DSpaceClient` class
+            community_handle: The handle of an existing community in DSpace
+            community_uuid: The UUID of an existing community in DSpace
+            expand: The relations to include in the response, any of
+                "parentCommunity", "collections", "subCommunities" or "all", defaults
+                to None (no relations)
+
+        Returns:
+            :class:`Community` object
+
+        Raises:
+            :class:`requests.HTTPError`: 404 Not Found if no community matching
+                provided handle/UUID
+            MissingIdentifierError: if neither `community_handle` nor
+                `community_uuid` parameter is provided
+        """
+        params = {"expand": ",".join(expand)} if expand else None
+        if (
+            not community_uuid
+            and community_handle
+            and community_handle not in client.handle_cache
+        ):
+            # The handle endpoint returns the community itself, saving a second request
+            response = client.get(f"/handle/{community_handle}", params=params).json()
+            client.handle_cache.set(community_handle, response["uuid"])
+        else:
+            community_id = select_identifier(client, community_handle, community_uuid)
+            response = client.get(f"/communities/{community_id}", params=params).json()
+        community = cls.from_dict(response)
+        community._defer_relations(client, expand)
+        return community
+
+    @classmethod
+    def iter_top(
+        cls,
+        client: DSpaceClient,
+        limit: int = 100,
+    ) -> Iterator[Community]:
+        """Lazily yield each top-level community, one page of communities at a time.
+
+        Args:
+            client: An authenticated instance of the :class:`DSpaceClient` class
+            limit: The number of communities to request per page, defaults to 100
+
+        Yields:
+            :class:`Community` object for each top-level community
+        """
+        for community in paginate(client, "/communities/top-communities", limit=limit):
+            new_community = cls.from_dict(community)
+            new_community._defer_relations(client, None)
+            yield new_community
+
+    def _defer_relations(
+        self, client: DSpaceClient, expand: Optional[Sequence[str]]
+    ) -> None:
+        expand = expand or []
+        self._client = client
+        if "all" not in expand:
+            self._unloaded = {
+                attribute
+                for attribute, option in COMMUNITY_RELATIONS.items()
+                if option not in expand
+            }
+
+    def _load_relation(self, name: str) -> Any:
+        client = self._client
+        if client is None:
+            raise AttributeError(f"Cannot load {name} of a community without a client")
+        if name == "collections":
+            return [
+                Collection.from_dict(c)
+                for c in paginate(client, f"/communities/{self.uuid}/collections")
+            ]
+        if name == "subcommunities":
+            return [
+                Community.from_dict(c)
+                for c in paginate(client, f"/communities/{self.uuid}/communities")
+            ]
+        response = client.get(
+            f"/communities/{self.uuid}", params={"expand": COMMUNITY_RELATIONS[name]}
+        ).json()
+        return response.get(name)
@@ -0,0 +1,390 @@
+# dspace/duplicates.py
+"""DSpace duplicates module.
+
+This module includes a DuplicateIndex class for detecting items that already exist in
+DSpace from their metadata, without a request to DSpace per candidate item.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import unicodedata
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from dspace.client import DSpaceClient
+from dspace.item import Item
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEYS = ("dc.identifier.*",)
+
+
+def normalize_identifier(value: str) -> str:
+    """Normalize an identifier by collapsing whitespace and ignoring case.
+
+    Args:
+        value: Metadata value, e.g. " DOI:10.1000/XYZ "
+
+    Returns:
+        Normalized value, e.g. "doi:10.1000/xyz"
+    """
+    return " ".join(value.split()).casefold()
+
+
+def normalize_title(value: str) -> str:
+    """Normalize a title by ignoring case, accents, punctuation and whitespace.
+
+    Args:
+        value: Metadata value, e.g. "Café  Society: A History."
+
+    Returns:
+        Normalized value, e.g. "cafe society a history"
+    """
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    characters = (
+        c if c.isalnum() else " " for c in decomposed if not unicodedata.combining(c)
+    )
+    return " ".join("".join(characters).split())
+
+
+DEFAULT_NORMALIZERS: Dict[str, Callable[[str], str]] = {
+    "dc.title": normalize_title,
+    "dc.title.alternative": normalize_title,
+}
+
+
+class DuplicateMatch:
+    """Class representing an indexed item matching a candidate item.
+
+    Args:
+        key: The metadata key the items share a value for
+        value: The normalized value the items share
+        uuid: The UUID of the indexed item in DSpace
+        handle: The handle of the indexed item in DSpace, if known
+
+    Attributes:
+        handle (Optional[str]): The handle of the indexed item in DSpace
+        key (str): The metadata key the items share a value for
+        uuid (str): The UUID of the indexed item in DSpace
+        value (str): The normalized value the items share
+    """
+
+    def __init__(self, key: str, value: str, uuid: str, handle: Optional[str] = None):
+        self.key = key
+        self.value = value
+        self.uuid = uuid
+        self.handle = handle
+
+    def __repr__(self):
+        return (
+            f"DuplicateMatch(key={self.key!r}, value={self.value!r}, "
+            f"uuid={self.uuid}, handle={self.handle})"
+        )
+
+
+class DuplicateIndex:
+    """A thread-safe local index of item metadata values to DSpace items.
+
+    The values of the selected metadata `keys` of each indexed item are normalized
+    and mapped to the item's UUID and handle, so whether a candidate item shares a
+    value with an item already in DSpace is answered with one dictionary lookup per
+    metadata entry, without a request to DSpace. Build the index from a collection
+    with :meth:`build` or from harvested items with :meth:`add_items`, and keep it
+    current by passing it to :func:`dspace.batch.ingest_items`, which adds each item
+    it posts.
+
+    A key ending in ".*" selects every key with that prefix, e.g. "dc.identifier.*"
+    selects "dc.identifier.uri" and "dc.identifier.doi". Values are only compared
+    with values of the same key. Values are normalized with the function for their
+    key in `normalizers`, or with :func:`normalize_identifier` if there is none.
+    Values are stored normalized, so an index must be loaded with the normalizers it
+    was saved with. It must also be loaded with the keys it was saved with, or
+    :meth:`load` raises ValueError.
+
+    Args:
+        keys: The metadata keys to index, defaults to ("dc.identifier.*",). Listed
+            in order of precedence when an item matches on more than one key
+        normalizers: Functions normalizing the values of each key, defaults to
+            :func:`normalize_title` for "dc.title" and "dc.title.alternative"
+        path: Optional local file path to persist the index to as JSON. Loaded when
+            the index is created if it exists
+
+    Attributes:
+        keys (Tuple[str, ...]): The metadata keys indexed
+        path (Optional[str]): Local file path the index is persisted to
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[str] = DEFAULT_KEYS,
+        normalizers: Optional[Mapping[str, Callable[[str], str]]] = None,
+        path: Optional[str] = None,
+    ):
+        self.keys = tuple(keys)
+        self.path = path
+        self._normalizers = dict(
+            DEFAULT_NORMALIZERS if normalizers is None else normalizers
+        )
+        self._exact = {k for k in self.keys if not k.endswith(".*")}
+        self._prefixes = tuple(k[:-1] for k in self.keys if k.endswith(".*"))
+        self._selected: Dict[str, bool] = {}
+        # The UUIDs of the items with each value, as an insertion-ordered set
+        self._values: Dict[Tuple[str, str], Dict[str, None]] = {}
+        self._items: Dict[str, Tuple[Optional[str], List[Tuple[str, str]]]] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __contains__(self, item: Item) -> bool:
+        return self.find(item) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def __repr__(self):
+        return f"DuplicateIndex(keys={self.keys!r}, path={self.path!r})"
+
+    @classmethod
+    def build(
+        cls,
+        client: DSpaceClient,
+        collection_handle: Optional[str] = None,
+        collection_uuid: Optional[str] = None,
+        keys: Sequence[str] = DEFAULT_KEYS,
+        normalizers: Optional[Mapping[str, Callable[[str], str]]] = None,
+        path: Optional[str] = None,
+        limit: int = 100,
+    ) -> DuplicateIndex:
+        """Class method to build an index of the items in a collection.
+
+        The collection's items are listed with their metadata, a page at a time and
+        decoded incrementally, so memory use does not depend on the collection size.
+
+        Requires either the `collection_handle` or the `collection_uuid`, but not both.
+        If both are passed, defaults to using the UUID.
+
+        Args:
+            client: An authenticated instance of the :class:`DSpaceClient` class
+            collection_handle: The handle of an existing collection in DSpace
+            collection_uuid: The UUID of an existing collection in DSpace
+            keys: The metadata keys to index, see :class:`DuplicateIndex`
+            normalizers: Functions normalizing the values of each key, see
+                :class:`DuplicateIndex`
+            path: Optional local file path to persist the index to. Items already
+                in the file are kept
+            limit: The number of items to request per page, defaults to 100
+
+        Returns:
+            :class:`DuplicateIndex` object
+
+        Raises:
+            :class:`requests.HTTPError`: 404 Not Found if no collection matching
+                provided handle/UUID
+            MissingIdentifierError: if neither `collection_handle` nor
+                `collection_uuid` parameter is provided
+        """
+        index = cls(keys=keys, normalizers=normalizers, path=path)
+        items = Item.iter_collection(
+            client,
+            collection_handle=collection_handle,
+            collection_uuid=collection_uuid,
+            expand=["metadata"],
+            limit=limit,
+            stream=True,
+        )
+        added = index.add_items(items)
+        logger.debug("Indexed %d items of collection", added)
+        return index
+
+    def add(self, item: Item) -> None:
+        """Index an item's values for the selected keys, replacing any it had.
+
+        Args:
+            item: An :class:`Item` that exists in DSpace, with its `uuid` set
+
+        Raises:
+            ValueError: if the item's `uuid` is not set
+        """
+        if not item.uuid:
+            raise ValueError("Only items with a uuid can be indexed.")
+        entries = self._entries(item)
+        with self._lock:
+            self._discard(item.uuid)
+            self._add(item.uuid, item.handle, entries)
+
+    def add_items(self, items: Iterable[Item]) -> int:
+        """Index each of the items, e.g. from :func:`dspace.harvest.harvest_items`.
+
+        Args:
+            items: Iterable of :class:`Item` objects that exist in DSpace
+
+        Returns:
+            The number of items indexed
+        """
+        count = 0
+        for item in items:
+            self.add(item)
+            count += 1
+        return count
+
+    def clear(self) -> None:
+        """Remove all items from the index."""
+        with self._lock:
+            self._values.clear()
+            self._items.clear()
+
+    def discard(self, uuid: str) -> None:
+        """Remove an item from the index if present, e.g. after deleting it.
+
+        Args:
+            uuid: The UUID of the item in DSpace
+        """
+        with self._lock:
+            self._discard(uuid)
+
+    def find(self, item: Item) -> Optional[DuplicateMatch]:
+        """Return the indexed item sharing a value with `item`, if any.
+
+        The item's own entry is ignored if it is indexed. If the item shares values
+        with more than one indexed item, the match on the key listed first in `keys`
+        is returned.
+
+        Args:
+            item: A candidate :class:`Item`
+
+        Returns:
+            :class:`DuplicateMatch` object, or None if no indexed item matches
+        """
+        best: Optional[Tuple[int, DuplicateMatch]] = None
+        for key, value in self._entries(item):
+            match = self._lookup(key, value, exclude=item.uuid)
+            if match is None:
+                continue
+            rank = self._rank(key)
+            if best is None or rank < best[0]:
+                best = (rank, match)
+        return best[1] if best else None
+
+    def load(self, path: str) -> None:
+        """Load indexed items from a JSON file written by :meth:`save`.
+
+        Args:
+            path: Local file path to load the index from
+
+        Raises:
+            ValueError: if the index was saved with different `keys`
+        """
+        with open(path) as f:
+            index = json.load(f)
+        if tuple(index["keys"]) != self.keys:
+            raise ValueError(
+                f"Duplicate index at {path} was saved with keys {index['keys']}, "
+                f"not {list(self.keys)}."
+            )
+        items = index["items"]
+        with self._lock:
+            for uuid, (handle, entries) in items.items():
+                self._discard(uuid)
+                self._add(uuid, handle, [(k, v) for k, v in entries])
+        logger.debug("Loaded %d indexed items from %s", len(items), path)
+
+    def lookup(
+        self, key: str, value: str, normalized: bool = False
+    ) -> Optional[DuplicateMatch]:
+        """Return the indexed item with a value for a metadata key, if any.
+
+        Args:
+            key: Metadata key, e.g. "dc.identifier.doi"
+            value: Metadata value
+            normalized: Whether `value` is already normalized, defaults to False
+
+        Returns:
+            :class:`DuplicateMatch` object, or None if no indexed item has the value
+        """
+        if not normalized:
+            value = self._normalize(key, value)
+        return self._lookup(key, value)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Atomically write the index to a JSON file.
+
+        Args:
+            path: Local file path to save the index to, defaults to `self.path`
+
+        Raises:
+            ValueError: if no `path` is provided and `self.path` is not set
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No path provided to save the duplicate index to.")
+        with self._lock:
+            items = {
+                uuid: [handle, [list(e) for e in entries]]
+                for uuid, (handle, entries) in self._items.items()
+            }
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, delete=False, suffix=".tmp"
+        ) as f:
+            json.dump({"keys": list(self.keys), "items": items}, f)
+        os.replace(f.name, path)
+        logger.debug("Saved %d indexed items to %s", len(items), path)
+
+    def _add(
+        self, uuid: str, handle: Optional[str], entries: List[Tuple[str, str]]
+    ) -> None:
+        self._items[uuid] = (handle, entries)
+        for entry in entries:
+            self._values.setdefault(entry, {})[uuid] = None
+
+    def _discard(self, uuid: str) -> None:
+        indexed = self._items.pop(uuid, None)
+        if indexed is None:
+            return
+        for entry in indexed[1]:
+            uuids = self._values.get(entry)
+            if uuids is not None:
+                uuids.pop(uuid, None)
+                if not uuids:
+                    del self._values[entry]
+
+    def _entries(self, item: Item) -> List[Tuple[str, str]]:
+        entries = []
+        for m in item.metadata or []:
+            if not m.value or not self._is_selected(m.key):
+                continue
+            value = self._normalize(m.key, m.value)
+            if value:
+                entries.append((m.key, value))
+        return entries
+
+    def _is_selected(self, key: str) -> bool:
+        selected = self._selected.get(key)
+        if selected is None:
+            selected = key in self._exact or key.startswith(self._prefixes)
+            self._selected[key] = selected
+        return selected
+
+    def _lookup(
+        self, key: str, value: str, exclude: Optional[str] = None
+    ) -> Optional[DuplicateMatch]:
+        with self._lock:
+            for uuid in self._values.get((key, value), ()):
+                if uuid != exclude:
+                    return DuplicateMatch(key, value, uuid, self._items[uuid][0])
+        return None
+
+    def _normalize(self, key: str, value: str) -> str:
+        return self._normalizers.get(key, normalize_identifier)(value)
+
+    def _rank(self, key: str) -> int:
+        for rank, pattern in enumerate(self.keys):
+            if key == pattern or (
+                pattern.endswith(".*") and key.startswith(pattern[:-1])
+            ):
+                return rank
+        return len(self.keys)
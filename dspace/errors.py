@@ -14,7 +14,7 @@ class DSpacePythonError(Exception):
 
 
 class MissingFilePathError(DSpacePythonError):
-    """Exception raised when required file_path attribute is not set on a bitstream.
+    """Exception raised when neither file_path nor content is set on a bitstream.
 
     Args:
         expression: Input expression in which the error occurred
@@ -25,11 +25,38 @@ class MissingFilePathError(DSpacePythonError):
     """
 
     def __init__(self, expression: str):
-        message = "Bitstream requires a file_path for this operation."
+        message = "Bitstream requires a file_path or content for this operation."
         super().__init__(message)
         self.expression = expression
 
 
+class MetadataUpdateError(DSpacePythonError):
+    """Exception raised when replacing an item's metadata fails after clearing it.
+
+    Args:
+        expression: Input expression in which the error occurred
+        item_uuid: The UUID of the item whose metadata could not be replaced
+        restored: Whether the item's previous metadata was restored
+
+    Attributes:
+        expression (str): Input expression in which the error occurred
+        item_uuid (str): The UUID of the item whose metadata could not be replaced
+        message (str): Explanation of the error
+        restored (bool): Whether the item's previous metadata was restored
+    """
+
+    def __init__(self, expression: str, item_uuid: str, restored: bool):
+        if restored:
+            outcome = "its previous metadata was restored"
+        else:
+            outcome = "restoring its previous metadata also failed"
+        message = f"Failed to replace the metadata of item {item_uuid}; {outcome}."
+        super().__init__(message)
+        self.expression = expression
+        self.item_uuid = item_uuid
+        self.restored = restored
+
+
 class MissingIdentifierError(DSpacePythonError):
     """Exception raised when required identifier is not provided.
 
@@ -48,3 +75,62 @@ class MissingIdentifierError(DSpacePythonError):
         message = "Operation requires either a handle or an uuid."
         super().__init__(message)
         self.expression = expression
+
+
+class ChecksumMismatchError(DSpacePythonError):
+    """Exception raised when a DSpace checksum does not match the uploaded bytes.
+
+    Args:
+        expression: Input expression in which the error occurred
+        algorithm: The checksum algorithm, e.g. "MD5"
+        expected: The checksum computed from the bytes sent to DSpace
+        actual: The checksum returned by DSpace
+
+    Attributes:
+        actual (str): The checksum returned by DSpace
+        algorithm (str): The checksum algorithm
+        expected (str): The checksum computed from the bytes sent to DSpace
+        expression (str): Input expression in which the error occurred
+        message (str): Explanation of the error
+    """
+
+    def __init__(self, expression: str, algorithm: str, expected: str, actual: str):
+        message = (
+            f"DSpace {algorithm} checksum {actual} does not match checksum {expected} "
+            "of uploaded bytes."
+        )
+        super().__init__(message)
+        self.actual = actual
+        self.algorithm = algorithm
+        self.expected = expected
+        self.expression = expression
+
+
+class TransferStalledError(DSpacePythonError):
+    """Exception raised when a transfer's throughput stays below its minimum rate.
+
+    Args:
+        expression: Input expression in which the error occurred
+        rate: The throughput in bytes per second when the transfer was aborted
+        min_rate: The lowest acceptable throughput in bytes per second
+        duration: The number of seconds throughput stayed below `min_rate`
+
+    Attributes:
+        duration (float): The number of seconds throughput stayed below `min_rate`
+        expression (str): Input expression in which the error occurred
+        message (str): Explanation of the error
+        min_rate (float): The lowest acceptable throughput in bytes per second
+        rate (float): The throughput in bytes per second when the transfer was
+            aborted
+    """
+
+    def __init__(self, expression: str, rate: float, min_rate: float, duration: float):
+        message = (
+            f"Transfer stalled at {rate:.0f} bytes/s, below the minimum of "
+            f"{min_rate:.0f} bytes/s for {duration:.1f}s."
+        )
+        super().__init__(message)
+        self.duration = duration
+        self.expression = expression
+        self.min_rate = min_rate
+        self.rate = rate
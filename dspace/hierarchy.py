@@ -0,0 +1,420 @@
+# dspace/hierarchy.py
+"""DSpace hierarchy module.
+
+This module includes a CommunityTree class holding the tree of communities and
+collections of a DSpace repository, and a crawl_hierarchy function that builds and
+refreshes it concurrently.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from dspace.client import DSpaceClient
+from dspace.collection import Collection
+from dspace.community import Community
+from dspace.utils import paginate, select_identifier
+
+logger = logging.getLogger(__name__)
+
+COMMUNITY_EXPAND = "subCommunities,collections"
+
+_TreeState = Tuple[
+    List[str],
+    Dict[str, Dict[str, Any]],
+    Dict[str, Tuple[List[str], List[str]]],
+    Dict[str, Dict[str, Any]],
+    Dict[str, float],
+]
+
+
+class CommunityTree:
+    """An in-memory tree of the communities and collections of a DSpace repository.
+
+    The tree is built and refreshed by :func:`crawl_hierarchy`. It holds the
+    response of each community, the responses of its collections and the time it was
+    fetched, and links them into :class:`Community` and :class:`Collection` objects
+    whose `subcommunities` and `collections` are set, so the hierarchy can be walked
+    without further requests. If a `path` is provided, the tree is loaded from that
+    file when it is created and written back to it by :meth:`save`.
+
+    Args:
+        path: Optional local file path to persist the tree to as JSON
+
+    Attributes:
+        path (Optional[str]): Local file path the tree is persisted to
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._roots: List[str] = []
+        self._communities: Dict[str, Dict[str, Any]] = {}
+        self._children: Dict[str, Tuple[List[str], List[str]]] = {}
+        self._collections: Dict[str, Dict[str, Any]] = {}
+        self._fetched: Dict[str, float] = {}
+        self._link()
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __contains__(self, identifier: str) -> bool:
+        return self.get(identifier) is not None
+
+    def __len__(self) -> int:
+        return len(self._community_objects) + len(self._collection_objects)
+
+    def __repr__(self):
+        return (
+            f"CommunityTree(communities={len(self._communities)}, "
+            f"collections={len(self._collections)}, path={self.path!r})"
+        )
+
+    @property
+    def collections(self) -> List[Collection]:
+        """All collections in the tree."""
+        return list(self._collection_objects.values())
+
+    @property
+    def communities(self) -> List[Community]:
+        """All communities in the tree."""
+        return list(self._community_objects.values())
+
+    @property
+    def roots(self) -> List[Community]:
+        """The top-level communities of the tree."""
+        return [
+            self._community_objects[u]
+            for u in self._roots
+            if u in self._community_objects
+        ]
+
+    def ancestors(self, identifier: str) -> List[Community]:
+        """Return the communities above a community or collection, top-level first.
+
+        A collection belonging to more than one community is followed up through the
+        first of them.
+
+        Args:
+            identifier: The UUID or handle of a community or collection in the tree
+
+        Returns:
+            List of :class:`Community` objects, empty for a top-level community
+
+        Raises:
+            KeyError: if no community or collection in the tree matches `identifier`
+        """
+        uuid = self._handles.get(identifier, identifier)
+        if self.get(uuid) is None:
+            raise KeyError(identifier)
+        ancestors: List[Community] = []
+        seen = {uuid}
+        while self._parents.get(uuid):
+            uuid = self._parents[uuid][0]
+            if uuid in seen:
+                break
+            seen.add(uuid)
+            ancestors.append(self._community_objects[uuid])
+        ancestors.reverse()
+        return ancestors
+
+    def get(self, identifier: str) -> Optional[Union[Community, Collection]]:
+        """Return the community or collection with a UUID or handle, if in the tree.
+
+        Args:
+            identifier: The UUID or handle of a community or collection
+
+        Returns:
+            :class:`Community` or :class:`Collection` object, or None if not found
+        """
+        uuid = self._handles.get(identifier, identifier)
+        return self._community_objects.get(uuid) or self._collection_objects.get(uuid)
+
+    def load(self, path: str) -> None:
+        """Load the tree from a JSON file written by :meth:`save`, replacing it.
+
+        Args:
+            path: Local file path to load the tree from
+        """
+        with open(path) as f:
+            tree = json.load(f)
+        self._roots = tree["roots"]
+        self._communities = {}
+        self._children = {}
+        self._fetched = {}
+        for uuid, community in tree["communities"].items():
+            self._communities[uuid] = community["community"]
+            self._children[uuid] = (
+                community["subcommunities"],
+                community["collections"],
+            )
+            self._fetched[uuid] = community["fetched"]
+        self._collections = tree["collections"]
+        self._link()
+        logger.debug("Loaded %d communities and collections from %s", len(self), path)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Atomically write the tree to a JSON file.
+
+        Args:
+            path: Local file path to save the tree to, defaults to `self.path`
+
+        Raises:
+            ValueError: if no `path` is provided and `self.path` is not set
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No path provided to save the community tree to.")
+        tree = {
+            "roots": self._roots,
+            "communities": {
+                uuid: {
+                    "community": community,
+                    "subcommunities": self._children[uuid][0],
+                    "collections": self._children[uuid][1],
+                    "fetched": self._fetched[uuid],
+                }
+                for uuid, community in self._communities.items()
+            },
+            "collections": self._collections,
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, delete=False, suffix=".tmp"
+        ) as f:
+            json.dump(tree, f)
+        os.replace(f.name, path)
+        logger.debug("Saved %d communities and collections to %s", len(self), path)
+
+    def walk(self) -> Iterator[Union[Community, Collection]]:
+        """Yield each community and collection breadth-first from the top level.
+
+        Each community is followed by its collections. An object reachable through
+        more than one community is yielded once.
+        """
+        queue: Deque[str] = deque(self._roots)
+        seen = set(self._roots)
+        while queue:
+            uuid = queue.popleft()
+            if uuid not in self._community_objects:
+                continue
+            yield self._community_objects[uuid]
+            subcommunities, collections = self._children[uuid]
+            for collection in collections:
+                if collection not in seen and collection in self._collection_objects:
+                    seen.add(collection)
+                    yield self._collection_objects[collection]
+            for subcommunity in subcommunities:
+                if subcommunity not in seen:
+                    seen.add(subcommunity)
+                    queue.append(subcommunity)
+
+    def _is_fresh(self, uuid: str, max_age: Optional[float], now: float) -> bool:
+        if max_age is None or uuid not in self._communities:
+            return False
+        return now - self._fetched[uuid] < max_age
+
+    def _link(self) -> None:
+        communities = {u: Community.from_dict(r) for u, r in self._communities.items()}
+        collections = {u: Collection.from_dict(r) for u, r in self._collections.items()}
+        parents: Dict[str, List[str]] = {}
+        for uuid, (subcommunity_uuids, collection_uuids) in self._children.items():
+            community = communities[uuid]
+            community.subcommunities = [
+                communities[s] for s in subcommunity_uuids if s in communities
+            ]
+            community.collections = [
+                collections[c] for c in collection_uuids if c in collections
+            ]
+            for child in subcommunity_uuids + collection_uuids:
+                parents.setdefault(child, []).append(uuid)
+        self._community_objects = communities
+        self._collection_objects = collections
+        self._parents = parents
+        self._handles = {c.handle: u for u, c in communities.items() if c.handle}
+        self._handles.update({c.handle: u for u, c in collections.items() if c.handle})
+
+    def _prune(self) -> None:
+        reachable_communities = set()
+        reachable_collections = set()
+        queue: Deque[str] = deque(self._roots)
+        while queue:
+            uuid = queue.popleft()
+            if uuid in reachable_communities or uuid not in self._communities:
+                continue
+            reachable_communities.add(uuid)
+            subcommunities, collections = self._children[uuid]
+            queue.extend(subcommunities)
+            reachable_collections.update(collections)
+        for uuid in set(self._communities) - reachable_communities:
+            del self._communities[uuid]
+            del self._children[uuid]
+            del self._fetched[uuid]
+        for uuid in set(self._collections) - reachable_collections:
+            del self._collections[uuid]
+
+    def _restore(self, snapshot: _TreeState) -> None:
+        (
+            self._roots,
+            self._communities,
+            self._children,
+            self._collections,
+            self._fetched,
+        ) = snapshot
+
+    def _set_community(self, response: Dict[str, Any], fetched: float) -> List[str]:
+        uuid = response["uuid"]
+        subcommunities = response.get("subcommunities") or []
+        collections = response.get("collections") or []
+        self._communities[uuid] = {
+            k: v
+            for k, v in response.items()
+            if k not in ("subcommunities", "collections")
+        }
+        self._children[uuid] = (
+            [c["uuid"] for c in subcommunities],
+            [c["uuid"] for c in collections],
+        )
+        for collection in collections:
+            self._collections[collection["uuid"]] = collection
+        self._fetched[uuid] = fetched
+        return self._children[uuid][0]
+
+    def _snapshot(self) -> _TreeState:
+        return (
+            list(self._roots),
+            dict(self._communities),
+            dict(self._children),
+            dict(self._collections),
+            dict(self._fetched),
+        )
+
+
+def crawl_hierarchy(
+    client: DSpaceClient,
+    tree: Optional[CommunityTree] = None,
+    community_handles: Optional[Iterable[str]] = None,
+    community_uuids: Optional[Iterable[str]] = None,
+    max_age: Optional[float] = None,
+    max_workers: int = 8,
+    limit: int = 100,
+) -> CommunityTree:
+    """Build or refresh the tree of communities and collections breadth-first.
+
+    Each community is requested with its subcommunities and collections expanded, so
+    the tree costs one request per community. Up to `max_workers` communities are
+    requested at once; as each response arrives, its subcommunities are queued, so
+    the hierarchy is crawled level by level without waiting for a whole level to
+    finish.
+
+    Without `community_handles` or `community_uuids`, the top-level communities are
+    listed and the whole hierarchy is crawled. If `max_age` is set, communities in
+    `tree` fetched less than `max_age` seconds ago are not requested again; their
+    recorded subcommunities are crawled instead, so a periodic refresh only requests
+    what is stale. With `community_handles` or `community_uuids`, only the subtrees
+    below those communities are requested again, and the rest of the tree is kept.
+    Communities and collections no longer reachable from the top-level communities
+    are removed from the tree. If any request fails, `tree` is left as it was before
+    the crawl.
+
+    Args:
+        client: An authenticated instance of the :class:`DSpaceClient` class. Its
+            `pool_maxsize` should be at least `max_workers`
+        tree: The :class:`CommunityTree` to refresh, defaults to a new empty tree
+        community_handles: Handles of communities whose subtrees to refresh
+        community_uuids: UUIDs of communities whose subtrees to refresh
+        max_age: The number of seconds a community in `tree` stays fresh when
+            crawling the whole hierarchy, defaults to None (request every community)
+        max_workers: The maximum number of communities to request at once, defaults
+            to 8
+        limit: The number of top-level communities to request per page, defaults to
+            100
+
+    Returns:
+        The built or refreshed :class:`CommunityTree`. It is not saved; call
+        :meth:`CommunityTree.save` to persist it
+
+    Raises:
+        :class:`requests.HTTPError`: 404 Not Found if no community matching a
+            provided handle/UUID
+    """
+    tree = tree if tree is not None else CommunityTree()
+    starts = [select_identifier(client, h, None) for h in community_handles or []]
+    starts.extend(community_uuids or [])
+    # The tree is updated as responses arrive, so restore it if the crawl fails
+    # rather than leave it half-refreshed and unpruned
+    snapshot = tree._snapshot()
+    try:
+        requested = _crawl(client, tree, starts, max_age, max_workers, limit)
+        tree._prune()
+    except BaseException:
+        tree._restore(snapshot)
+        raise
+    tree._link()
+    logger.debug(
+        "Crawled %d communities and collections with %d requests", len(tree), requested
+    )
+    return tree
+
+
+def _crawl(
+    client: DSpaceClient,
+    tree: CommunityTree,
+    starts: List[str],
+    max_age: Optional[float],
+    max_workers: int,
+    limit: int,
+) -> int:
+    if starts:
+        force = True
+        if not tree._roots:
+            tree._roots = list(starts)
+    else:
+        force = max_age is None
+        tree._roots = [
+            c["uuid"]
+            for c in paginate(client, "/communities/top-communities", limit=limit)
+        ]
+        starts = tree._roots
+    now = time.time()
+    queue: Deque[Tuple[str, bool]] = deque((uuid, force) for uuid in starts)
+    queued = set(starts)
+    in_flight: Dict[Future, bool] = {}
+    requested = 0
+
+    def fetch(uuid: str) -> Dict[str, Any]:
+        return client.get(
+            f"/communities/{uuid}", params={"expand": COMMUNITY_EXPAND}
+        ).json()
+
+    def enqueue(subcommunities: List[str], force: bool) -> None:
+        for subcommunity in subcommunities:
+            if subcommunity not in queued:
+                queued.add(subcommunity)
+                queue.append((subcommunity, force))
+
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="dspace-hierarchy"
+    )
+    try:
+        while queue or in_flight:
+            while queue and len(in_flight) < max_workers:
+                uuid, forced = queue.popleft()
+                if not forced and tree._is_fresh(uuid, max_age, now):
+                    enqueue(tree._children[uuid][0], forced)
+                    continue
+                in_flight[executor.submit(fetch, uuid)] = forced
+                requested += 1
+            if not in_flight:
+                continue
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                forced = in_flight.pop(future)
+                enqueue(tree._set_community(future.result(), time.time()), forced)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return requested
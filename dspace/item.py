@@ -8,14 +8,35 @@ with functions for interacting with the DSpace REST API "/items" endpoint.
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Optional
+import sys
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from dspace.bitstream import Bitstream
 from dspace.client import DSpaceClient
-from dspace.utils import select_identifier
+from dspace.errors import MetadataUpdateError, MissingIdentifierError
+from dspace.utils import LazyRelation, paginate, select_identifier
 
 logger = logging.getLogger(__name__)
 
+ITEM_RELATIONS = (
+    "metadata",
+    "parentCollection",
+    "parentCollectionList",
+    "parentCommunityList",
+    "bitstreams",
+)
+
+ITEM_EXPAND = ITEM_RELATIONS + ("all",)
+
 
 class Item:
     """Class representing a DSpace Item object and its associated API calls.
@@ -43,35 +64,61 @@ class Item:
         type (str): The DSpace object type
         uuid (Optional[str]): The internal UUID of the item in DSpace
         withdrawn (Optional[str]): Item withdrawn status in DSpace ("true" or "false")
+
+    For items retrieved with :meth:`get` or :meth:`iter_collection`, the relations
+    `bitstreams`, `metadata`, `parentCollection`, `parentCollectionList` and
+    `parentCommunityList` that were not requested with `expand` are requested from
+    DSpace the first time they are accessed.
     """
 
+    __slots__ = (
+        "__dict__",
+        "_bitstreams",
+        "_client",
+        "_metadata",
+        "_parentCollection",
+        "_parentCollectionList",
+        "_parentCommunityList",
+        "_unloaded",
+        "archived",
+        "expand",
+        "handle",
+        "lastModified",
+        "link",
+        "name",
+        "type",
+        "uuid",
+        "withdrawn",
+    )
+
+    bitstreams = LazyRelation()
+    metadata = LazyRelation()
+    parentCollection = LazyRelation()
+    parentCollectionList = LazyRelation()
+    parentCommunityList = LazyRelation()
+
     def __init__(
         self,
         bitstreams: Optional[List[Bitstream]] = None,
         metadata: Optional[List[MetadataEntry]] = None,
     ):
+        self._client: Optional[DSpaceClient] = None
+        self._unloaded: Set[str] = set()
         self.bitstreams = bitstreams or []
         self.metadata = metadata or []
 
-        self.archived = None
-        self.expand = [
-            "metadata",
-            "parentCollection",
-            "parentCollectionList",
-            "parentCommunityList",
-            "bitstreams",
-            "all",
-        ]
-        self.handle = None
-        self.lastModified = None
-        self.link = None
-        self.name = None
+        self.archived: Optional[str] = None
+        self.expand: List[str] = list(ITEM_EXPAND)
+        self.handle: Optional[str] = None
+        self.lastModified: Optional[str] = None
+        self.link: Optional[str] = None
+        self.name: Optional[str] = None
         self.parentCollection = None
         self.parentCollectionList = None
         self.parentCommunityList = None
         self.type = "item"
-        self.uuid = None
-        self.withdrawn = None
+        self.uuid: Optional[str] = None
+        self.withdrawn: Optional[str] = None
 
     def delete(self, client: DSpaceClient) -> None:
         """Delete item from DSpace and unset relevant item attributes.
@@ -86,6 +133,9 @@ class Item:
         logger.debug("Deleting item with uuid %s from %s", self.uuid, client.base_url)
         response = client.delete(f"/items/{self.uuid}")
         logger.debug("Delete response: %s", response)
+        if self.handle:
+            client.handle_cache.invalidate(self.handle)
+        self._unloaded.clear()
         self.archived = None
         self.handle = None
         self.lastModified = None
@@ -97,6 +147,132 @@ class Item:
         self.uuid = None
         self.withdrawn = None
 
+    @classmethod
+    def from_dict(cls, item: Dict[str, Any]) -> Item:
+        """Class method to create an Item object from a DSpace REST item response.
+
+        Expanded metadata and bitstreams included in the response are converted to
+        :class:`MetadataEntry` and :class:`Bitstream` objects.
+
+        Args:
+            item: A dict representation of a DSpace Item object, as returned by the
+                DSpace REST API
+
+        Returns:
+            :class:`Item` object
+        """
+        new_item = cls(
+            bitstreams=[Bitstream.from_dict(b) for b in item.get("bitstreams") or []],
+            metadata=[MetadataEntry.from_dict(m) for m in item.get("metadata") or []],
+        )
+        new_item.archived = item.get("archived")
+        new_item.handle = item.get("handle")
+        new_item.lastModified = item.get("lastModified")
+        new_item.link = item.get("link")
+        new_item.name = item.get("name")
+        new_item.parentCollection = item.get("parentCollection")
+        new_item.parentCollectionList = item.get("parentCollectionList")
+        new_item.parentCommunityList = item.get("parentCommunityList")
+        new_item.uuid = item.get("uuid")
+        new_item.withdrawn = item.get("withdrawn")
+        return new_item
+
+    @classmethod
+    def get(
+        cls,
+        client: DSpaceClient,
+        item_handle: Optional[str] = None,
+        item_uuid: Optional[str] = None,
+        expand: Optional[Sequence[str]] = None,
+    ) -> Item:
+        """Class method to retrieve an item from DSpace with selected relations.
+
+        Requires either the `item_handle` or the `item_uuid`, but not both. If both are
+        passed, defaults to using the UUID. Only the relations named in `expand` are
+        included in the response; the others are requested the first time they are
+        accessed on the returned item, so reading only fields such as `handle` and
+        `lastModified` costs a single small request.
+
+        Args:
+            client: An authenticated instance of the :class:`DSpaceClient` class
+            item_handle: The handle of an existing item in DSpace
+            item_uuid: The UUID of an existing item in DSpace
+            expand: The relations to include in the response, any of "metadata",
+                "bitstreams", "parentCollection", "parentCollectionList",
+                "parentCommunityList" or "all", defaults to None (no relations)
+
+        Returns:
+            :class:`Item` object
+
+        Raises:
+            :class:`requests.HTTPError`: 404 Not Found if no item matching
+                provided UUID
+            MissingIdentifierError: if neither `item_handle` nor `item_uuid`
+                parameter is provided
+        """
+        params = {"expand": ",".join(expand)} if expand else None
+        if not item_uuid and item_handle and item_handle not in client.handle_cache:
+            # The handle endpoint returns the item itself, saving a second request
+            response = client.get(f"/handle/{item_handle}", params=params).json()
+            client.handle_cache.set(item_handle, response["uuid"])
+        else:
+            item_id = select_identifier(client, item_handle, item_uuid)
+            response = client.get(f"/items/{item_id}", params=params).json()
+        item = cls.from_dict(response)
+        item._defer_relations(client, expand)
+        return item
+
+    @classmethod
+    def iter_collection(
+        cls,
+        client: DSpaceClient,
+        collection_handle: Optional[str] = None,
+        collection_uuid: Optional[str] = None,
+        expand: Optional[List[str]] = None,
+        limit: int = 100,
+        prefetch: bool = True,
+        stream: bool = False,
+    ) -> Iterator[Item]:
+        """Lazily yield each item in a collection, one page of items at a time.
+
+        Requires either the `collection_handle` or the `collection_uuid`, but not both.
+        If both are passed, defaults to using the UUID. See :func:`dspace.utils.paginate`
+        for details of paging and prefetching.
+
+        Args:
+            client: An authenticated instance of the :class:`DSpaceClient` class
+            collection_handle: The handle of an existing collection in DSpace
+            collection_uuid: The UUID of an existing collection in DSpace
+            expand: The expand options to request for each item, e.g. ["metadata"]
+            limit: The number of items to request per page, defaults to 100
+            prefetch: Whether to request the next page while the current page is being
+                consumed, defaults to True
+            stream: Whether to decode each page incrementally as it is received,
+                holding only one item's JSON in memory at a time, defaults to False
+
+        Yields:
+            :class:`Item` object for each item in the collection
+
+        Raises:
+            :class:`requests.HTTPError`: 404 Not Found if no collection matching
+                provided handle/UUID
+            MissingIdentifierError: if neither `collection_handle` nor `collection_uuid`
+                parameter is provided
+        """
+        collection_id = select_identifier(client, collection_handle, collection_uuid)
+        params = {"expand": ",".join(expand)} if expand else None
+        for item in paginate(
+            client,
+            f"/collections/{collection_id}/items",
+            params=params,
+            limit=limit,
+            prefetch=prefetch,
+            stream=stream,
+        ):
+            new_item = cls.from_dict(item)
+            new_item._defer_relations(client, expand)
+            yield new_item
+
     def post(
         self,
         client: DSpaceClient,
@@ -142,6 +318,179 @@ class Item:
         self.uuid = response["uuid"]
         self.withdrawn = response["withdrawn"]
 
+    def update_metadata(
+        self,
+        client: DSpaceClient,
+        metadata: List[MetadataEntry],
+        current: Optional[List[MetadataEntry]] = None,
+        remove_missing: bool = False,
+    ) -> MetadataDiff:
+        """Update the item's metadata in DSpace, sending only what has changed.
+
+        The desired `metadata` is compared with the item's current metadata in DSpace
+        key by key (see :class:`MetadataDiff`). Entries for keys the item does not
+        have yet are added with a POST to "/items/{id}/metadata", and the values of
+        keys whose values differ are replaced with a PUT to the same endpoint. Keys
+        whose values are unchanged are not sent, and no request is sent at all if
+        nothing has changed.
+
+        Keys the item has but `metadata` does not mention are kept, unless
+        `remove_missing` is True. DSpace 6 cannot remove a single field, so if any
+        keys must be removed, the item's metadata is cleared with a DELETE and all of
+        `metadata` is posted. These are separate requests, so the replacement is not
+        atomic: if the POST fails, the item's previous metadata is posted back and
+        :class:`MetadataUpdateError` is raised, but the item has no metadata in the
+        meantime, and keeps none if restoring it fails too.
+
+        Args:
+            client: An authenticated instance of the :class:`DSpaceClient` class
+            metadata: The desired :class:`MetadataEntry` objects
+            current: The item's current metadata in DSpace, if already known, e.g.
+                from an item retrieved with `expand=["metadata"]`. Defaults to None,
+                requesting it from DSpace
+            remove_missing: Whether to remove keys not in `metadata`, defaults to False
+
+        Returns:
+            :class:`MetadataDiff` of the changes sent
+
+        Raises:
+            :class:`requests.HTTPError`: 404 Not Found if no item matching
+                the item's UUID
+            MissingIdentifierError: if `uuid` attribute is not set on Item instance
+            MetadataUpdateError: if posting the new metadata fails after the item's
+                metadata was cleared
+        """
+        if not self.uuid:
+            raise MissingIdentifierError(f"item.update_metadata({client})")
+        endpoint = f"/items/{self.uuid}/metadata"
+        if current is None:
+            current = [MetadataEntry.from_dict(m) for m in client.get(endpoint).json()]
+        diff = MetadataDiff(current, metadata, remove_missing=remove_missing)
+        logger.debug("Updating metadata of item %s: %s", self.uuid, diff)
+        if diff.removals:
+            client.delete(endpoint)
+            try:
+                client.post(endpoint, json=[m.to_dict() for m in metadata])
+            except Exception as e:
+                restored = self._restore_metadata(client, endpoint, current)
+                raise MetadataUpdateError(
+                    f"item.update_metadata({client})", self.uuid, restored
+                ) from e
+        else:
+            if diff.additions:
+                client.post(endpoint, json=[m.to_dict() for m in diff.additions])
+            if diff.replacements:
+                client.put(endpoint, json=[m.to_dict() for m in diff.replacements])
+        self.metadata = diff.result
+        return diff
+
+    def _defer_relations(
+        self, client: DSpaceClient, expand: Optional[Sequence[str]]
+    ) -> None:
+        expand = expand or []
+        self._client = client
+        if "all" not in expand:
+            self._unloaded = {r for r in ITEM_RELATIONS if r not in expand}
+
+    def _load_relation(self, name: str) -> Any:
+        client = self._client
+        if client is None:
+            raise AttributeError(f"Cannot load {name} of an item without a client")
+        if name == "metadata":
+            response = client.get(f"/items/{self.uuid}/metadata").json()
+            return [MetadataEntry.from_dict(m) for m in response]
+        if name == "bitstreams":
+            return [
+                Bitstream.from_dict(b)
+                for b in paginate(client, f"/items/{self.uuid}/bitstreams")
+            ]
+        response = client.get(f"/items/{self.uuid}", params={"expand": name}).json()
+        return response.get(name)
+
+    def _restore_metadata(
+        self, client: DSpaceClient, endpoint: str, metadata: List[MetadataEntry]
+    ) -> bool:
+        logger.warning("Restoring previous metadata of item %s", self.uuid)
+        try:
+            # The failed POST may have been partly applied, so clear it again first
+            client.delete(endpoint)
+            client.post(endpoint, json=[m.to_dict() for m in metadata])
+        except Exception:
+            logger.exception("Failed to restore metadata of item %s", self.uuid)
+            return False
+        return True
+
+
+class MetadataDiff:
+    """Class representing the changes needed to turn current metadata into desired.
+
+    Metadata is compared key by key, as DSpace 6 updates all the values of a key at
+    once. A key's values are unchanged if the current and desired entries for it
+    have the same values and languages in the same order.
+
+    Args:
+        current: The current :class:`MetadataEntry` objects
+        desired: The desired :class:`MetadataEntry` objects
+        remove_missing: Whether keys in `current` but not in `desired` should be
+            removed, defaults to False
+
+    Attributes:
+        additions (List[:obj:`MetadataEntry`]): Desired entries for keys that have no
+            current values
+        removals (List[str]): Keys with current values but no desired values. Always
+            empty unless `remove_missing` is True
+        replacements (List[:obj:`MetadataEntry`]): Desired entries for keys whose
+            values have changed
+        result (List[:obj:`MetadataEntry`]): The metadata after the changes are
+            applied
+    """
+
+    __slots__ = ("additions", "removals", "replacements", "result")
+
+    def __init__(
+        self,
+        current: List[MetadataEntry],
+        desired: List[MetadataEntry],
+        remove_missing: bool = False,
+    ):
+        current_values = _values_by_key(current)
+        desired_values = _values_by_key(desired)
+        self.additions = [m for m in desired if m.key not in current_values]
+        self.replacements = [
+            m
+            for m in desired
+            if m.key in current_values
+            and current_values[m.key] != desired_values[m.key]
+        ]
+        self.removals = (
+            [key for key in current_values if key not in desired_values]
+            if remove_missing
+            else []
+        )
+        self.result = (
+            list(desired)
+            if remove_missing
+            else [m for m in current if m.key not in desired_values] + list(desired)
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.additions or self.replacements or self.removals)
+
+    def __repr__(self):
+        return (
+            f"MetadataDiff(additions={len(self.additions)}, "
+            f"replacements={len(self.replacements)}, removals={self.removals})"
+        )
+
+
+def _values_by_key(
+    metadata: List[MetadataEntry],
+) -> Dict[str, List[Tuple[str, Optional[str]]]]:
+    values: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+    for m in metadata:
+        values.setdefault(m.key, []).append((m.value, m.language or None))
+    return values
+
 
 class MetadataEntry:
     """Class representing a `DSpace MetadataEntry object`_.
@@ -159,12 +508,35 @@ class MetadataEntry:
         key (str): Name of the metadata entry
         value (str): Value of the metadata entry
         language (Optional[str]): Language of the metadata entry
+
+    Keys and languages are drawn from a small vocabulary and repeated across every
+    item, so they are interned with :func:`sys.intern` to share one copy of each.
     """
 
+    __slots__ = ("key", "value", "language")
+
     def __init__(self, key: str, value: str, language: Optional[str] = None):
-        self.key = key
+        self.key = sys.intern(key)
         self.value = value
-        self.language = language
+        self.language = sys.intern(language) if language else language
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MetadataEntry):
+            return NotImplemented
+        return (self.key, self.value, self.language) == (
+            other.key,
+            other.value,
+            other.language,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.key, self.value, self.language))
+
+    def __repr__(self):
+        return (
+            f"MetadataEntry(key='{self.key}', value='{self.value}', "
+            f"language={self.language!r})"
+        )
 
     def to_dict(self) -> dict:
         """Method to convert the MetadataEntry object to a dict.
@@ -172,7 +544,14 @@ class MetadataEntry:
         Returns:
             Dict representation of the metadata entry
         """
-        return {key: value for key, value in self.__dict__.items() if value}
+        entry = {}
+        if self.key:
+            entry["key"] = self.key
+        if self.value:
+            entry["value"] = self.value
+        if self.language:
+            entry["language"] = self.language
+        return entry
 
     @classmethod
     def from_dict(cls, entry: Dict[str, str]) -> MetadataEntry:
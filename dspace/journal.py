@@ -0,0 +1,181 @@
+# dspace/journal.py
+"""DSpace journal module.
+
+This module includes an IngestJournal class for recording the progress of a batch
+ingest in a local SQLite database, so an interrupted batch can be resumed without
+re-posting completed work.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from dspace.item import Item
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+ITEM_POSTED = "item_posted"
+DONE = "done"
+
+
+def item_key(item: Item) -> str:
+    """Return a stable key identifying an item within a batch.
+
+    The key is a SHA-256 digest of the item's metadata and the names and file paths
+    of its bitstreams, so the same item built from the same source data gets the same
+    key each time a batch is run.
+
+    Args:
+        item: The :class:`Item` to identify
+
+    Returns:
+        Hex digest identifying the item
+    """
+    content = {
+        "metadata": [[m.key, m.value, m.language] for m in item.metadata],
+        "bitstreams": [[b.name, b.file_path] for b in item.bitstreams],
+    }
+    return hashlib.sha256(json.dumps(content).encode()).hexdigest()
+
+
+class IngestJournal:
+    """A local SQLite journal of the state of each item and bitstream in an ingest.
+
+    Each item passes through the states "pending", "item_posted" (with the UUID
+    DSpace assigned to it) and "done". The UUID of each of the item's bitstreams is
+    recorded as it is posted. Every state change is committed immediately, so the
+    journal reflects all work completed before a crash. The journal is safe to share
+    between threads.
+
+    Args:
+        path: Local file path of the SQLite database. Created if it does not exist
+
+    Attributes:
+        path (str): Local file path of the SQLite database
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                "key TEXT PRIMARY KEY, state TEXT NOT NULL, uuid TEXT, "
+                "updated REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS bitstreams ("
+                "item_key TEXT NOT NULL, position INTEGER NOT NULL, uuid TEXT NOT NULL, "
+                "PRIMARY KEY (item_key, position))"
+            )
+
+    def __enter__(self) -> IngestJournal:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __repr__(self):
+        return f"IngestJournal(path='{self.path}')"
+
+    def close(self) -> None:
+        """Close the journal's database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of items recorded in each state."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT state, COUNT(*) FROM items GROUP BY state"
+            ).fetchall()
+        return dict(rows)
+
+    def get(self, key: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return the recorded state and UUID of an item.
+
+        Args:
+            key: Key identifying the item, see :func:`item_key`
+
+        Returns:
+            Tuple of the item's state and UUID, or (None, None) if not recorded
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT state, uuid FROM items WHERE key = ?", (key,)
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def posted_bitstreams(self, key: str) -> Dict[int, str]:
+        """Return the UUIDs of an item's posted bitstreams by position in its list.
+
+        Args:
+            key: Key identifying the item, see :func:`item_key`
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT position, uuid FROM bitstreams WHERE item_key = ?", (key,)
+            ).fetchall()
+        return dict(rows)
+
+    def record_bitstream_posted(self, key: str, position: int, uuid: str) -> None:
+        """Record that a bitstream of an item was posted.
+
+        Args:
+            key: Key identifying the item, see :func:`item_key`
+            position: Position of the bitstream in the item's `bitstreams` list
+            uuid: UUID of the posted bitstream
+        """
+        self._write(
+            "INSERT OR REPLACE INTO bitstreams (item_key, position, uuid) "
+            "VALUES (?, ?, ?)",
+            (key, position, uuid),
+        )
+
+    def record_done(self, key: str) -> None:
+        """Record that an item and all of its bitstreams were posted.
+
+        Args:
+            key: Key identifying the item, see :func:`item_key`
+        """
+        self._write(
+            "UPDATE items SET state = ?, updated = ? WHERE key = ?",
+            (DONE, time.time(), key),
+        )
+
+    def record_item_posted(self, key: str, uuid: str) -> None:
+        """Record that an item was posted and the UUID DSpace assigned to it.
+
+        Args:
+            key: Key identifying the item, see :func:`item_key`
+            uuid: UUID of the posted item
+        """
+        self._write(
+            "INSERT OR REPLACE INTO items (key, state, uuid, updated) "
+            "VALUES (?, ?, ?, ?)",
+            (key, ITEM_POSTED, uuid, time.time()),
+        )
+
+    def record_pending(self, key: str) -> None:
+        """Record that an item is about to be posted, if not already recorded.
+
+        Args:
+            key: Key identifying the item, see :func:`item_key`
+        """
+        self._write(
+            "INSERT OR IGNORE INTO items (key, state, uuid, updated) "
+            "VALUES (?, ?, NULL, ?)",
+            (key, PENDING, time.time()),
+        )
+
+    def _write(self, statement: str, parameters: tuple) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(statement, parameters)
@@ -0,0 +1,333 @@
+# dspace/metrics.py
+"""DSpace metrics module.
+
+This module includes a ClientMetrics class for recording counts, latencies and sizes
+of the requests a :class:`DSpaceClient` sends to the DSpace REST API.
+"""
+from __future__ import annotations
+
+import bisect
+import logging
+import re
+import threading
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from dspace.cache import HandleCache
+    from dspace.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+UUID_PATTERN = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE
+)
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Return an endpoint with object identifiers replaced by placeholders.
+
+    Args:
+        endpoint: A DSpace REST endpoint, e.g.
+            "/items/7c8e7bbc-e36b-4194-87e5-5347e3a69a57/bitstreams"
+
+    Returns:
+        The endpoint template, e.g. "/items/{id}/bitstreams"
+    """
+    if endpoint.startswith("/handle/"):
+        return "/handle/{handle}"
+    return UUID_PATTERN.sub("{id}", endpoint)
+
+
+class Histogram:
+    """A cumulative histogram of observed values with fixed bucket upper bounds.
+
+    Args:
+        buckets: Sorted upper bounds of the histogram buckets
+
+    Attributes:
+        buckets (Sequence[float]): Sorted upper bounds of the histogram buckets
+        count (int): The number of observed values
+        counts (List[int]): The number of observed values in each bucket, with a final
+            bucket for values above the highest bound
+        sum (float): The sum of observed values
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a value in the histogram."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Return cumulative counts keyed by bucket upper bound, ending with "+Inf"."""
+        bounds = [_format_number(b) for b in self.buckets] + ["+Inf"]
+        total = 0
+        cumulative = []
+        for bound, count in zip(bounds, self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return cumulative
+
+
+class ClientMetrics:
+    """Thread-safe metrics for the requests sent by a :class:`DSpaceClient`.
+
+    Requests are grouped by HTTP method and endpoint template (see
+    :func:`endpoint_template`), so "/items/{id}/bitstreams" is counted once for all
+    items rather than once per UUID.
+
+    Args:
+        handle_cache: The client's :class:`HandleCache`, whose hit and miss counters
+            are included in the metrics
+        response_cache: The client's :class:`ResponseCache`, whose hit, miss and
+            revalidation counters are included in the metrics
+        buckets: Upper bounds in seconds of the latency histogram buckets, defaults to
+            :data:`LATENCY_BUCKETS`
+
+    Attributes:
+        handle_cache (Optional[:obj:`HandleCache`]): The client's handle cache
+        response_cache (Optional[:obj:`ResponseCache`]): The client's response cache
+    """
+
+    def __init__(
+        self,
+        handle_cache: Optional[HandleCache] = None,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        response_cache: Optional[ResponseCache] = None,
+    ):
+        self.handle_cache = handle_cache
+        self.response_cache = response_cache
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __repr__(self):
+        return f"ClientMetrics(requests={sum(self._requests.values())})"
+
+    def record_request(
+        self,
+        method: str,
+        endpoint: str,
+        status: Optional[int],
+        latency: float,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+    ) -> None:
+        """Record a request sent to the DSpace API.
+
+        Args:
+            method: The HTTP method
+            endpoint: The DSpace REST endpoint requested
+            status: The response status code, or None if no response was received
+            latency: The number of seconds until the response was received
+            bytes_sent: The size of the request body
+            bytes_received: The size of the response body
+        """
+        template = endpoint_template(endpoint)
+        key = (method, template)
+        with self._lock:
+            self._requests[(method, template, str(status) if status else "error")] += 1
+            if key not in self._latency:
+                self._latency[key] = Histogram(self._buckets)
+            self._latency[key].observe(latency)
+            self._bytes_sent[key] += bytes_sent
+            self._bytes_received[key] += bytes_received
+
+    def record_coalesced(self, method: str, endpoint: str) -> None:
+        """Record a request answered by sharing an identical in-flight request.
+
+        Args:
+            method: The HTTP method
+            endpoint: The DSpace REST endpoint requested
+        """
+        with self._lock:
+            self._coalesced[(method, endpoint_template(endpoint))] += 1
+
+    def record_retry(self, method: str, endpoint: str) -> None:
+        """Record a retry of a request to the DSpace API.
+
+        Args:
+            method: The HTTP method
+            endpoint: The DSpace REST endpoint requested
+        """
+        with self._lock:
+            self._retries[(method, endpoint_template(endpoint))] += 1
+
+    def reset(self) -> None:
+        """Reset all request metrics to zero."""
+        with self._lock:
+            self._requests: Dict[Tuple[str, str, str], int] = defaultdict(int)
+            self._latency: Dict[Tuple[str, str], Histogram] = {}
+            self._bytes_sent: Dict[Tuple[str, str], int] = defaultdict(int)
+            self._bytes_received: Dict[Tuple[str, str], int] = defaultdict(int)
+            self._retries: Dict[Tuple[str, str], int] = defaultdict(int)
+            self._coalesced: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def snapshot(self) -> dict:
+        """Return a point-in-time copy of the metrics as plain Python objects.
+
+        Returns:
+            Dict structured as follows::
+
+                {
+                    "requests": [
+                        {
+                            "method": "GET",
+                            "endpoint": "/items/{id}",
+                            "status": "200",
+                            "count": 3,
+                        }
+                    ],
+                    "endpoints": [
+                        {
+                            "method": "GET",
+                            "endpoint": "/items/{id}",
+                            "latency_count": 3,
+                            "latency_sum": 0.12,
+                            "latency_buckets": {"0.005": 0, ..., "+Inf": 3},
+                            "bytes_sent": 0,
+                            "bytes_received": 4096,
+                            "retries": 0,
+                            "coalesced": 0,
+                        }
+                    ],
+                    "handle_cache": {"hits": 10, "misses": 1},
+                    "response_cache": {"hits": 5, "misses": 2, "revalidations": 1},
+                }
+
+            The "response_cache" key is only present if the client has a response
+            cache.
+        """
+        with self._lock:
+            requests = [
+                {"method": m, "endpoint": e, "status": s, "count": count}
+                for (m, e, s), count in sorted(self._requests.items())
+            ]
+            endpoints = [
+                {
+                    "method": m,
+                    "endpoint": e,
+                    "latency_count": histogram.count,
+                    "latency_sum": histogram.sum,
+                    "latency_buckets": dict(histogram.cumulative()),
+                    "bytes_sent": self._bytes_sent[(m, e)],
+                    "bytes_received": self._bytes_received[(m, e)],
+                    "retries": self._retries.get((m, e), 0),
+                    "coalesced": self._coalesced.get((m, e), 0),
+                }
+                for (m, e), histogram in sorted(self._latency.items())
+            ]
+        snapshot: dict = {"requests": requests, "endpoints": endpoints}
+        if self.handle_cache is not None:
+            snapshot["handle_cache"] = {
+                "hits": self.handle_cache.hits,
+                "misses": self.handle_cache.misses,
+            }
+        if self.response_cache is not None:
+            snapshot["response_cache"] = {
+                "hits": self.response_cache.hits,
+                "misses": self.response_cache.misses,
+                "revalidations": self.response_cache.revalidations,
+            }
+        return snapshot
+
+    def to_prometheus(self, prefix: str = "dspace_client") -> str:
+        """Return the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Prefix for the metric names, defaults to "dspace_client"
+        """
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_requests_total Requests sent to the DSpace API.",
+            f"# TYPE {prefix}_requests_total counter",
+        ]
+        for r in snapshot["requests"]:
+            labels = _labels(
+                method=r["method"], endpoint=r["endpoint"], status=r["status"]
+            )
+            lines.append(f"{prefix}_requests_total{{{labels}}} {r['count']}")
+        lines += [
+            f"# HELP {prefix}_request_duration_seconds Time until the DSpace API "
+            "responded.",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        for e in snapshot["endpoints"]:
+            labels = _labels(method=e["method"], endpoint=e["endpoint"])
+            for bound, count in e["latency_buckets"].items():
+                lines.append(
+                    f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bound}"}}'
+                    f" {count}"
+                )
+            lines.append(
+                f"{prefix}_request_duration_seconds_sum{{{labels}}} "
+                f"{_format_number(e['latency_sum'])}"
+            )
+            lines.append(
+                f"{prefix}_request_duration_seconds_count{{{labels}}} "
+                f"{e['latency_count']}"
+            )
+        for name, key, description in (
+            ("request_bytes_sent_total", "bytes_sent", "Request body bytes sent."),
+            (
+                "response_bytes_received_total",
+                "bytes_received",
+                "Response body bytes received.",
+            ),
+            ("retries_total", "retries", "Requests retried."),
+            (
+                "coalesced_total",
+                "coalesced",
+                "Requests answered by an identical in-flight request.",
+            ),
+        ):
+            lines += [
+                f"# HELP {prefix}_{name} {description}",
+                f"# TYPE {prefix}_{name} counter",
+            ]
+            for e in snapshot["endpoints"]:
+                labels = _labels(method=e["method"], endpoint=e["endpoint"])
+                lines.append(f"{prefix}_{name}{{{labels}}} {e[key]}")
+        if "handle_cache" in snapshot:
+            for result in ("hits", "misses"):
+                lines += [
+                    f"# HELP {prefix}_handle_cache_{result}_total Handle cache "
+                    f"{result}.",
+                    f"# TYPE {prefix}_handle_cache_{result}_total counter",
+                    f"{prefix}_handle_cache_{result}_total "
+                    f"{snapshot['handle_cache'][result]}",
+                ]
+        if "response_cache" in snapshot:
+            for result in ("hits", "misses", "revalidations"):
+                lines += [
+                    f"# HELP {prefix}_response_cache_{result}_total Response cache "
+                    f"{result}.",
+                    f"# TYPE {prefix}_response_cache_{result}_total counter",
+                    f"{prefix}_response_cache_{result}_total "
+                    f"{snapshot['response_cache'][result]}",
+                ]
+        return "\n".join(lines) + "\n"
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value))
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(
+        f'{name}="{_escape_label_value(str(value))}"' for name, value in labels.items()
+    )
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape a label value for the Prometheus text exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
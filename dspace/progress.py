@@ -0,0 +1,211 @@
+# dspace/progress.py
+"""DSpace progress module.
+
+This module includes a ProgressMeter class for reporting the progress and throughput of
+bitstream uploads and downloads, and for aborting transfers that stall.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable, Optional
+
+from dspace.errors import TransferStalledError
+
+logger = logging.getLogger(__name__)
+
+
+class TransferProgress:
+    """A snapshot of the progress of a transfer, passed to progress callbacks.
+
+    Args:
+        bytes_transferred: The number of bytes transferred so far
+        total_bytes: The size of the transfer in bytes, or None if unknown
+        elapsed: The number of seconds since the transfer started
+        rate: The throughput in bytes per second since the previous report
+        average_rate: The throughput in bytes per second since the transfer started
+        done: Whether the transfer has completed
+
+    Attributes:
+        average_rate (float): The throughput in bytes per second since the transfer
+            started
+        bytes_transferred (int): The number of bytes transferred so far
+        done (bool): Whether the transfer has completed
+        elapsed (float): The number of seconds since the transfer started
+        rate (float): The throughput in bytes per second since the previous report
+        total_bytes (Optional[int]): The size of the transfer in bytes, or None if
+            unknown
+    """
+
+    __slots__ = (
+        "average_rate",
+        "bytes_transferred",
+        "done",
+        "elapsed",
+        "rate",
+        "total_bytes",
+    )
+
+    def __init__(
+        self,
+        bytes_transferred: int,
+        total_bytes: Optional[int],
+        elapsed: float,
+        rate: float,
+        average_rate: float,
+        done: bool = False,
+    ):
+        self.bytes_transferred = bytes_transferred
+        self.total_bytes = total_bytes
+        self.elapsed = elapsed
+        self.rate = rate
+        self.average_rate = average_rate
+        self.done = done
+
+    def __repr__(self):
+        return (
+            f"TransferProgress(bytes_transferred={self.bytes_transferred}, "
+            f"total_bytes={self.total_bytes}, rate={self.rate:.0f}, eta={self.eta})"
+        )
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds until the transfer completes, at the average rate.
+
+        None if the size of the transfer is unknown or nothing has been transferred.
+        """
+        if self.done:
+            return 0.0
+        if not self.total_bytes or not self.average_rate:
+            return None
+        remaining = max(self.total_bytes - self.bytes_transferred, 0)
+        return remaining / self.average_rate
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """The fraction of the transfer completed, or None if its size is unknown."""
+        if not self.total_bytes:
+            return None
+        return min(self.bytes_transferred / self.total_bytes, 1.0)
+
+
+class ProgressMeter:
+    """Meters the bytes of a bitstream transfer and reports its progress.
+
+    Pass an instance as the `progress` argument of :meth:`Bitstream.post` or
+    :meth:`Bitstream.download`. Each chunk transferred costs a counter increment and a
+    clock read; a :class:`TransferProgress` is built and passed to `callback` at most
+    once per `interval` seconds, and once more when the transfer completes.
+
+    If `min_rate` is set, the throughput of each reporting interval is compared with
+    it, and once it has stayed below `min_rate` for `stall_timeout` seconds the
+    transfer is aborted by raising :class:`TransferStalledError`. A transfer that
+    stops sending or receiving altogether is aborted by the client's `timeout`
+    instead.
+
+    A meter measures one transfer at a time; it is reset when the next one starts.
+
+    Args:
+        callback: Called with a :class:`TransferProgress` for each report, defaults to
+            None (progress is only logged at debug level). An exception raised by the
+            callback aborts the transfer
+        interval: The minimum number of seconds between reports, defaults to 0.5
+        min_rate: The lowest acceptable throughput in bytes per second, defaults to
+            None (transfers are never aborted)
+        stall_timeout: The number of seconds throughput may stay below `min_rate`
+            before the transfer is aborted, defaults to 30.0
+
+    Attributes:
+        bytes_transferred (int): The number of bytes transferred in the current
+            transfer
+        total_bytes (Optional[int]): The size of the current transfer in bytes, or
+            None if unknown
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[TransferProgress], None]] = None,
+        interval: float = 0.5,
+        min_rate: Optional[float] = None,
+        stall_timeout: float = 30.0,
+    ):
+        self.callback = callback
+        self.interval = interval
+        self.min_rate = min_rate
+        self.stall_timeout = stall_timeout
+        self.start()
+
+    def __repr__(self):
+        return (
+            f"ProgressMeter(interval={self.interval}, min_rate={self.min_rate}, "
+            f"stall_timeout={self.stall_timeout})"
+        )
+
+    def finish(self) -> TransferProgress:
+        """Report the completed transfer and return its final progress."""
+        return self._report(time.monotonic(), done=True)
+
+    def start(self, total_bytes: Optional[int] = None, expression: str = "") -> None:
+        """Reset the meter for a new transfer.
+
+        Args:
+            total_bytes: The size of the transfer in bytes, defaults to None (unknown)
+            expression: The operation performing the transfer, included in a
+                :class:`TransferStalledError`, defaults to ""
+        """
+        now = time.monotonic()
+        self.bytes_transferred = 0
+        self.total_bytes = total_bytes
+        self.expression = expression
+        self._started = now
+        self._reported = now
+        self._reported_bytes = 0
+        self._next_report = now + self.interval
+        self._slow_since: Optional[float] = None
+
+    def update(self, n: int) -> None:
+        """Count `n` more bytes transferred, reporting progress if it is due.
+
+        Raises:
+            TransferStalledError: if the throughput has stayed below `min_rate` for
+                `stall_timeout` seconds
+        """
+        self.bytes_transferred += n
+        now = time.monotonic()
+        if now >= self._next_report:
+            self._report(now)
+
+    def _report(self, now: float, done: bool = False) -> TransferProgress:
+        window = now - self._reported
+        rate = (
+            (self.bytes_transferred - self._reported_bytes) / window if window else 0.0
+        )
+        elapsed = now - self._started
+        progress = TransferProgress(
+            self.bytes_transferred,
+            self.total_bytes,
+            elapsed,
+            rate,
+            self.bytes_transferred / elapsed if elapsed else 0.0,
+            done=done,
+        )
+        logger.debug("Transfer progress: %s", progress)
+        if self.callback is not None:
+            self.callback(progress)
+        if not done and self.min_rate is not None:
+            self._check_stall(now, rate, self.min_rate)
+        self._reported = now
+        self._reported_bytes = self.bytes_transferred
+        self._next_report = now + self.interval
+        return progress
+
+    def _check_stall(self, now: float, rate: float, min_rate: float) -> None:
+        if rate >= min_rate:
+            self._slow_since = None
+            return
+        if self._slow_since is None:
+            self._slow_since = self._reported
+        if now - self._slow_since >= self.stall_timeout:
+            raise TransferStalledError(
+                self.expression, rate, min_rate, now - self._slow_since
+            )
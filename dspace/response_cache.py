@@ -0,0 +1,567 @@
+# dspace/response_cache.py
+"""DSpace response cache module.
+
+This module includes a ResponseCache class for caching the responses to GET requests
+sent by a :class:`DSpaceClient`, with in-memory and on-disk storage backends.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from dspace.metrics import UUID_PATTERN
+
+logger = logging.getLogger(__name__)
+
+# Response headers that no longer describe a cached body, whose content has already
+# been decoded, or that must not be replayed
+UNCACHED_HEADERS = frozenset(
+    ("content-encoding", "content-length", "set-cookie", "transfer-encoding")
+)
+
+# Endpoints whose responses depend on the session rather than on DSpace objects
+UNCACHED_ENDPOINTS = frozenset(("/status",))
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class CacheEntry:
+    """A cached response to a GET request.
+
+    Args:
+        status: The response status code
+        headers: The response headers
+        content: The response body
+        stored: The time the response was received or last revalidated, in seconds
+            since the epoch
+        tags: UUIDs of the DSpace objects the response describes, used to invalidate
+            the entry when one of them is changed
+
+    Attributes:
+        content (bytes): The response body
+        headers (MutableMapping[str, str]): The response headers
+        status (int): The response status code
+        stored (float): The time the response was received or last revalidated
+        tags (Tuple[str, ...]): UUIDs of the DSpace objects the response describes
+    """
+
+    __slots__ = ("status", "headers", "content", "stored", "tags")
+
+    def __init__(
+        self,
+        status: int,
+        headers: MutableMapping[str, str],
+        content: bytes,
+        stored: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ):
+        self.status = status
+        self.headers: MutableMapping[str, str] = CaseInsensitiveDict(headers)
+        self.content = content
+        self.stored = time.time() if stored is None else stored
+        self.tags = tuple(tags)
+
+    def __repr__(self):
+        return (
+            f"CacheEntry(status={self.status}, size={self.size}, "
+            f"stored={self.stored}, tags={self.tags})"
+        )
+
+    @property
+    def size(self) -> int:
+        """The size of the cached body in bytes."""
+        return len(self.content)
+
+    def is_fresh(self, ttl: float, now: Optional[float] = None) -> bool:
+        """Return whether the entry can be used without revalidating it.
+
+        An entry is fresh for the `max-age` of its Cache-Control header if it has
+        one, or otherwise for `ttl` seconds after it was stored.
+
+        Args:
+            ttl: Default number of seconds an entry stays fresh
+            now: The current time in seconds since the epoch, defaults to now
+        """
+        match = _MAX_AGE.search(self.headers.get("Cache-Control", ""))
+        max_age = float(match.group(1)) if match else ttl
+        return (time.time() if now is None else now) - self.stored < max_age
+
+    def validators(self) -> Dict[str, str]:
+        """Return the conditional request headers to revalidate the entry with."""
+        headers = {}
+        if "ETag" in self.headers:
+            headers["If-None-Match"] = self.headers["ETag"]
+        if "Last-Modified" in self.headers:
+            headers["If-Modified-Since"] = self.headers["Last-Modified"]
+        return headers
+
+    def to_bytes(self) -> bytes:
+        """Return the entry serialized as a JSON header line followed by the body."""
+        header = {
+            "status": self.status,
+            "headers": dict(self.headers),
+            "stored": self.stored,
+            "tags": self.tags,
+        }
+        return json.dumps(header).encode() + b"\n" + self.content
+
+    def to_response(self, url: str) -> requests.Response:
+        """Return a :class:`requests.Response` built from the entry.
+
+        Args:
+            url: The URL of the cached request
+        """
+        response = requests.Response()
+        response.status_code = self.status
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.url = url
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> CacheEntry:
+        """Class method to create a CacheEntry from the output of :meth:`to_bytes`."""
+        header, _, content = data.partition(b"\n")
+        fields = json.loads(header)
+        return cls(
+            fields["status"],
+            fields["headers"],
+            content,
+            stored=fields["stored"],
+            tags=fields["tags"],
+        )
+
+    @classmethod
+    def from_response(
+        cls, response: requests.Response, tags: Iterable[str] = ()
+    ) -> CacheEntry:
+        """Class method to create a CacheEntry from a received response.
+
+        Args:
+            response: The response to cache
+            tags: UUIDs of the DSpace objects the response describes
+        """
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in UNCACHED_HEADERS
+        }
+        return cls(response.status_code, headers, response.content, tags=tags)
+
+
+class MemoryCacheBackend:
+    """A thread-safe in-memory LRU store of cache entries limited by total size.
+
+    Args:
+        max_bytes: The maximum total size of cached bodies, defaults to 64 MiB. The
+            least recently used entries are evicted to stay within it
+
+    Attributes:
+        max_bytes (int): The maximum total size of cached bodies
+        on_evict (Optional[Callable[[str], None]]): Called with the key of each entry
+            evicted or not stored to stay within `max_bytes`
+        size (int): The current total size of cached bodies
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.on_evict: Optional[Callable[[str], None]] = None
+        self.size = 0
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __repr__(self):
+        return f"MemoryCacheBackend(max_bytes={self.max_bytes})"
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry.size
+
+    def entry_id(self, key: str) -> str:
+        """Return the identifier of a key's entry, as passed to `on_evict`."""
+        return key
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for a key, or None if not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry, evicting the least recently used entries if needed."""
+        if entry.size > self.max_bytes:
+            self.delete(key)
+            _notify(self.on_evict, [key])
+            return
+        evicted_keys = []
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous.size
+            self._entries[key] = entry
+            self.size += entry.size
+            while self.size > self.max_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+                evicted_keys.append(evicted_key)
+        _notify(self.on_evict, evicted_keys)
+
+    def tags(self) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+        """Yield the key and tags of each entry."""
+        with self._lock:
+            entries = list(self._entries.items())
+        for key, entry in entries:
+            yield key, entry.tags
+
+
+class DiskCacheBackend:
+    """A thread-safe on-disk LRU store of cache entries limited by total size.
+
+    Each entry is stored in its own file in `directory`, written atomically, so the
+    cache survives restarts and can be shared by successive runs of a script. Recency
+    is tracked with file modification times.
+
+    Args:
+        directory: Local directory to store entries in, created if needed
+        max_bytes: The maximum total size of the entry files, defaults to 512 MiB.
+            The least recently used entries are evicted to stay within it
+
+    Attributes:
+        directory (str): Local directory entries are stored in
+        max_bytes (int): The maximum total size of the entry files
+        on_evict (Optional[Callable[[str], None]]): Called with the file name of each
+            entry evicted or not stored to stay within `max_bytes`
+        size (int): The current total size of the entry files
+    """
+
+    suffix = ".entry"
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.on_evict: Optional[Callable[[str], None]] = None
+        self.size = 0
+        self._files: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        files = []
+        for name in os.listdir(directory):
+            if name.endswith(self.suffix):
+                stat = os.stat(os.path.join(directory, name))
+                files.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._files[name] = size
+            self.size += size
+        logger.debug("Found %d cached responses in %s", len(self._files), directory)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._files)
+
+    def __repr__(self):
+        return (
+            f"DiskCacheBackend(directory={self.directory!r}, "
+            f"max_bytes={self.max_bytes})"
+        )
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            for name in list(self._files):
+                self._remove(name)
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            self._remove(self._name(key))
+
+    def entry_id(self, key: str) -> str:
+        """Return the file name of a key's entry, as passed to `on_evict`."""
+        return self._name(key)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for a key, or None if not cached."""
+        name = self._name(key)
+        with self._lock:
+            if name not in self._files:
+                return None
+            self._files.move_to_end(name)
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, "rb") as f:
+                entry = CacheEntry.from_bytes(f.read())
+            os.utime(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug("Discarding unreadable cached response %s: %s", path, e)
+            self.delete(key)
+            return None
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry, evicting the least recently used entries if needed."""
+        data = entry.to_bytes()
+        name = self._name(key)
+        if len(data) > self.max_bytes:
+            self.delete(key)
+            _notify(self.on_evict, [name])
+            return
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=self.directory, delete=False, suffix=".tmp"
+        ) as f:
+            f.write(data)
+        os.replace(f.name, os.path.join(self.directory, name))
+        evicted_names = []
+        with self._lock:
+            self.size += len(data) - self._files.pop(name, 0)
+            self._files[name] = len(data)
+            while self.size > self.max_bytes:
+                evicted_names.append(next(iter(self._files)))
+                self._remove(evicted_names[-1])
+        _notify(self.on_evict, evicted_names)
+
+    def tags(self) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+        """Yield the file name and tags of each entry.
+
+        Entries are keyed by file name here because keys are stored only as hashes.
+        """
+        with self._lock:
+            names = list(self._files)
+        for name in names:
+            try:
+                with open(os.path.join(self.directory, name), "rb") as f:
+                    yield name, tuple(json.loads(f.readline())["tags"])
+            except (OSError, ValueError, KeyError):
+                continue
+
+    def _name(self, key: str) -> str:
+        if key.endswith(self.suffix):
+            # Already a file name, as yielded by tags()
+            return key
+        return hashlib.sha256(key.encode()).hexdigest() + self.suffix
+
+    def _remove(self, name: str) -> None:
+        size = self._files.pop(name, None)
+        if size is None:
+            return
+        self.size -= size
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
+
+
+class ResponseCache:
+    """A cache of the responses to GET requests sent by a :class:`DSpaceClient`.
+
+    A cached response is served without contacting DSpace while it is fresh: for the
+    `max-age` of its Cache-Control header if DSpace sends one, or else for `ttl`
+    seconds. Once stale, it is revalidated with a conditional request if DSpace sent
+    an ETag or Last-Modified header with it, so an unchanged object costs a bodiless
+    304 response; otherwise it is requested again.
+
+    Each entry is tagged with the UUIDs of the DSpace objects it describes: those in
+    its endpoint, and for handle lookups, the UUID of the object returned. A POST, PUT
+    or DELETE request sent by the client invalidates all entries tagged with a UUID in
+    its endpoint, e.g. posting a bitstream to an item invalidates the cached item,
+    its bitstream listing and its handle lookup. Listings of other objects that
+    include a changed object, e.g. a collection's item listing after one of its items
+    is deleted, are not invalidated and may be served stale until they expire.
+
+    Only successful responses to GET requests without extra headers or streaming are
+    cached, and the authentication status is never cached. The cache is keyed by URL,
+    accept header and the email address the client logged in with, so responses
+    received before logging in or as another user are not served after logging in.
+
+    Args:
+        backend: The storage backend, defaults to a new :class:`MemoryCacheBackend`.
+            Pass a :class:`DiskCacheBackend` to persist the cache between runs
+        ttl: The number of seconds a response stays fresh if DSpace does not specify
+            a max-age, defaults to 300.0
+
+    Attributes:
+        backend: The storage backend
+        hits (int): Number of requests answered from the cache without contacting
+            DSpace
+        misses (int): Number of requests for which no fresh response was cached
+        revalidations (int): Number of stale responses DSpace confirmed unchanged
+        ttl (float): The number of seconds a response stays fresh by default
+    """
+
+    def __init__(
+        self,
+        backend: Optional[Union[MemoryCacheBackend, DiskCacheBackend]] = None,
+        ttl: float = 300.0,
+    ):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()
+        self._tagged: Dict[str, Set[str]] = {}
+        self._entry_tags: Dict[str, Tuple[str, ...]] = {}
+        self.backend.on_evict = self._evicted
+        for entry_id, tags in self.backend.tags():
+            self._tag(entry_id, tags)
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    def __repr__(self):
+        return f"ResponseCache(backend={self.backend!r}, ttl={self.ttl})"
+
+    def clear(self) -> None:
+        """Remove all entries from the cache and reset the counters."""
+        self.backend.clear()
+        with self._lock:
+            self._tagged.clear()
+            self._entry_tags.clear()
+            self.hits = self.misses = self.revalidations = 0
+
+    def invalidate(self, endpoint: str) -> int:
+        """Remove all entries describing a DSpace object referenced by an endpoint.
+
+        Args:
+            endpoint: The DSpace REST endpoint of a write request, e.g.
+                "/items/7c8e7bbc-e36b-4194-87e5-5347e3a69a57/bitstreams"
+
+        Returns:
+            The number of entries removed
+        """
+        keys: Set[str] = set()
+        with self._lock:
+            for uuid in UUID_PATTERN.findall(endpoint):
+                keys |= self._tagged.get(uuid.lower(), set())
+            for entry_id in keys:
+                self._untag(entry_id)
+        for key in keys:
+            self.backend.delete(key)
+        if keys:
+            logger.debug("Invalidated %d cached responses for %s", len(keys), endpoint)
+        return len(keys)
+
+    def lookup(self, key: str) -> Tuple[Optional[CacheEntry], bool]:
+        """Return the cached entry for a key and whether it is fresh.
+
+        Args:
+            key: The cache key of a request, see :meth:`DSpaceClient.get`
+
+        Returns:
+            Tuple of the entry, or None if not cached, and whether it is fresh
+        """
+        entry = self.backend.get(key)
+        fresh = entry is not None and entry.is_fresh(self.ttl)
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry, fresh
+
+    def revalidated(
+        self, key: str, entry: CacheEntry, headers: CaseInsensitiveDict
+    ) -> None:
+        """Mark an entry fresh again after DSpace responded 304 Not Modified.
+
+        Args:
+            key: The cache key of the request
+            entry: The revalidated entry
+            headers: The headers of the 304 response, which update the entry's
+        """
+        entry.headers.update(
+            {
+                name: value
+                for name, value in headers.items()
+                if name.lower() not in UNCACHED_HEADERS
+            }
+        )
+        entry.stored = time.time()
+        self.backend.set(key, entry)
+        with self._lock:
+            self.revalidations += 1
+
+    def store(self, key: str, endpoint: str, response: requests.Response) -> None:
+        """Cache a response to a GET request if it is cacheable.
+
+        Args:
+            key: The cache key of the request
+            endpoint: The DSpace REST endpoint requested
+            response: The response received
+        """
+        if response.status_code != 200 or "no-store" in response.headers.get(
+            "Cache-Control", ""
+        ):
+            return
+        tags = {uuid.lower() for uuid in UUID_PATTERN.findall(endpoint)}
+        if endpoint.startswith("/handle/"):
+            try:
+                tags.add(response.json()["uuid"].lower())
+            except (ValueError, KeyError, TypeError, AttributeError):
+                pass
+        # Tag the entry first, so that if it is evicted at once its tags are removed
+        with self._lock:
+            self._tag(self.backend.entry_id(key), tags)
+        self.backend.set(key, CacheEntry.from_response(response, tags))
+
+    def _evicted(self, entry_id: str) -> None:
+        with self._lock:
+            self._untag(entry_id)
+
+    def _tag(self, entry_id: str, tags: Iterable[str]) -> None:
+        self._untag(entry_id)
+        self._entry_tags[entry_id] = tuple(tags)
+        for tag in self._entry_tags[entry_id]:
+            self._tagged.setdefault(tag, set()).add(entry_id)
+
+    def _untag(self, entry_id: str) -> None:
+        for tag in self._entry_tags.pop(entry_id, ()):
+            entry_ids = self._tagged.get(tag)
+            if entry_ids is not None:
+                entry_ids.discard(entry_id)
+                if not entry_ids:
+                    del self._tagged[tag]
+
+
+def _notify(
+    callback: Optional[Callable[[str], None]], entry_ids: Iterable[str]
+) -> None:
+    if callback is not None:
+        for entry_id in entry_ids:
+            callback(entry_id)
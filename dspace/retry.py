@@ -0,0 +1,159 @@
+# dspace/retry.py
+"""DSpace retry module.
+
+This module includes a RetryPolicy class describing when and how long to wait before
+:class:`DSpaceClient` retries a failed request, along with the default policies for
+idempotent and non-idempotent HTTP methods.
+"""
+from __future__ import annotations
+
+import email.utils
+import logging
+import random
+import time
+from typing import Collection, Dict, Optional, Tuple, Type
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    """Class describing how a failed request should be retried.
+
+    The delay before retry number n (starting at 0) is `backoff_factor` * 2 ** n
+    seconds, capped at `backoff_max`. With `jitter`, a random delay between 0 and that
+    value is used instead, so many clients retrying at once do not retry in lockstep.
+    If the response includes a `Retry-After` header and `respect_retry_after` is True,
+    the delay it specifies is used instead, also capped at `backoff_max`.
+
+    Args:
+        total: The maximum number of retries, defaults to 3. 0 disables retries
+        backoff_factor: The base delay in seconds, defaults to 0.5
+        backoff_max: The maximum delay in seconds, defaults to 30.0
+        jitter: Whether to randomize delays ("full jitter"), defaults to True
+        status_forcelist: Response status codes to retry, defaults to
+            (429, 500, 502, 503, 504)
+        exceptions: Exception classes raised by requests to retry, defaults to
+            connection errors and timeouts
+        respect_retry_after: Whether to honor a response's `Retry-After` header,
+            defaults to True
+
+    Attributes:
+        backoff_factor (float): The base delay in seconds
+        backoff_max (float): The maximum delay in seconds
+        exceptions (Tuple[Type[Exception], ...]): Exception classes to retry
+        jitter (bool): Whether to randomize delays
+        respect_retry_after (bool): Whether to honor a `Retry-After` header
+        status_forcelist (Collection[int]): Response status codes to retry
+        total (int): The maximum number of retries
+    """
+
+    def __init__(
+        self,
+        total: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30.0,
+        jitter: bool = True,
+        status_forcelist: Collection[int] = (429, 500, 502, 503, 504),
+        exceptions: Tuple[Type[Exception], ...] = (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+        ),
+        respect_retry_after: bool = True,
+    ):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.status_forcelist = status_forcelist
+        self.exceptions = exceptions
+        self.respect_retry_after = respect_retry_after
+
+    def __repr__(self):
+        return (
+            f"RetryPolicy(total={self.total}, backoff_factor={self.backoff_factor}, "
+            f"backoff_max={self.backoff_max}, jitter={self.jitter}, "
+            f"status_forcelist={tuple(self.status_forcelist)})"
+        )
+
+    def delay(
+        self, attempt: int, response: Optional[requests.Response] = None
+    ) -> float:
+        """Return the number of seconds to wait before retrying.
+
+        Args:
+            attempt: The number of retries already made
+            response: The response that failed, if any
+        """
+        if self.respect_retry_after and response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        delay = min(self.backoff_factor * 2**attempt, self.backoff_max)
+        if self.jitter:
+            delay = random.uniform(0, delay)  # nosec B311
+        return delay
+
+    def retries_error(self, error: Exception, attempt: int) -> bool:
+        """Whether a request that raised an error should be retried.
+
+        Args:
+            error: The exception raised by requests
+            attempt: The number of retries already made
+        """
+        return attempt < self.total and isinstance(error, self.exceptions)
+
+    def retries_response(self, response: requests.Response, attempt: int) -> bool:
+        """Whether a request that returned a response should be retried.
+
+        Args:
+            response: The response returned
+            attempt: The number of retries already made
+        """
+        return attempt < self.total and response.status_code in self.status_forcelist
+
+
+def default_retry_policies() -> Dict[str, RetryPolicy]:
+    """Return the default retry policies by HTTP method.
+
+    Idempotent methods (GET, PUT and DELETE) are retried on connection errors,
+    timeouts and 429/5xx responses. POST, which is not idempotent, is only retried
+    when the request cannot have been processed: a failure to connect, or a 429 or
+    503 response refusing it.
+
+    Returns:
+        Dict of :class:`RetryPolicy` objects keyed by uppercase HTTP method
+    """
+    idempotent = RetryPolicy()
+    return {
+        "DELETE": idempotent,
+        "GET": idempotent,
+        "PUT": idempotent,
+        "POST": RetryPolicy(
+            status_forcelist=(429, 503),
+            exceptions=(requests.exceptions.ConnectTimeout,),
+        ),
+    }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the number of seconds specified by a `Retry-After` header value.
+
+    Args:
+        value: The header value, either a number of seconds or an HTTP date
+
+    Returns:
+        The number of seconds to wait, or None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
@@ -0,0 +1,289 @@
+# dspace/streams.py
+"""DSpace streams module.
+
+This module includes file-like wrappers used to stream bitstream files to and from the
+DSpace REST API.
+"""
+import hashlib
+import io
+import logging
+import mmap
+import os
+import queue
+import threading
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Optional, Sequence, Union
+
+from requests.utils import super_len
+
+from dspace.progress import ProgressMeter
+
+logger = logging.getLogger(__name__)
+
+
+class HashingReader:
+    """A read-only file-like wrapper that hashes bytes as they are read.
+
+    Used as a request body, the digests of the uploaded bytes are computed while they
+    are sent, without a second pass over the source file.
+
+    Args:
+        raw: The binary file-like object to read from
+        algorithms: Names of the :mod:`hashlib` algorithms to compute, defaults to
+            ("md5",)
+        block_size: The number of bytes to read at a time when iterated over,
+            defaults to 64 KiB
+        close_raw: Whether :meth:`close` also closes `raw`, defaults to True
+        progress: A :class:`ProgressMeter` to count the bytes read with, defaults to
+            None
+
+    Attributes:
+        len (int): The number of bytes remaining in `raw` when wrapped, or 0 if
+            unknown. Used by requests to set the Content-Length header
+        raw (Union[BinaryIO, BufferReader, ReadAheadReader]): The wrapped file-like
+            object
+    """
+
+    def __init__(
+        self,
+        raw: Union[BinaryIO, "BufferReader", "ReadAheadReader"],
+        algorithms: Sequence[str] = ("md5",),
+        block_size: int = 64 * 1024,
+        close_raw: bool = True,
+        progress: Optional[ProgressMeter] = None,
+    ):
+        self.raw = raw
+        self.close_raw = close_raw
+        self.progress = progress
+        try:
+            self.len = super_len(raw)
+        except (TypeError, AttributeError, io.UnsupportedOperation):
+            self.len = 0
+        self.block_size = block_size
+        self._hashes = {
+            a.lower(): hashlib.new(a.lower(), usedforsecurity=False) for a in algorithms
+        }
+
+    def __iter__(self) -> Iterator[Union[bytes, memoryview]]:
+        while True:
+            data = self.read(self.block_size)
+            if not data:
+                return
+            yield data
+
+    def close(self) -> None:
+        """Close the wrapped file-like object, unless `close_raw` is False."""
+        if self.close_raw:
+            self.raw.close()
+
+    def hexdigests(self) -> Dict[str, str]:
+        """Return the hex digest of the bytes read so far for each algorithm."""
+        return {name: h.hexdigest() for name, h in self._hashes.items()}
+
+    def read(self, size: int = -1) -> Union[bytes, memoryview]:
+        """Read up to `size` bytes from the wrapped object and update the digests.
+
+        Returns a :class:`memoryview` when the wrapped object is a
+        :class:`BufferReader`, so the bytes are not copied.
+        """
+        data = self.raw.read(size)
+        for h in self._hashes.values():
+            h.update(data)
+        if self.progress is not None:
+            self.progress.update(len(data))
+        return data
+
+
+class BufferReader:
+    """A read-only file-like view over a bytes-like object that reads without copying.
+
+    Reads return :class:`memoryview` slices of the wrapped buffer rather than new
+    bytes objects, so bytes, bytearrays, memoryviews and memory-mapped files are sent
+    to DSpace straight from the memory they already occupy.
+
+    Args:
+        buffer: The bytes-like object to read from
+        on_close: Called once when the reader is closed, after the view of `buffer`
+            is released, e.g. to close a memory map, defaults to None
+
+    Attributes:
+        closed (bool): Whether the reader has been closed
+    """
+
+    def __init__(self, buffer: Any, on_close: Optional[Callable[[], None]] = None):
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+        self._on_close = on_close
+        self.closed = False
+
+    def __iter__(self) -> Iterator[memoryview]:
+        while True:
+            data = self.read(64 * 1024)
+            if not data:
+                return
+            yield data
+
+    def __len__(self) -> int:
+        return self._view.nbytes
+
+    def close(self) -> None:
+        """Release the view of the buffer and call `on_close`."""
+        if self.closed:
+            return
+        self.closed = True
+        self._view.release()
+        if self._on_close is not None:
+            self._on_close()
+
+    def read(self, size: int = -1) -> memoryview:
+        """Read up to `size` bytes, or all remaining bytes if `size` is negative."""
+        start = self._position
+        end = self._view.nbytes if size is None or size < 0 else start + size
+        data = self._view[start:end]
+        self._position = start + data.nbytes
+        return data
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move to `offset` relative to `whence` and return the new position."""
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self)}
+        self._position = max(0, base[whence] + offset)
+        return self._position
+
+    def seekable(self) -> bool:
+        """Return True, as the whole buffer is always available."""
+        return True
+
+    def tell(self) -> int:
+        """Return the current position in the buffer."""
+        return self._position
+
+
+def map_file(path: str) -> BufferReader:
+    """Open a local file as a :class:`BufferReader` over a read-only memory map.
+
+    The file's pages are read by the operating system as they are sent, without
+    copying them into Python buffers. The map and the file are closed when the reader
+    is closed.
+
+    Args:
+        path: Path of the local file to map
+
+    Returns:
+        :class:`BufferReader` object
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return BufferReader(b"")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close() -> None:
+        try:
+            mapped.close()
+        except BufferError:
+            logger.debug("Memory map of %s still exported, leaving it to GC", path)
+
+    return BufferReader(mapped, on_close=close)
+
+
+class ReadAheadReader:
+    """A read-only file-like wrapper that reads ahead from its source in a thread.
+
+    A background thread fills a bounded queue of up to `depth` buffers of
+    `buffer_size` bytes from the wrapped object while the consumer drains it, so slow
+    reads (e.g. from S3) overlap with slow writes (e.g. to an HTTP connection) instead
+    of alternating with them. At most `depth` + 1 buffers are held in memory.
+
+    Args:
+        raw: The binary file-like object to read from
+        buffer_size: The number of bytes to read from `raw` at a time, defaults to
+            1 MiB
+        depth: The maximum number of buffers to read ahead, defaults to 4
+        close_raw: Whether :meth:`close` also closes `raw`, defaults to True
+
+    Attributes:
+        len (int): The number of bytes remaining in `raw` when wrapped, or 0 if
+            unknown. Used by requests to set the Content-Length header
+        raw (BinaryIO): The wrapped file-like object
+    """
+
+    _EOF = object()
+
+    def __init__(
+        self,
+        raw: BinaryIO,
+        buffer_size: int = 1024 * 1024,
+        depth: int = 4,
+        close_raw: bool = True,
+    ):
+        self.raw = raw
+        self.close_raw = close_raw
+        try:
+            self.len = super_len(raw)
+        except (TypeError, AttributeError, io.UnsupportedOperation):
+            self.len = 0
+        self.buffer_size = buffer_size
+        self._queue: queue.Queue = queue.Queue(maxsize=max(depth, 1))
+        self._buffer = memoryview(b"")
+        self._eof = False
+        self._closed = threading.Event()
+        self._thread = threading.Thread(
+            target=self._fill, name="dspace-read-ahead", daemon=True
+        )
+        self._thread.start()
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            data = self.read(self.buffer_size)
+            if not data:
+                return
+            yield data
+
+    def _fill(self) -> None:
+        try:
+            while not self._closed.is_set():
+                data = self.raw.read(self.buffer_size)
+                self._put(data if data else self._EOF)
+                if not data:
+                    return
+        except Exception as e:
+            self._put(e)
+
+    def _put(self, item: object) -> None:
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _next_buffer(self) -> bool:
+        item = self._queue.get()
+        if item is self._EOF:
+            self._eof = True
+            return False
+        if isinstance(item, Exception):
+            self._eof = True
+            raise item
+        self._buffer = memoryview(item)
+        return True
+
+    def close(self) -> None:
+        """Stop reading ahead and close the wrapped object unless `close_raw` is False."""
+        self._closed.set()
+        self._thread.join()
+        if self.close_raw:
+            self.raw.close()
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to `size` bytes, or all remaining bytes if `size` is negative."""
+        if size is None or size < 0:
+            chunks = [bytes(self._buffer)]
+            self._buffer = memoryview(b"")
+            while not self._eof and self._next_buffer():
+                chunks.append(bytes(self._buffer))
+            self._buffer = memoryview(b"")
+            return b"".join(chunks)
+        if not self._buffer and (self._eof or not self._next_buffer()):
+            return b""
+        data = bytes(self._buffer[:size])
+        self._buffer = self._buffer[size:]
+        return data
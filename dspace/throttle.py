@@ -0,0 +1,171 @@
+# dspace/throttle.py
+"""DSpace throttle module.
+
+This module includes a RateLimiter class for limiting the rate and concurrency of
+requests a :class:`DSpaceClient` sends to a shared DSpace server.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """A thread-safe limiter combining a token bucket with adaptive concurrency.
+
+    Requests per second are limited by a token bucket holding up to `burst` tokens
+    and refilled at `requests_per_second`. The number of requests in flight at once
+    is limited by an AIMD (additive increase, multiplicative decrease) concurrency
+    limit: each healthy response raises the limit by 1/limit, so it grows by about
+    one per round of requests, and each overloaded response (a 429 or 5xx status, a
+    connection error or timeout, or a latency over `latency_tolerance` times the
+    lowest recent latency of the same endpoint) multiplies it by `backoff_ratio`, at
+    most once per `cooldown` seconds. Latencies are only compared between requests
+    released with the same `key`, so a fast endpoint such as "/status" does not make
+    every slower endpoint look overloaded.
+
+    Share one instance between all threads using a :class:`DSpaceClient` by passing it
+    as the client's `rate_limiter`.
+
+    Args:
+        requests_per_second: The sustained request rate, defaults to None (no rate
+            limit)
+        burst: The number of requests that may be sent at once above the sustained
+            rate, defaults to `requests_per_second` rounded up
+        initial_concurrency: The starting concurrency limit, defaults to 4
+        min_concurrency: The lowest the concurrency limit can fall to, defaults to 1
+        max_concurrency: The highest the concurrency limit can grow to, defaults to 64
+        backoff_ratio: The factor the concurrency limit is multiplied by when the
+            server is overloaded, defaults to 0.5
+        latency_tolerance: How many times the lowest recent latency a response can
+            take before the server is considered overloaded, defaults to 3.0
+        cooldown: The minimum number of seconds between decreases of the concurrency
+            limit, defaults to 1.0
+
+    Attributes:
+        limit (float): The current concurrency limit
+        in_flight (int): The number of requests currently in flight
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        burst: Optional[int] = None,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 3.0,
+        cooldown: float = 1.0,
+    ):
+        self.requests_per_second = requests_per_second
+        self.burst = burst or math.ceil(requests_per_second or 1)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.limit: float = float(initial_concurrency)
+        self.in_flight = 0
+        self._condition = threading.Condition()
+        self._tokens = float(self.burst)
+        self._refilled = time.monotonic()
+        self._last_decrease = 0.0
+        self._min_latencies: Dict[str, float] = {}
+
+    def __repr__(self):
+        return (
+            f"RateLimiter(requests_per_second={self.requests_per_second}, "
+            f"burst={self.burst}, limit={self.limit:.2f}, "
+            f"min_concurrency={self.min_concurrency}, "
+            f"max_concurrency={self.max_concurrency})"
+        )
+
+    def acquire(self) -> float:
+        """Block until a request may be sent, then reserve a slot for it.
+
+        Every call must be followed by a call to :meth:`release`.
+
+        Returns:
+            The time the request was allowed to start, to pass to :meth:`release`
+        """
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+            wait = self._take_token()
+        if wait > 0:
+            time.sleep(wait)
+        return time.monotonic()
+
+    def release(
+        self,
+        started: float,
+        overloaded: bool = False,
+        sample_latency: bool = True,
+        key: str = "",
+        latency: Optional[float] = None,
+    ) -> None:
+        """Release a request's slot and adjust the concurrency limit.
+
+        Args:
+            started: The value returned by :meth:`acquire` for the request
+            overloaded: Whether the response indicated the server is overloaded,
+                e.g. a 5xx status or a timeout
+            sample_latency: Whether the request's latency reflects server load and
+                should be compared with other requests, defaults to True. Should be
+                False for requests whose duration depends on their size, such as file
+                uploads
+            key: The endpoint the request was sent to, e.g. "GET /items/{id}".
+                Latencies are only compared with those of requests with the same key,
+                defaults to ""
+            latency: The number of seconds the server took to respond, defaults to
+                the time since `started`. Should be set when the slot is released
+                after the response body has been read
+        """
+        now = time.monotonic()
+        latency = now - started if latency is None else latency
+        with self._condition:
+            self.in_flight -= 1
+            slow = False
+            if sample_latency:
+                min_latency = self._min_latencies.get(key)
+                min_latency = (
+                    latency if min_latency is None else min(min_latency * 1.01, latency)
+                )
+                self._min_latencies[key] = min_latency
+                slow = latency > min_latency * self.latency_tolerance
+            if overloaded or slow:
+                if now - self._last_decrease >= self.cooldown:
+                    self._last_decrease = now
+                    self.limit = max(
+                        self.min_concurrency, self.limit * self.backoff_ratio
+                    )
+                    logger.debug(
+                        "DSpace server overloaded (latency %.3fs), concurrency limit "
+                        "decreased to %.2f",
+                        latency,
+                        self.limit,
+                    )
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+    def _take_token(self) -> float:
+        if not self.requests_per_second:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst,
+            self._tokens + (now - self._refilled) * self.requests_per_second,
+        )
+        self._refilled = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.requests_per_second
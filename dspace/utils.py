@@ -5,7 +5,8 @@ Utility functions for the DSpace Python client library.
 """
 
 import logging
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterator, List, Optional
 
 from dspace.client import DSpaceClient
 from dspace.errors import MissingIdentifierError
@@ -13,11 +14,42 @@ from dspace.errors import MissingIdentifierError
 logger = logging.getLogger(__name__)
 
 
+class LazyRelation:
+    """Descriptor for a relation of a DSpace object loaded from the API on first access.
+
+    DSpace REST responses only include related objects, such as an item's bitstreams,
+    when they are requested with the `expand` param. A class using this descriptor
+    keeps the names of relations that were not included in its response in
+    `_unloaded`, and implements `_load_relation(name)` to request a relation's value
+    the first time it is read. Setting the attribute marks the relation as loaded.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.attribute = f"_{name}"
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        if self.name in obj._unloaded:
+            logger.debug("Loading %s of %s", self.name, obj)
+            self.__set__(obj, obj._load_relation(self.name))
+        return getattr(obj, self.attribute)
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        setattr(obj, self.attribute, value)
+        obj._unloaded.discard(self.name)
+
+
 def select_identifier(
     client: DSpaceClient, handle: Optional[str], uuid: Optional[str]
 ) -> str:
     """Return the uuid of a DSpace object given a handle, a uuid, or both.
 
+    Handles are resolved through the client's :class:`HandleCache`, so repeated
+    lookups of the same handle only call the DSpace API once until the cached entry
+    expires.
+
     Args:
         client: Authenticated instance of :class:`DSpaceClient` class
         handle: Handle of a DSpace object
@@ -34,7 +66,117 @@ def select_identifier(
     if uuid:
         return uuid
     elif handle:
+        cached_uuid = client.handle_cache.get(handle)
+        if cached_uuid:
+            return cached_uuid
         retrieved_uuid = client.get_object_by_handle(handle).json()["uuid"]
+        client.handle_cache.set(handle, retrieved_uuid)
         return retrieved_uuid
     else:
         raise MissingIdentifierError(f"bitstream.post({client}, {uuid})")
+
+
+def paginate(
+    client: DSpaceClient,
+    endpoint: str,
+    params: Optional[dict] = None,
+    limit: int = 100,
+    prefetch: bool = True,
+    stream: bool = False,
+) -> Iterator[dict]:
+    """Lazily yield each object from a paged DSpace REST API listing endpoint.
+
+    Pages are requested with the `limit` and `offset` params until a page with fewer
+    than `limit` objects is returned. With `prefetch`, the next page is requested in a
+    background thread while the objects of the current page are being yielded, so at
+    most two pages are held in memory at once. With `stream`, each page is instead
+    decoded incrementally as it arrives (see :meth:`DSpaceClient.iter_json`), so only
+    one object at a time is held in memory and very large pages can be requested;
+    pages are then requested one after another, without prefetching.
+
+    Args:
+        client: An authenticated instance of the :class:`DSpaceClient` class
+        endpoint: The DSpace REST listing endpoint, e.g.
+            "/collections/72dfcada-de27-4ce7-99cc-68266ebfd00c/items"
+        params: Additional params that should be submitted with each page request,
+            e.g. {"expand": "metadata"}
+        limit: The number of objects to request per page, defaults to 100
+        prefetch: Whether to request the next page while the current page is being
+            consumed, defaults to True
+        stream: Whether to decode each page incrementally as it is received,
+            defaults to False
+
+    Yields:
+        Dict representation of each DSpace object in the listing
+
+    Raises:
+        :class:`requests.HTTPError`: if a page request fails
+    """
+
+    def page_params(offset: int) -> dict:
+        page_params = {**(params or {}), "limit": limit, "offset": offset}
+        logger.debug("Retrieving page %s with params %s", endpoint, page_params)
+        return page_params
+
+    def get_page(offset: int) -> List[dict]:
+        response = client.get(endpoint, params=page_params(offset))
+        return client.json_codec.loads(response.content)
+
+    if stream:
+        offset = 0
+        while True:
+            count = 0
+            for count, obj in enumerate(
+                client.iter_json(endpoint, params=page_params(offset)), 1
+            ):
+                yield obj
+            if count < limit:
+                return
+            offset += limit
+
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        offset = 0
+        page = get_page(offset)
+        while page:
+            next_page: Optional[Future] = None
+            if len(page) >= limit and executor is not None:
+                next_page = executor.submit(get_page, offset + limit)
+            yield from page
+            if len(page) < limit:
+                return
+            offset += limit
+            page = next_page.result() if next_page is not None else get_page(offset)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_community_collections(
+    client: DSpaceClient,
+    community_handle: Optional[str] = None,
+    community_uuid: Optional[str] = None,
+    limit: int = 100,
+) -> Iterator[dict]:
+    """Lazily yield each collection in a community.
+
+    Requires either the `community_handle` or the `community_uuid`, but not both. If
+    both are passed, defaults to using the UUID.
+
+    Args:
+        client: An authenticated instance of the :class:`DSpaceClient` class
+        community_handle: The handle of an existing community in DSpace
+        community_uuid: The UUID of an existing community in DSpace
+        limit: The number of collections to request per page, defaults to 100
+
+    Yields:
+        Dict representation of each DSpace collection in the community
+
+    Raises:
+        :class:`requests.HTTPError`: 404 Not Found if no community matching
+            provided handle/UUID
+        MissingIdentifierError: if neither `community_handle` nor `community_uuid`
+            parameter is provided
+    """
+    community_id = select_identifier(client, community_handle, community_uuid)
+    yield from paginate(client, f"/communities/{community_id}/collections", limit=limit)
@@ -0,0 +1,142 @@
+# tests/test_async_client.py
+import asyncio
+import time
+
+import pytest
+import requests
+
+from dspace.async_client import AsyncDSpaceClient
+from dspace.errors import MissingIdentifierError
+from dspace.item import Item, MetadataEntry
+
+
+def test_async_client_instantiates_with_expected_values():
+    client = AsyncDSpaceClient("https://dspace-example.com/rest", max_concurrency=4)
+    assert client.base_url == "https://dspace-example.com/rest"
+    assert client.max_concurrency == 4
+    adapter = client.client.session.get_adapter("https://dspace-example.com/rest")
+    assert adapter._pool_maxsize == 4
+
+
+def test_async_client_wraps_existing_client(test_client):
+    client = AsyncDSpaceClient(client=test_client)
+    assert client.client is test_client
+
+
+def test_async_client_close_leaves_wrapped_client_open(monkeypatch, test_client):
+    closed = []
+    monkeypatch.setattr(test_client, "close", lambda: closed.append(True))
+
+    async def use_client():
+        async with AsyncDSpaceClient(client=test_client):
+            pass
+
+    asyncio.run(use_client())
+    assert closed == []
+
+
+def test_async_client_close_closes_own_client(monkeypatch):
+    client = AsyncDSpaceClient("https://dspace-example.com/rest")
+    closed = []
+    monkeypatch.setattr(client.client, "close", lambda: closed.append(True))
+    asyncio.run(client.close())
+    assert closed == [True]
+
+
+def test_async_client_requires_base_url_or_client():
+    with pytest.raises(ValueError):
+        AsyncDSpaceClient()
+
+
+def test_async_client_repr():
+    client = AsyncDSpaceClient("https://dspace-example.com/rest")
+    assert str(client) == (
+        "AsyncDSpaceClient(base_url='https://dspace-example.com/rest', "
+        "max_concurrency=10)"
+    )
+
+
+def test_async_client_login_and_status(my_vcr, vcr_env):
+    async def login_and_status():
+        async with AsyncDSpaceClient(vcr_env["url"]) as client:
+            with my_vcr.use_cassette("tests/vcr_cassettes/client/login.yaml"):
+                await client.login(vcr_env["email"], vcr_env["password"])
+            with my_vcr.use_cassette("tests/vcr_cassettes/client/status.yaml"):
+                return client, await client.status()
+
+    client, response = asyncio.run(login_and_status())
+    assert "JSESSIONID" in client.client.cookies
+    assert isinstance(response, requests.Response)
+    assert response.json()["authenticated"] is True
+
+
+def test_async_client_get_object_by_handle_raises_error_if_doesnt_exist(
+    my_vcr, test_client
+):
+    async def get_handle():
+        client = AsyncDSpaceClient(client=test_client)
+        return await client.get_object_by_handle("1721.1/000000")
+
+    with my_vcr.use_cassette(
+        "tests/vcr_cassettes/client/get_object_by_handle_doesnt_exist.yaml"
+    ):
+        with pytest.raises(requests.HTTPError):
+            asyncio.run(get_handle())
+
+
+def test_async_client_select_identifier_with_handle(my_vcr, test_client):
+    client = AsyncDSpaceClient(client=test_client)
+    with my_vcr.use_cassette("tests/vcr_cassettes/client/get_object_by_handle.yaml"):
+        uuid = asyncio.run(client.select_identifier("1721.1/130884", None))
+    assert uuid == "72dfcada-de27-4ce7-99cc-68266ebfd00c"
+
+
+def test_async_client_select_identifier_without_id_raises_error(test_client):
+    client = AsyncDSpaceClient(client=test_client)
+    with pytest.raises(MissingIdentifierError):
+        asyncio.run(client.select_identifier(None, None))
+
+
+def test_async_client_post_item(my_vcr, test_client):
+    client = AsyncDSpaceClient(client=test_client)
+    item = Item(
+        metadata=[
+            MetadataEntry(key="dc.title", value="Test Item"),
+            MetadataEntry(key="dc.contributor.author", value="Jane Q. Author"),
+        ]
+    )
+    with my_vcr.use_cassette("tests/vcr_cassettes/item/post_item_with_handle.yaml"):
+        asyncio.run(client.post_item(item, collection_handle="1721.1/130884"))
+    assert item.handle == "1721.1/131194"
+    assert item.uuid == "229451b3-e943-46e8-a27e-f45d5c8aa0ec"
+
+
+def test_async_client_delete_item(my_vcr, test_client):
+    client = AsyncDSpaceClient(client=test_client)
+    item = Item()
+    item.uuid = "1becd094-9fe8-4625-ab55-86520441a1ca"
+    with my_vcr.use_cassette("tests/vcr_cassettes/item/delete_item.yaml"):
+        asyncio.run(client.delete_item(item))
+    assert item.uuid is None
+
+
+def test_async_client_runs_operations_concurrently(monkeypatch):
+    client = AsyncDSpaceClient("https://dspace-example.com/rest", max_concurrency=3)
+    active = []
+    peak = []
+
+    def fake_get(endpoint, params=None):
+        active.append(endpoint)
+        peak.append(len(active))
+        time.sleep(0.05)
+        active.remove(endpoint)
+        return endpoint
+
+    monkeypatch.setattr(client.client, "get", fake_get)
+
+    async def get_many():
+        return await asyncio.gather(*(client.get(f"/items/{i}") for i in range(9)))
+
+    results = asyncio.run(get_many())
+    assert results == [f"/items/{i}" for i in range(9)]
+    assert 1 < max(peak) <= 3
@@ -0,0 +1,414 @@
+# tests/test_batch.py
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from dspace.batch import (
+    IngestResult,
+    delete_objects,
+    ingest_items,
+    run_concurrently,
+    update_items_metadata,
+)
+from dspace.bitstream import Bitstream
+from dspace.client import DSpaceClient
+from dspace.duplicates import DuplicateIndex
+from dspace.errors import MissingIdentifierError
+from dspace.item import Item, MetadataDiff, MetadataEntry
+from dspace.journal import DONE, IngestJournal, item_key
+from dspace.response_cache import ResponseCache
+
+
+@pytest.fixture
+def fake_posts(monkeypatch):
+    posted = {"items": [], "bitstreams": []}
+    lock = threading.Lock()
+
+    def fake_item_post(self, client, collection_handle=None, collection_uuid=None):
+        if self.metadata[0].value == "fail":
+            raise RuntimeError("item post failed")
+        with lock:
+            posted["items"].append(collection_uuid)
+            self.uuid = f"uuid-{self.metadata[0].value}"
+
+    def fake_bitstream_post(self, client, item_handle=None, item_uuid=None):
+        if self.name == "fail.pdf":
+            raise RuntimeError("bitstream post failed")
+        with lock:
+            posted["bitstreams"].append((item_uuid, self.name))
+            self.uuid = f"uuid-{self.name}"
+
+    monkeypatch.setattr(Item, "post", fake_item_post)
+    monkeypatch.setattr(Bitstream, "post", fake_bitstream_post)
+    return posted
+
+
+def test_ingest_items_posts_items_and_bitstreams(fake_posts, test_client):
+    items = [
+        Item(
+            metadata=[MetadataEntry("dc.title", str(i))],
+            bitstreams=[Bitstream(name=f"{i}.pdf", file_path="x")],
+        )
+        for i in range(20)
+    ]
+    results = list(ingest_items(test_client, items, collection_uuid="c1"))
+    assert len(results) == 20
+    assert all(isinstance(r, IngestResult) and r.ok for r in results)
+    assert fake_posts["items"] == ["c1"] * 20
+    assert sorted(fake_posts["bitstreams"]) == sorted(
+        (f"uuid-{i}", f"{i}.pdf") for i in range(20)
+    )
+
+
+def test_ingest_items_reports_errors_without_stopping(fake_posts, test_client):
+    items = [
+        Item(metadata=[MetadataEntry("dc.title", "fail")]),
+        Item(
+            metadata=[MetadataEntry("dc.title", "partial")],
+            bitstreams=[Bitstream(name="fail.pdf", file_path="x")],
+        ),
+        Item(metadata=[MetadataEntry("dc.title", "ok")]),
+    ]
+    results = {
+        r.item.metadata[0].value: r
+        for r in ingest_items(test_client, items, collection_uuid="c1", max_workers=2)
+    }
+    assert str(results["fail"].error) == "item post failed"
+    assert results["fail"].item.uuid is None
+    assert str(results["partial"].error) == "bitstream post failed"
+    assert results["partial"].item.uuid == "uuid-partial"
+    assert results["ok"].ok
+
+
+def test_ingest_items_resolves_collection_handle_once(my_vcr, test_client, fake_posts):
+    items = [Item(metadata=[MetadataEntry("dc.title", str(i))]) for i in range(5)]
+    with my_vcr.use_cassette("tests/vcr_cassettes/client/get_object_by_handle.yaml"):
+        results = list(
+            ingest_items(test_client, items, collection_handle="1721.1/130884")
+        )
+    assert all(r.ok for r in results)
+    assert fake_posts["items"] == ["72dfcada-de27-4ce7-99cc-68266ebfd00c"] * 5
+
+
+def test_ingest_items_without_collection_raises_error(test_client):
+    with pytest.raises(MissingIdentifierError):
+        list(ingest_items(test_client, [Item()]))
+
+
+def test_run_concurrently_bounds_workers_and_in_flight_tasks():
+    active = []
+    peak = []
+    consumed = []
+
+    def tasks():
+        for i in range(12):
+            consumed.append(i)
+            yield i
+
+    def work(i):
+        active.append(i)
+        peak.append(len(active))
+        time.sleep(0.02)
+        active.remove(i)
+        return i
+
+    results = run_concurrently(work, tasks(), max_workers=2)
+    first = next(results)
+    assert len(consumed) <= 5
+    assert sorted([first, *results]) == list(range(12))
+    assert max(peak) <= 2
+
+
+def test_ingest_items_with_journal_resumes_interrupted_batch(
+    fake_posts, test_client, tmp_path
+):
+    def make_items():
+        return [
+            Item(
+                metadata=[MetadataEntry("dc.title", str(i))],
+                bitstreams=[
+                    Bitstream(name=f"{i}-a.pdf", file_path="x"),
+                    Bitstream(name=f"{i}-b.pdf", file_path="x"),
+                ],
+            )
+            for i in range(3)
+        ]
+
+    with IngestJournal(str(tmp_path / "journal.db")) as journal:
+        items = make_items()
+        journal.record_item_posted(item_key(items[0]), "uuid-0")
+        journal.record_done(item_key(items[0]))
+        journal.record_item_posted(item_key(items[1]), "uuid-1")
+        journal.record_bitstream_posted(item_key(items[1]), 0, "uuid-1-a.pdf")
+        results = {
+            r.item.metadata[0].value: r
+            for r in ingest_items(
+                test_client, items, collection_uuid="c1", journal=journal
+            )
+        }
+        assert results["0"].skipped
+        assert results["0"].item.uuid == "uuid-0"
+        assert not results["1"].skipped
+        assert results["1"].item.bitstreams[0].uuid == "uuid-1-a.pdf"
+        assert fake_posts["items"] == ["c1"]
+        assert sorted(fake_posts["bitstreams"]) == [
+            ("uuid-1", "1-b.pdf"),
+            ("uuid-2", "2-a.pdf"),
+            ("uuid-2", "2-b.pdf"),
+        ]
+        assert journal.counts() == {DONE: 3}
+        rerun = list(
+            ingest_items(
+                test_client, make_items(), collection_uuid="c1", journal=journal
+            )
+        )
+        assert all(r.skipped for r in rerun)
+
+
+def make_candidates():
+    return [
+        Item(
+            metadata=[
+                MetadataEntry("dc.title", str(i)),
+                MetadataEntry("dc.identifier.other", f"X-{i}"),
+            ],
+            bitstreams=[Bitstream(name=f"{i}.pdf", file_path="x")],
+        )
+        for i in range(3)
+    ]
+
+
+def test_ingest_items_skips_indexed_duplicates_and_indexes_posts(
+    fake_posts, test_client
+):
+    index = DuplicateIndex()
+    existing = Item(metadata=[MetadataEntry("dc.identifier.other", "x-1")])
+    existing.uuid = "uuid-existing"
+    existing.handle = "1721.1/1"
+    index.add(existing)
+    results = {
+        r.item.metadata[0].value: r
+        for r in ingest_items(
+            test_client, make_candidates(), collection_uuid="c1", duplicate_index=index
+        )
+    }
+    assert results["1"].skipped
+    assert results["1"].duplicate.uuid == "uuid-existing"
+    assert results["1"].item.handle == "1721.1/1"
+    assert fake_posts["items"] == ["c1", "c1"]
+    assert ("uuid-existing", "1.pdf") not in fake_posts["bitstreams"]
+    rerun = list(
+        ingest_items(
+            test_client, make_candidates(), collection_uuid="c1", duplicate_index=index
+        )
+    )
+    assert all(r.skipped for r in rerun)
+    assert len(fake_posts["items"]) == 2
+
+
+def test_ingest_items_indexes_item_before_posting_bitstreams(fake_posts, test_client):
+    index = DuplicateIndex()
+    item = Item(
+        metadata=[
+            MetadataEntry("dc.title", "partial"),
+            MetadataEntry("dc.identifier.other", "P-1"),
+        ],
+        bitstreams=[Bitstream(name="fail.pdf", file_path="x")],
+    )
+    results = list(
+        ingest_items(test_client, [item], collection_uuid="c1", duplicate_index=index)
+    )
+    assert str(results[0].error) == "bitstream post failed"
+    assert index.lookup("dc.identifier.other", "p-1").uuid == "uuid-partial"
+    retry = Item(
+        metadata=[
+            MetadataEntry("dc.title", "partial"),
+            MetadataEntry("dc.identifier.other", "P-1"),
+        ]
+    )
+    rerun = list(
+        ingest_items(test_client, [retry], collection_uuid="c1", duplicate_index=index)
+    )
+    assert rerun[0].skipped
+    assert fake_posts["items"] == ["c1"]
+
+
+def test_ingest_items_updates_indexed_duplicates(monkeypatch, fake_posts, test_client):
+    updated = []
+    monkeypatch.setattr(
+        Item,
+        "update_metadata",
+        lambda self, client, metadata: updated.append((self.uuid, metadata)),
+    )
+    index = DuplicateIndex()
+    existing = Item(metadata=[MetadataEntry("dc.identifier.other", "X-0")])
+    existing.uuid = "uuid-existing"
+    index.add(existing)
+    results = list(
+        ingest_items(
+            test_client,
+            make_candidates()[:1],
+            collection_uuid="c1",
+            duplicate_index=index,
+            on_duplicate="update",
+        )
+    )
+    assert results[0].ok and not results[0].skipped
+    assert results[0].duplicate.uuid == "uuid-existing"
+    assert updated[0][0] == "uuid-existing"
+    assert updated[0][1][0].value == "0"
+    assert fake_posts == {"items": [], "bitstreams": []}
+    assert index.lookup("dc.title", "0") is None
+    with pytest.raises(ValueError):
+        list(ingest_items(test_client, [], collection_uuid="c1", on_duplicate="merge"))
+
+
+def test_update_items_metadata(monkeypatch, test_client):
+    calls = []
+
+    def fake_update_metadata(self, client, metadata, current=None, **kwargs):
+        if self.uuid == "fail":
+            raise RuntimeError("update failed")
+        calls.append((self.uuid, metadata, current))
+        return MetadataDiff(current, metadata)
+
+    monkeypatch.setattr(Item, "update_metadata", fake_update_metadata)
+    items = []
+    for uuid, item_type in [("a", "Thesis "), ("b", "Article"), ("fail", "Thesis ")]:
+        item = Item(metadata=[MetadataEntry("dc.type", item_type)])
+        item.uuid = uuid
+        items.append(item)
+
+    def strip_type(item):
+        if item.metadata[0].value == "Article":
+            return None
+        return [MetadataEntry("dc.type", item.metadata[0].value.strip())]
+
+    results = {
+        r.item.uuid: r for r in update_items_metadata(test_client, items, strip_type)
+    }
+    assert results["a"].ok and results["a"].changed
+    assert results["a"].diff.replacements == [MetadataEntry("dc.type", "Thesis")]
+    assert results["b"].ok and not results["b"].changed
+    assert not results["fail"].ok
+    assert calls == [
+        (
+            "a",
+            [MetadataEntry("dc.type", "Thesis")],
+            [MetadataEntry("dc.type", "Thesis ")],
+        )
+    ]
+
+
+class RepositoryAdapter(requests.adapters.BaseAdapter):
+    """Transport adapter simulating a collection whose items can be deleted."""
+
+    def __init__(self, uuids, fail=(), handles=None):
+        super().__init__()
+        self.items = list(uuids)
+        self.fail = set(fail)
+        self.handles = handles or {}
+        self.deleted = []
+        self.lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        url = urlparse(request.url)
+        parts = url.path.split("/")[2:]
+        query = parse_qs(url.query)
+        status, body = 200, b""
+        with self.lock:
+            if request.method == "DELETE" and parts[1] in self.fail:
+                status = 500
+            elif request.method == "DELETE":
+                self.deleted.append("/".join(parts))
+                if parts[1] in self.items:
+                    self.items.remove(parts[1])
+            elif parts[0] == "handle":
+                body = json.dumps(self.handles["/".join(parts[1:])]).encode()
+            elif parts[0] == "collections":
+                offset, limit = int(query["offset"][0]), int(query["limit"][0])
+                page = self.items[offset : offset + limit]
+                body = json.dumps([{"uuid": u, "handle": f"h/{u}"} for u in page])
+                body = body.encode()
+        response = requests.Response()
+        response.status_code = status
+        response._content = body
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def mount_repository(*args, response_cache=None, **kwargs):
+    client = DSpaceClient(
+        "https://dspace.example.edu/rest", response_cache=response_cache
+    )
+    adapter = RepositoryAdapter(*args, **kwargs)
+    client.session.mount(client.base_url, adapter)
+    return client, adapter
+
+
+def test_delete_objects_deletes_uuids_handles_and_bitstreams():
+    client, adapter = mount_repository(
+        [],
+        handles={
+            "1721.1/1": {"uuid": "i2", "type": "item"},
+            "1721.1/2": {"uuid": "c1", "type": "collection"},
+        },
+    )
+    results = list(
+        delete_objects(
+            client,
+            item_uuids=["i1"],
+            item_handles=["1721.1/1", "1721.1/2"],
+            bitstream_uuids=["b1"],
+        )
+    )
+    assert sorted(adapter.deleted) == ["bitstreams/b1", "items/i1", "items/i2"]
+    failed = [r for r in results if not r.ok]
+    assert [(r.handle, type(r.error)) for r in failed] == [("1721.1/2", ValueError)]
+    assert sorted((r.object_type, r.uuid) for r in results if r.deleted) == [
+        ("bitstream", "b1"),
+        ("item", "i1"),
+        ("item", "i2"),
+    ]
+
+
+def test_delete_objects_purges_collection_across_shifting_pages():
+    uuids = [f"i{n}" for n in range(23)]
+    client, adapter = mount_repository(uuids, fail=["i3", "i12"])
+    results = list(delete_objects(client, collection_uuid="c1", max_workers=4, limit=5))
+    assert sorted(r.uuid for r in results) == sorted(uuids)
+    assert sorted(r.uuid for r in results if not r.ok) == ["i12", "i3"]
+    assert adapter.items == ["i3", "i12"]
+
+
+def test_delete_objects_purges_collection_with_response_cache():
+    uuids = [f"i{n}" for n in range(25)]
+    client, adapter = mount_repository(uuids, response_cache=ResponseCache())
+    collection_uuid = "72dfcada-de27-4ce7-99cc-68266ebfd00c"
+    client.get(
+        f"/collections/{collection_uuid}/items", params={"limit": 5, "offset": 0}
+    )
+    results = list(delete_objects(client, collection_uuid=collection_uuid, limit=5))
+    assert sorted(r.uuid for r in results if r.deleted) == sorted(uuids)
+    assert adapter.items == []
+
+
+def test_delete_objects_dry_run_lists_without_deleting():
+    uuids = [f"i{n}" for n in range(7)]
+    client, adapter = mount_repository(uuids)
+    results = list(
+        delete_objects(
+            client, item_uuids=["x"], collection_uuid="c1", dry_run=True, limit=3
+        )
+    )
+    assert sorted(r.uuid for r in results) == sorted(uuids + ["x"])
+    assert all(r.dry_run and r.ok and not r.deleted for r in results)
+    assert adapter.deleted == []
@@ -0,0 +1,74 @@
+# tests/test_benchmarks.py
+import pytest
+import requests
+
+from benchmarks.run import main, percentile, run_workload
+from benchmarks.server import FakeDSpaceServer
+from dspace.bitstream import Bitstream
+from dspace.client import DSpaceClient
+from dspace.item import Item, MetadataEntry
+from dspace.utils import select_identifier
+
+
+@pytest.fixture
+def fake_server():
+    with FakeDSpaceServer() as server:
+        yield server
+
+
+def test_fake_server_implements_item_and_bitstream_endpoints(fake_server, tmp_path):
+    file_path = tmp_path / "test.txt"
+    file_path.write_bytes(b"benchmark content")
+    with DSpaceClient(fake_server.base_url) as client:
+        client.login("test@example.com", "password")
+        assert client.cookies["JSESSIONID"]
+        item = Item(metadata=[MetadataEntry(key="dc.title", value="Test")])
+        item.post(client, collection_handle=fake_server.collection_handle)
+        assert item.name == "Test"
+        assert select_identifier(client, item.handle, None) == item.uuid
+        bitstream = Bitstream(name="test.txt", file_path=str(file_path))
+        bitstream.post(client, item_uuid=item.uuid)
+        assert bitstream.sizeBytes == len(b"benchmark content")
+        listed = client.get(f"/items/{item.uuid}/bitstreams").json()
+        assert [b["uuid"] for b in listed] == [bitstream.uuid]
+        items = client.get(f"/collections/{fake_server.collection_uuid}/items").json()
+        assert [i["uuid"] for i in items] == [item.uuid]
+        item.delete(client)
+        with pytest.raises(requests.HTTPError):
+            client.get(f"/bitstreams/{bitstream.uuid}")
+
+
+def test_fake_server_injects_errors():
+    with FakeDSpaceServer(error_rate=1.0) as server, DSpaceClient(
+        server.base_url
+    ) as client:
+        with pytest.raises(requests.HTTPError, match="503"):
+            client.status()
+        assert server.request_count == 1
+
+
+@pytest.mark.parametrize(
+    "workload", ["item_post", "bitstream_post", "select_identifier"]
+)
+def test_run_workload(fake_server, workload):
+    with DSpaceClient(fake_server.base_url) as client:
+        result = run_workload(
+            workload, client, fake_server, count=10, workers=2, bitstream_size=1024
+        )
+    assert result["operations"] == 10
+    assert result["errors"] == 0
+    assert result["operations_per_second"] > 0
+    assert result["p99_ms"] >= result["p50_ms"]
+    assert result["peak_rss_mb"] > 0
+
+
+def test_main_prints_results(capsys):
+    results = main(["item_post", "--count", "5", "--latency", "0", "--json"])
+    assert results[0]["workload"] == "item_post"
+    assert '"workload": "item_post"' in capsys.readouterr().out
+
+
+def test_percentile():
+    assert percentile([], 0.5) == 0.0
+    assert percentile([3.0, 1.0, 2.0, 4.0], 0.5) == 3.0
+    assert percentile([1.0, 2.0], 0.99) == 2.0
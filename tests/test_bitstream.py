@@ -1,9 +1,20 @@
 # tests/test_bitstream.py
+import gzip
+import hashlib
+import io
+
 import pytest
 import requests
 
 from dspace.bitstream import Bitstream
-from dspace.errors import MissingFilePathError, MissingIdentifierError
+from dspace.client import DSpaceClient
+from dspace.errors import (
+    ChecksumMismatchError,
+    MissingFilePathError,
+    MissingIdentifierError,
+)
+from dspace.progress import ProgressMeter
+from dspace.streams import map_file
 
 
 def test_bitstream_delete(my_vcr, test_client):
@@ -26,6 +37,38 @@ def test_bitstream_delete_nonexistent_bitstream_raises_error(my_vcr, test_client
             bitstream.delete(test_client)
 
 
+def test_bitstream_accepts_expand_and_undeclared_attributes():
+    bitstream = Bitstream(name="test-file-01.pdf")
+    assert (bitstream.type, bitstream.expand) == (
+        "bitstream",
+        ["parent", "policies", "all"],
+    )
+    bitstream.expand = ["parent"]
+    bitstream.source = "import.csv"
+    assert bitstream.expand == ["parent"]
+    assert Bitstream().expand == ["parent", "policies", "all"]
+    assert bitstream.__dict__ == {"source": "import.csv"}
+
+
+def test_bitstream_get_loads_unexpanded_relations_on_access(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    bitstream = {"uuid": "9df9382c", "name": "test.pdf", "sizeBytes": 10}
+    policies = [{"action": "READ", "groupId": "anonymous"}]
+    adapter = fake_adapter(
+        client,
+        (200, {**bitstream, "policies": policies}, {}),
+        (200, {**bitstream, "parentObject": {"uuid": "229451b3"}}, {}),
+    )
+    result = Bitstream.get(client, "9df9382c", expand=["policies"])
+    assert result.sizeBytes == 10
+    assert result.policies == policies
+    assert result.parentObject == {"uuid": "229451b3"}
+    assert [r.path_url for r in adapter.requests] == [
+        "/rest/bitstreams/9df9382c?expand=policies",
+        "/rest/bitstreams/9df9382c?expand=parent",
+    ]
+
+
 def test_bitstream_post_success_remote_file(my_vcr, test_client, mocked_s3):
     with my_vcr.use_cassette(
         "tests/vcr_cassettes/bitstream/post_bitstream_success_remote_file.yaml",
@@ -55,7 +98,9 @@ def test_bitstream_post_success_remote_file(my_vcr, test_client, mocked_s3):
         assert bitstream.uuid == "2546ae0a-152a-4e0d-ad2d-28f62f301529"
 
 
-def test_bitstream_post_success_with_handle(my_vcr, test_client, test_file_path_01):
+def test_bitstream_post_success_with_handle(
+    my_vcr, test_client, test_file_path_01, vcr_bytes_bodies
+):
     with my_vcr.use_cassette(
         "tests/vcr_cassettes/bitstream/post_bitstream_with_handle.yaml",
         filter_post_data_parameters=None,
@@ -84,7 +129,9 @@ def test_bitstream_post_success_with_handle(my_vcr, test_client, test_file_path_
         assert bitstream.uuid == "d1a3ca4f-1e79-442b-a204-49462ce14b07"
 
 
-def test_bitstream_post_success_with_uuid(my_vcr, test_client, test_file_path_01):
+def test_bitstream_post_success_with_uuid(
+    my_vcr, test_client, test_file_path_01, vcr_bytes_bodies
+):
     with my_vcr.use_cassette(
         "tests/vcr_cassettes/bitstream/post_bitstream_with_uuid.yaml",
         filter_post_data_parameters=None,
@@ -107,10 +154,61 @@ def test_bitstream_post_success_with_uuid(my_vcr, test_client, test_file_path_01
         assert bitstream.sequenceId == -1
         assert bitstream.sizeBytes == 35721
         assert bitstream.uuid == "106f5e94-b5ac-436c-b3f8-4e01210a5b63"
+        assert bitstream.checksums == {"md5": "a4e0f4930dfaff904fa3c6c85b0b8ecc"}
+
+
+def test_bitstream_post_computes_sha256(
+    my_vcr, test_client, test_file_path_01, vcr_bytes_bodies
+):
+    with my_vcr.use_cassette(
+        "tests/vcr_cassettes/bitstream/post_bitstream_with_uuid.yaml",
+        filter_post_data_parameters=None,
+    ):
+        bitstream = Bitstream(file_path=test_file_path_01)
+        bitstream.post(
+            test_client,
+            item_uuid="b3bc3232-a1ff-49ec-b816-aa8ebde60258",
+            checksum_algorithms=["md5", "sha256"],
+        )
+        assert bitstream.checksums["md5"] == "a4e0f4930dfaff904fa3c6c85b0b8ecc"
+        assert len(bitstream.checksums["sha256"]) == 64
+
+
+def test_bitstream_post_checksum_mismatch_raises_error(
+    my_vcr, test_client, test_file_path_02, vcr_bytes_bodies
+):
+    with my_vcr.use_cassette(
+        "tests/vcr_cassettes/bitstream/post_bitstream_with_uuid.yaml",
+        filter_post_data_parameters=None,
+    ):
+        bitstream = Bitstream(file_path=test_file_path_02)
+        with pytest.raises(ChecksumMismatchError) as e:
+            bitstream.post(
+                test_client, item_uuid="b3bc3232-a1ff-49ec-b816-aa8ebde60258"
+            )
+        assert e.value.expected == "4f226ab9fa58be96f6c443f3539e8b13"
+        assert e.value.actual == "a4e0f4930dfaff904fa3c6c85b0b8ecc"
+        assert bitstream.uuid == "106f5e94-b5ac-436c-b3f8-4e01210a5b63"
+
+
+def test_bitstream_post_without_checksum_verification(
+    my_vcr, test_client, test_file_path_02, vcr_bytes_bodies
+):
+    with my_vcr.use_cassette(
+        "tests/vcr_cassettes/bitstream/post_bitstream_with_uuid.yaml",
+        filter_post_data_parameters=None,
+    ):
+        bitstream = Bitstream(file_path=test_file_path_02)
+        bitstream.post(
+            test_client,
+            item_uuid="b3bc3232-a1ff-49ec-b816-aa8ebde60258",
+            verify_checksum=False,
+        )
+        assert bitstream.checksums == {"md5": "4f226ab9fa58be96f6c443f3539e8b13"}
 
 
 def test_bitstream_post_to_nonexistent_item_raises_error(
-    my_vcr, test_client, test_file_path_01
+    my_vcr, test_client, test_file_path_01, vcr_bytes_bodies
 ):
     with my_vcr.use_cassette(
         "tests/vcr_cassettes/bitstream/post_to_nonexistent_item.yaml",
@@ -133,3 +231,188 @@ def test_bitstream_post_without_handle_or_uuid_raises_error(
     with pytest.raises(MissingIdentifierError):
         bitstream = Bitstream(file_path=test_file_path_01)
         bitstream.post(test_client)
+
+
+def post_response(content):
+    return {
+        "bundleName": "ORIGINAL",
+        "checkSum": {
+            "value": hashlib.md5(content).hexdigest(),
+            "checkSumAlgorithm": "MD5",
+        },
+        "format": "Text",
+        "link": "/rest/bitstreams/9df9382c",
+        "mimeType": "text/plain",
+        "parentObject": None,
+        "policies": None,
+        "retrieveLink": "/rest/bitstreams/9df9382c/retrieve",
+        "sequenceId": 1,
+        "sizeBytes": len(content),
+        "uuid": "9df9382c",
+    }
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"Test content", bytearray(b"Test content"), memoryview(b"Test content")],
+)
+def test_bitstream_post_bytes_like_content(fake_adapter, content):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(client, (200, post_response(b"Test content"), {}))
+    bitstream = Bitstream(name="test.txt", content=content)
+    bitstream.post(client, item_uuid="229451b3")
+    assert isinstance(adapter.bodies[0], memoryview)
+    assert adapter.bodies[0] == b"Test content"
+    assert adapter.requests[0].headers["Content-Length"] == "12"
+    assert bitstream.checksums == {"md5": hashlib.md5(b"Test content").hexdigest()}
+
+
+def test_bitstream_post_reports_progress(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    fake_adapter(client, (200, post_response(b"Test content"), {}))
+    reports = []
+    Bitstream(name="test.txt", content=b"Test content").post(
+        client, item_uuid="229451b3", progress=ProgressMeter(reports.append)
+    )
+    assert reports[-1].done
+    assert reports[-1].bytes_transferred == reports[-1].total_bytes == 12
+
+
+def test_bitstream_post_file_like_content_leaves_it_open(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(
+        client,
+        (200, post_response(b"content"), {}),
+        (200, post_response(b"content"), {}),
+    )
+    buffer = io.BytesIO(b"Test content")
+    buffer.seek(5)
+    Bitstream(name="test.txt", content=buffer).post(client, item_uuid="229451b3")
+    assert adapter.bodies.pop() == b"content"
+    buffer.write(b"CONTENT")
+    stream = io.BufferedReader(io.BytesIO(b"content"))
+    Bitstream(name="test.txt", content=stream).post(client, item_uuid="229451b3")
+    assert adapter.bodies.pop() == b"content"
+    assert not stream.closed
+
+
+def test_bitstream_post_maps_local_file_and_closes_it(
+    monkeypatch, fake_adapter, test_file_path_02
+):
+    readers = []
+
+    def recording_map_file(path):
+        readers.append(map_file(path))
+        return readers[-1]
+
+    monkeypatch.setattr("dspace.bitstream.map_file", recording_map_file)
+    monkeypatch.setattr("smart_open.open", None)
+    with open(test_file_path_02, "rb") as f:
+        content = f.read()
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(client, (200, post_response(content), {}))
+    Bitstream(file_path=test_file_path_02).post(client, item_uuid="229451b3")
+    assert adapter.bodies[0] == content
+    assert readers[0].closed
+
+
+def test_bitstream_post_streams_compressed_local_file(fake_adapter, tmp_path):
+    path = tmp_path / "test.txt.gz"
+    path.write_bytes(gzip.compress(b"Test content"))
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(client, (200, post_response(b"Test content"), {}))
+    Bitstream(file_path=str(path)).post(client, item_uuid="229451b3")
+    assert adapter.bodies[0] == b"Test content"
+
+
+class FakeRangeResponse:
+    def __init__(self, content, status_code):
+        self.content = content
+        self.status_code = status_code
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+
+def test_bitstream_download(fake_adapter, test_client, tmp_path):
+    adapter = fake_adapter(
+        test_client, (200, b"Test content", {"Content-Type": "text/plain"})
+    )
+    bitstream = Bitstream()
+    bitstream.uuid = "2546ae0a-152a-4e0d-ad2d-28f62f301529"
+    bitstream.download(test_client, str(tmp_path / "test-file-03.txt"), chunk_size=4)
+    assert (tmp_path / "test-file-03.txt").read_text() == "Test content"
+    assert adapter.requests[0].path_url == (
+        "/rest/bitstreams/2546ae0a-152a-4e0d-ad2d-28f62f301529/retrieve"
+    )
+
+
+def test_bitstream_download_to_s3(fake_adapter, test_client, mocked_s3):
+    fake_adapter(test_client, (200, b"Test content", {"Content-Type": "text/plain"}))
+    bitstream = Bitstream()
+    bitstream.uuid = "2546ae0a-152a-4e0d-ad2d-28f62f301529"
+    bitstream.download(test_client, "s3://test-bucket/downloads/test-file-03.txt")
+    response = mocked_s3.get_object(
+        Bucket="test-bucket", Key="downloads/test-file-03.txt"
+    )
+    assert response["Body"].read() == b"Test content"
+
+
+def test_bitstream_download_parallel_ranges(monkeypatch, test_client, tmp_path):
+    content = bytes(range(256)) * 40
+    requested = []
+
+    def fake_get(endpoint, params=None, headers=None, stream=False):
+        start, end = map(int, headers["Range"][len("bytes=") :].split("-"))
+        requested.append((start, end))
+        return FakeRangeResponse(content[start : end + 1], 206)
+
+    monkeypatch.setattr(test_client, "get", fake_get)
+    bitstream = Bitstream()
+    bitstream.uuid = "2546ae0a-152a-4e0d-ad2d-28f62f301529"
+    bitstream.sizeBytes = len(content)
+    meter = ProgressMeter()
+    bitstream.download(
+        test_client,
+        str(tmp_path / "file.bin"),
+        max_workers=4,
+        range_size=1000,
+        progress=meter,
+    )
+    assert (tmp_path / "file.bin").read_bytes() == content
+    assert meter.bytes_transferred == meter.total_bytes == len(content)
+    assert sorted(requested)[0] == (0, 999)
+    assert sorted(requested)[-1] == (10000, 10239)
+    assert len(requested) == 11
+
+
+def test_bitstream_download_parallel_falls_back_without_range_support(
+    monkeypatch, test_client, tmp_path
+):
+    content = b"x" * 5000
+    monkeypatch.setattr(
+        test_client,
+        "get",
+        lambda endpoint, params=None, headers=None, stream=False: FakeRangeResponse(
+            content, 200
+        ),
+    )
+    bitstream = Bitstream()
+    bitstream.uuid = "2546ae0a-152a-4e0d-ad2d-28f62f301529"
+    bitstream.sizeBytes = len(content)
+    bitstream.download(
+        test_client, str(tmp_path / "file.bin"), max_workers=4, range_size=1000
+    )
+    assert (tmp_path / "file.bin").read_bytes() == content
+
+
+def test_bitstream_download_without_uuid_raises_error(test_client, tmp_path):
+    with pytest.raises(MissingIdentifierError):
+        Bitstream().download(test_client, str(tmp_path / "file.bin"))
@@ -0,0 +1,72 @@
+# tests/test_cache.py
+import json
+
+import pytest
+
+from dspace.cache import HandleCache
+
+
+def test_handle_cache_get_and_set():
+    cache = HandleCache()
+    assert cache.get("1721.1/1") is None
+    cache.set("1721.1/1", "uuid-1")
+    assert cache.get("1721.1/1") == "uuid-1"
+    assert "1721.1/1" in cache
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_handle_cache_evicts_least_recently_used():
+    cache = HandleCache(maxsize=2)
+    cache.set("1721.1/1", "uuid-1")
+    cache.set("1721.1/2", "uuid-2")
+    cache.get("1721.1/1")
+    cache.set("1721.1/3", "uuid-3")
+    assert len(cache) == 2
+    assert "1721.1/1" in cache
+    assert "1721.1/2" not in cache
+    assert "1721.1/3" in cache
+
+
+def test_handle_cache_expires_entries(monkeypatch):
+    cache = HandleCache(ttl=10)
+    monkeypatch.setattr("dspace.cache.time.time", lambda: 1000.0)
+    cache.set("1721.1/1", "uuid-1")
+    monkeypatch.setattr("dspace.cache.time.time", lambda: 1011.0)
+    assert cache.get("1721.1/1") is None
+    assert len(cache) == 0
+    assert cache.misses == 1
+
+
+def test_handle_cache_maxsize_zero_disables_caching():
+    cache = HandleCache(maxsize=0)
+    cache.set("1721.1/1", "uuid-1")
+    assert cache.get("1721.1/1") is None
+
+
+def test_handle_cache_invalidate_and_clear():
+    cache = HandleCache()
+    cache.set("1721.1/1", "uuid-1")
+    cache.set("1721.1/2", "uuid-2")
+    cache.invalidate("1721.1/1")
+    cache.invalidate("1721.1/missing")
+    assert "1721.1/1" not in cache
+    cache.get("1721.1/2")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 0
+
+
+def test_handle_cache_persists_to_disk(tmp_path):
+    path = str(tmp_path / "handles.json")
+    cache = HandleCache(path=path)
+    cache.set("1721.1/1", "uuid-1")
+    cache.save()
+    assert list(json.load(open(path))) == ["1721.1/1"]
+    warm_cache = HandleCache(path=path)
+    assert warm_cache.get("1721.1/1") == "uuid-1"
+
+
+def test_handle_cache_save_without_path_raises_error():
+    with pytest.raises(ValueError):
+        HandleCache().save()
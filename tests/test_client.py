@@ -1,9 +1,15 @@
 # tests/test_client.py
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 import requests
 
+from dspace.cache import HandleCache
 from dspace.client import DSpaceClient
+from dspace.codec import StdlibJSONCodec
+from dspace.utils import paginate
 
 
 def test_client_instantiates_with_expected_values():
@@ -11,6 +17,33 @@ def test_client_instantiates_with_expected_values():
     assert client.headers["accept"] == "application/json"
     assert client.base_url == "https://dspace-example.com/rest"
     assert client.timeout == 3.0
+    assert isinstance(client.session, requests.Session)
+
+
+def test_client_mounts_pooled_adapter_with_configured_limits():
+    client = DSpaceClient(
+        "https://dspace-example.com/rest", pool_maxsize=32, pool_block=True
+    )
+    adapter = client.session.get_adapter("https://dspace-example.com/rest/status")
+    assert adapter._pool_maxsize == 32
+    assert adapter._pool_block is True
+
+
+def test_client_context_manager_closes_session(monkeypatch):
+    closed = []
+    with DSpaceClient("https://dspace-example.com/rest") as client:
+        monkeypatch.setattr(client.session, "close", lambda: closed.append(True))
+    assert closed == [True]
+
+
+def test_client_close_saves_handle_cache(tmp_path):
+    path = str(tmp_path / "handles.json")
+    client = DSpaceClient(
+        "https://dspace-example.com/rest", handle_cache=HandleCache(path=path)
+    )
+    client.handle_cache.set("1721.1/1", "uuid-1")
+    client.close()
+    assert HandleCache(path=path).get("1721.1/1") == "uuid-1"
 
 
 def test_client_repr():
@@ -55,6 +88,40 @@ def test_client_get_object_by_handle_raises_error_if_doesnt_exist(
             test_client.get_object_by_handle("1721.1/000000")
 
 
+class RecordingCodec(StdlibJSONCodec):
+    def __init__(self):
+        self.calls = []
+
+    def dumps(self, obj):
+        self.calls.append("dumps")
+        return super().dumps(obj)
+
+    def loads(self, data):
+        self.calls.append("loads")
+        return super().loads(data)
+
+
+def test_client_encodes_and_decodes_json_with_codec(fake_adapter):
+    codec = RecordingCodec()
+    client = DSpaceClient("https://dspace.example.edu/rest", json_codec=codec)
+    adapter = fake_adapter(client, (200, {"uuid": "1"}, {}), (200, [{"uuid": "2"}], {}))
+    response = client.post("/items/uuid/metadata", json=[{"key": "dc.title"}])
+    assert response.json() == {"uuid": "1"}
+    assert codec.calls == ["dumps"]
+    assert adapter.bodies[0] == b'[{"key":"dc.title"}]'
+    assert adapter.requests[0].headers["Content-Type"] == "application/json"
+    assert list(paginate(client, "/items", prefetch=False)) == [{"uuid": "2"}]
+    assert codec.calls == ["dumps", "loads"]
+
+
+def test_client_iter_json_streams_array_elements(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(client, (200, [{"uuid": "1"}, {"uuid": "2"}], {}))
+    objects = client.iter_json("/items", params={"limit": 2}, chunk_size=3)
+    assert list(objects) == [{"uuid": "1"}, {"uuid": "2"}]
+    assert adapter.requests[0].url.endswith("/items?limit=2")
+
+
 def test_client_login(my_vcr, vcr_env):
     with my_vcr.use_cassette("tests/vcr_cassettes/client/login.yaml"):
         client = DSpaceClient(vcr_env["url"])
@@ -79,8 +146,86 @@ def test_client_post_method(my_vcr, vcr_env):
         assert isinstance(response, requests.Response)
 
 
+def test_client_put_method(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(client, (200, b"", {}))
+    response = client.put("/items/uuid/metadata", json=[{"key": "dc.title"}])
+    assert isinstance(response, requests.Response)
+    assert adapter.requests[0].method == "PUT"
+    assert json.loads(adapter.bodies[0]) == [{"key": "dc.title"}]
+
+
 def test_client_status(my_vcr, test_client, vcr_env):
     with my_vcr.use_cassette("tests/vcr_cassettes/client/status.yaml"):
         status = test_client.status().json()
         assert status["okay"] is True
         assert status["authenticated"] is True
+
+
+class SlowAdapter(requests.adapters.BaseAdapter):
+    """Transport adapter answering every request with the same response after a delay."""
+
+    def __init__(self, status=200, error=None):
+        super().__init__()
+        self.status = status
+        self.error = error
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append(request.url)
+        time.sleep(0.2)
+        if self.error:
+            raise self.error
+        response = requests.Response()
+        response.status_code = self.status
+        response._content = b'{"uuid": "1"}'
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def get_concurrently(client, endpoints):
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+        futures = [executor.submit(client.get, endpoint) for endpoint in endpoints]
+        return [f.exception() or f.result() for f in futures]
+
+
+def test_client_coalesces_identical_concurrent_gets():
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = SlowAdapter()
+    client.session.mount(client.base_url, adapter)
+    responses = get_concurrently(client, ["/handle/1721.1/1"] * 8 + ["/handle/2/2"])
+    assert sorted(adapter.sent) == [
+        "https://dspace.example.edu/rest/handle/1721.1/1",
+        "https://dspace.example.edu/rest/handle/2/2",
+    ]
+    assert all(r.json() == {"uuid": "1"} for r in responses)
+    assert client.metrics.snapshot()["endpoints"][0]["coalesced"] == 7
+    client.get("/handle/1721.1/1")
+    assert len(adapter.sent) == 3
+
+
+@pytest.mark.parametrize(
+    "adapter, error",
+    [
+        (SlowAdapter(status=500), requests.HTTPError),
+        (SlowAdapter(error=requests.ConnectionError()), requests.ConnectionError),
+    ],
+)
+def test_client_coalesced_get_error_raised_to_every_caller(adapter, error):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    client.session.mount(client.base_url, adapter)
+    results = get_concurrently(client, ["/handle/1721.1/1"] * 4)
+    assert len(adapter.sent) == 1
+    assert all(isinstance(result, error) for result in results)
+
+
+def test_client_without_coalescing_sends_every_get():
+    client = DSpaceClient("https://dspace.example.edu/rest", coalesce_gets=False)
+    adapter = SlowAdapter()
+    client.session.mount(client.base_url, adapter)
+    get_concurrently(client, ["/handle/1721.1/1"] * 3)
+    assert len(adapter.sent) == 3
@@ -0,0 +1,76 @@
+# tests/test_codec.py
+import json
+
+import pytest
+
+from dspace.codec import (
+    JSONCodec,
+    OrjsonCodec,
+    StdlibJSONCodec,
+    default_codec,
+    iter_json_array,
+    orjson,
+)
+
+
+def chunked(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+ARRAYS = [
+    [],
+    [1, -2.5e10, 3],
+    [{"key": "dc.title", "value": 'Quotes "],[{" and \\ escapes'}, None, True],
+    [[[]], [{}], "é€😀"],
+]
+
+
+def test_stdlib_codec_round_trip():
+    codec = StdlibJSONCodec()
+    assert codec.dumps({"a": [1, "é"]}) == '{"a":[1,"\\u00e9"]}'.encode()
+    assert codec.loads(b'{"a": [1]}') == {"a": [1]}
+
+
+def test_orjson_codec_round_trip():
+    pytest.importorskip("orjson")
+    codec = OrjsonCodec()
+    assert codec.loads(codec.dumps({"a": [1, "é"]})) == {"a": [1, "é"]}
+
+
+def test_default_codec_prefers_orjson():
+    expected = "orjson" if orjson is not None else "json"
+    assert default_codec().name == expected
+
+
+@pytest.mark.parametrize("array", ARRAYS)
+@pytest.mark.parametrize("size", [1, 2, 5, 4096])
+def test_iter_json_array_decodes_elements_across_chunks(array, size):
+    data = json.dumps(array, ensure_ascii=False).encode()
+    assert list(iter_json_array(chunked(b" \n" + data + b"\n", size))) == array
+
+
+def test_iter_json_array_yields_before_end_of_input():
+    def chunks():
+        yield b'[{"uuid": "1"},'
+        raise AssertionError("read past the first element")
+
+    assert next(iter_json_array(chunks())) == {"uuid": "1"}
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"{}", b"x[1]", b"[1", b"[1,]", b"[,1]", b"[1,,2]", b"[1 2]", b"[1] x"],
+)
+@pytest.mark.parametrize("size", [1, 4096])
+def test_iter_json_array_invalid_raises_error(data, size):
+    with pytest.raises(ValueError):
+        list(iter_json_array(chunked(data, size)))
+
+
+def test_json_codec_requires_dumps_and_loads():
+    class PartialCodec(JSONCodec):
+        def dumps(self, obj):
+            return b""
+
+    with pytest.raises(TypeError):
+        PartialCodec()
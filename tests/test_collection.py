@@ -0,0 +1,51 @@
+# tests/test_collection.py
+from dspace.client import DSpaceClient
+from dspace.collection import Collection
+
+COLLECTION = {
+    "uuid": "72dfcada",
+    "handle": "1721.1/131022",
+    "name": "Test Collection",
+    "numberItems": 3,
+    "link": "/rest/collections/72dfcada",
+}
+
+
+def test_collection_from_dict():
+    collection = Collection.from_dict(
+        {**COLLECTION, "parentCommunity": {"uuid": "c8a2c6f1"}}
+    )
+    assert collection.handle == "1721.1/131022"
+    assert collection.numberItems == 3
+    assert collection.parentCommunity == {"uuid": "c8a2c6f1"}
+    assert collection.type == "collection"
+
+
+def test_collection_get_by_handle_loads_unexpanded_relations_on_access(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(
+        client,
+        (200, COLLECTION, {}),
+        (200, {**COLLECTION, "parentCommunityList": [{"uuid": "c8a2c6f1"}]}, {}),
+    )
+    collection = Collection.get(client, collection_handle=COLLECTION["handle"])
+    assert collection.name == "Test Collection"
+    assert adapter.requests[0].path_url == "/rest/handle/1721.1/131022"
+    assert client.handle_cache.get(COLLECTION["handle"]) == COLLECTION["uuid"]
+    assert collection.parentCommunityList == [{"uuid": "c8a2c6f1"}]
+    assert collection.parentCommunityList == [{"uuid": "c8a2c6f1"}]
+    assert adapter.requests[1].path_url == (
+        "/rest/collections/72dfcada?expand=parentCommunityList"
+    )
+    assert len(adapter.requests) == 2
+
+
+def test_collection_get_with_expand_all(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(client, (200, COLLECTION, {}))
+    collection = Collection.get(
+        client, collection_uuid=COLLECTION["uuid"], expand=["all"]
+    )
+    assert collection.parentCommunity is None
+    assert adapter.requests[0].path_url == "/rest/collections/72dfcada?expand=all"
+    assert len(adapter.requests) == 1
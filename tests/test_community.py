@@ -0,0 +1,85 @@
+# tests/test_community.py
+from dspace.client import DSpaceClient
+from dspace.collection import Collection
+from dspace.community import Community
+
+COMMUNITY = {
+    "uuid": "c8a2c6f1",
+    "handle": "1721.1/131021",
+    "name": "Test Community",
+    "countItems": 5,
+    "link": "/rest/communities/c8a2c6f1",
+}
+
+
+def test_community_from_dict_converts_expanded_relations():
+    community = Community.from_dict(
+        {
+            **COMMUNITY,
+            "collections": [{"uuid": "72dfcada", "name": "Test Collection"}],
+            "subcommunities": [{"uuid": "e5b1f4d2", "name": "Subcommunity"}],
+        }
+    )
+    assert community.countItems == 5
+    assert isinstance(community.collections[0], Collection)
+    assert community.collections[0].uuid == "72dfcada"
+    assert isinstance(community.subcommunities[0], Community)
+    assert community.subcommunities[0].name == "Subcommunity"
+    assert community.type == "community"
+
+
+def test_community_get_loads_unexpanded_relations_on_access(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(
+        client,
+        (200, COMMUNITY, {}),
+        (200, [{"uuid": "72dfcada", "name": "Test Collection"}], {}),
+        (200, [], {}),
+        (200, {**COMMUNITY, "parentCommunity": None}, {}),
+    )
+    community = Community.get(client, community_uuid=COMMUNITY["uuid"])
+    assert community.handle == "1721.1/131021"
+    assert len(adapter.requests) == 1
+    assert [c.name for c in community.collections] == ["Test Collection"]
+    assert adapter.requests[1].path_url == (
+        "/rest/communities/c8a2c6f1/collections?limit=100&offset=0"
+    )
+    assert community.subcommunities == []
+    assert community.parentCommunity is None
+    assert adapter.requests[3].path_url == (
+        "/rest/communities/c8a2c6f1?expand=parentCommunity"
+    )
+    assert community.collections[0].uuid == "72dfcada"
+    assert len(adapter.requests) == 4
+
+
+def test_community_get_by_handle_with_expand(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(
+        client, (200, {**COMMUNITY, "subcommunities": [], "collections": []}, {})
+    )
+    community = Community.get(
+        client,
+        community_handle=COMMUNITY["handle"],
+        expand=["subCommunities", "collections"],
+    )
+    assert community.subcommunities == []
+    assert community.collections == []
+    assert adapter.requests[0].path_url == (
+        "/rest/handle/1721.1/131021?expand=subCommunities%2Ccollections"
+    )
+    assert len(adapter.requests) == 1
+
+
+def test_community_iter_top(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(
+        client,
+        (200, [COMMUNITY, {**COMMUNITY, "uuid": "a0b1c2d3"}], {}),
+        (200, [{**COMMUNITY, "uuid": "f9e8d7c6"}], {}),
+    )
+    communities = Community.iter_top(client, limit=2)
+    assert [c.uuid for c in communities] == ["c8a2c6f1", "a0b1c2d3", "f9e8d7c6"]
+    assert adapter.requests[1].path_url == (
+        "/rest/communities/top-communities?limit=2&offset=2"
+    )
@@ -0,0 +1,107 @@
+# tests/test_duplicates.py
+import pytest
+
+from dspace.client import DSpaceClient
+from dspace.duplicates import DuplicateIndex, normalize_identifier, normalize_title
+from dspace.item import Item, MetadataEntry
+
+
+def make_item(uuid=None, handle=None, **metadata):
+    item = Item(
+        metadata=[
+            MetadataEntry(key.replace("_", "."), value)
+            for key, value in metadata.items()
+        ]
+    )
+    item.uuid = uuid
+    item.handle = handle
+    return item
+
+
+def test_normalizers():
+    assert normalize_identifier(" DOI:10.1000/XYZ \n") == "doi:10.1000/xyz"
+    assert normalize_title("Café  Society: A History.") == "cafe society a history"
+
+
+def test_duplicate_index_finds_items_by_selected_keys():
+    index = DuplicateIndex(keys=["dc.identifier.*", "dc.title"])
+    index.add(
+        make_item("uuid-1", "1721.1/1", dc_identifier_doi="10.1000/ABC", dc_title="A")
+    )
+    index.add(make_item("uuid-2", "1721.1/2", dc_title="Café Society"))
+    assert len(index) == 2
+    match = index.find(make_item(dc_identifier_doi=" 10.1000/abc", dc_title="B"))
+    assert (match.uuid, match.handle, match.key) == (
+        "uuid-1",
+        "1721.1/1",
+        "dc.identifier.doi",
+    )
+    assert index.find(make_item(dc_title="cafe society!")).uuid == "uuid-2"
+    assert index.find(make_item(dc_identifier_uri="10.1000/abc")) is None
+    assert make_item(dc_description="Café Society") not in index
+    assert index.lookup("dc.title", "CAFE SOCIETY").uuid == "uuid-2"
+
+
+def test_duplicate_index_prefers_earlier_keys():
+    index = DuplicateIndex(keys=["dc.identifier.*", "dc.title"])
+    index.add(make_item("uuid-1", dc_title="Report"))
+    index.add(make_item("uuid-2", dc_identifier_other="R-1"))
+    match = index.find(make_item(dc_title="Report", dc_identifier_other="r-1"))
+    assert match.uuid == "uuid-2"
+
+
+def test_duplicate_index_add_replaces_and_discard_removes_values():
+    index = DuplicateIndex()
+    index.add(make_item("uuid-1", dc_identifier_other="old"))
+    index.add(make_item("uuid-1", dc_identifier_other="new"))
+    assert index.lookup("dc.identifier.other", "old") is None
+    assert index.find(make_item("uuid-1", dc_identifier_other="new")) is None
+    assert index.find(make_item(dc_identifier_other="new")).uuid == "uuid-1"
+    index.discard("uuid-1")
+    assert len(index) == 0
+    assert index.lookup("dc.identifier.other", "new") is None
+    with pytest.raises(ValueError):
+        index.add(make_item(dc_identifier_other="new"))
+
+
+def test_duplicate_index_keeps_shared_values_after_discard():
+    index = DuplicateIndex()
+    index.add(make_item("uuid-1", dc_identifier_other="shared"))
+    index.add(make_item("uuid-2", dc_identifier_other="shared"))
+    assert index.lookup("dc.identifier.other", "shared").uuid == "uuid-1"
+    assert index.find(make_item("uuid-1", dc_identifier_other="shared")).uuid == (
+        "uuid-2"
+    )
+    index.discard("uuid-1")
+    assert index.lookup("dc.identifier.other", "shared").uuid == "uuid-2"
+    assert index.find(make_item("uuid-2", dc_identifier_other="shared")) is None
+
+
+def test_duplicate_index_save_and_load(tmp_path):
+    path = str(tmp_path / "index.json")
+    index = DuplicateIndex(path=path)
+    index.add(make_item("uuid-1", "1721.1/1", dc_identifier_other="X-1"))
+    index.save()
+    loaded = DuplicateIndex(path=path)
+    assert loaded.find(make_item(dc_identifier_other="x-1")).handle == "1721.1/1"
+    with pytest.raises(ValueError):
+        DuplicateIndex(keys=["dc.title"], path=path)
+    with pytest.raises(ValueError):
+        DuplicateIndex().save()
+
+
+def test_duplicate_index_build_from_collection(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    items = [
+        {
+            "uuid": f"uuid-{i}",
+            "handle": f"1721.1/{i}",
+            "metadata": [{"key": "dc.identifier.other", "value": f"X-{i}"}],
+        }
+        for i in range(3)
+    ]
+    adapter = fake_adapter(client, (200, items, {}))
+    index = DuplicateIndex.build(client, collection_uuid="c1")
+    assert len(index) == 3
+    assert index.find(make_item(dc_identifier_other="x-2")).uuid == "uuid-2"
+    assert "expand=metadata" in adapter.requests[0].url
@@ -0,0 +1,157 @@
+# tests/test_harvest.py
+import json
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from dspace.client import DSpaceClient
+from dspace.harvest import HarvestCheckpoint, harvest_items, parse_last_modified
+
+BASE_URL = "https://dspace.example.edu/rest"
+
+
+class CollectionAdapter(requests.adapters.BaseAdapter):
+    """Transport adapter serving item listings of in-memory collections by URL."""
+
+    def __init__(self, collections, fail=()):
+        super().__init__()
+        self.collections = collections
+        self.fail = set(fail)
+        self.paths = []
+
+    def send(self, request, **kwargs):
+        url = urlparse(request.url)
+        path = url.path[len(urlparse(BASE_URL).path) :]
+        self.paths.append(path)
+        query = parse_qs(url.query)
+        parts = path.strip("/").split("/")
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        if parts[0] == "collections" and parts[1] in self.fail:
+            response.status_code = 500
+            response._content = b"{}"
+            return response
+        if parts[0] == "collections":
+            offset = int(query["offset"][0])
+            limit = int(query["limit"][0])
+            body = self.collections[parts[1]][offset : offset + limit]
+        else:
+            body = next(
+                dict(item, metadata=[{"key": "dc.title", "value": "T"}])
+                for items in self.collections.values()
+                for item in items
+                if item["uuid"] == parts[1]
+            )
+        response.status_code = 200
+        response._content = json.dumps(body).encode()
+        return response
+
+    def close(self):
+        pass
+
+
+def item(uuid, last_modified):
+    return {"uuid": uuid, "handle": f"1721.1/{uuid}", "lastModified": last_modified}
+
+
+@pytest.fixture
+def collections():
+    return {
+        "c1": [
+            item("a", "Wed Sep 01 10:00:00 UTC 2021"),
+            item("b", "Thu Sep 02 14:57:52 UTC 2021"),
+            item("c", "Thu Sep 02 14:57:52 UTC 2021"),
+        ],
+        "c2": [
+            item("d", "Tue Aug 31 09:00:00 UTC 2021"),
+            item("e", "Fri Sep 03 08:30:00 UTC 2021"),
+        ],
+    }
+
+
+def mount(collections, fail=()):
+    client = DSpaceClient(BASE_URL)
+    adapter = CollectionAdapter(collections, fail)
+    client.session.mount(BASE_URL, adapter)
+    return client, adapter
+
+
+def test_parse_last_modified():
+    assert parse_last_modified("Thu Sep 02 14:57:52 UTC 2021") == datetime(
+        2021, 9, 2, 14, 57, 52, tzinfo=timezone.utc
+    )
+    assert parse_last_modified("2021-09-02 14:57:52.123") == datetime(
+        2021, 9, 2, 14, 57, 52, 123000, tzinfo=timezone.utc
+    )
+    with pytest.raises(ValueError):
+        parse_last_modified("yesterday")
+
+
+def test_harvest_items_first_run_yields_all_and_saves_checkpoint(collections, tmp_path):
+    client, _ = mount(collections)
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint = HarvestCheckpoint(path)
+    items = harvest_items(
+        client, checkpoint, collection_uuids=["c1", "c2"], limit=2, max_workers=2
+    )
+    assert sorted(i.uuid for i in items) == ["a", "b", "c", "d", "e"]
+    reloaded = HarvestCheckpoint(path)
+    assert reloaded.get("c1") == (
+        datetime(2021, 9, 2, 14, 57, 52, tzinfo=timezone.utc),
+        {"b", "c"},
+    )
+    assert reloaded.get("c2")[0] == datetime(2021, 9, 3, 8, 30, tzinfo=timezone.utc)
+
+
+def test_harvest_items_yields_only_items_modified_since_checkpoint(
+    collections, tmp_path
+):
+    client, _ = mount(collections)
+    checkpoint = HarvestCheckpoint(str(tmp_path / "checkpoint.json"))
+    list(harvest_items(client, checkpoint, collection_uuids=["c1", "c2"]))
+    collections["c1"].append(item("f", "Thu Sep 02 14:57:52 UTC 2021"))
+    collections["c2"][0]["lastModified"] = "Sat Sep 04 12:00:00 UTC 2021"
+    items = harvest_items(client, checkpoint, collection_uuids=["c1", "c2"])
+    assert sorted(i.uuid for i in items) == ["d", "f"]
+    assert checkpoint.get("c1")[1] == {"b", "c", "f"}
+    assert list(harvest_items(client, checkpoint, collection_uuids=["c1", "c2"])) == []
+
+
+def test_harvest_items_with_expand_requests_only_modified_items(collections):
+    client, adapter = mount(collections)
+    checkpoint = HarvestCheckpoint()
+    checkpoint.set("c1", parse_last_modified("Wed Sep 01 10:00:00 UTC 2021"), {"a"})
+    items = list(
+        harvest_items(client, checkpoint, collection_uuids=["c1"], expand=["metadata"])
+    )
+    assert sorted(i.uuid for i in items) == ["b", "c"]
+    assert items[0].metadata[0].value == "T"
+    assert sorted(p for p in adapter.paths if p.startswith("/items")) == [
+        "/items/b",
+        "/items/c",
+    ]
+
+
+def test_harvest_items_does_not_advance_unfinished_collections(collections):
+    client, _ = mount(collections)
+    checkpoint = HarvestCheckpoint()
+    items = harvest_items(client, checkpoint, collection_uuids=["c1"], limit=1)
+    next(items)
+    items.close()
+    assert checkpoint.get("c1") == (None, set())
+
+
+def test_harvest_items_failed_collection_raises_and_keeps_mark(collections):
+    client, _ = mount(collections, fail=["c2"])
+    checkpoint = HarvestCheckpoint()
+    with pytest.raises(requests.HTTPError):
+        list(harvest_items(client, checkpoint, collection_uuids=["c2"]))
+    assert checkpoint.get("c2") == (None, set())
+
+
+def test_harvest_checkpoint_save_requires_path():
+    with pytest.raises(ValueError):
+        HarvestCheckpoint().save()
@@ -0,0 +1,195 @@
+# tests/test_hierarchy.py
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from dspace.client import DSpaceClient
+from dspace.collection import Collection
+from dspace.community import Community
+from dspace.hierarchy import CommunityTree, crawl_hierarchy
+
+BASE_URL = "https://dspace.example.edu/rest"
+
+
+class HierarchyAdapter(requests.adapters.BaseAdapter):
+    """Transport adapter serving an in-memory community hierarchy by URL.
+
+    `communities` maps each community UUID to a tuple of its subcommunity UUIDs and
+    collection UUIDs.
+    """
+
+    def __init__(self, communities, roots, delay=0.0):
+        super().__init__()
+        self.communities = communities
+        self.roots = roots
+        self.delay = delay
+        self.paths = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            return self._respond(request)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def _respond(self, request):
+        url = urlparse(request.url)
+        path = url.path[len(urlparse(BASE_URL).path) :]
+        self.paths.append(path)
+        query = parse_qs(url.query)
+        parts = path.strip("/").split("/")
+        if parts[0] == "handle":
+            body = community(parts[2])
+        elif parts[1] == "top-communities":
+            offset = int(query["offset"][0])
+            limit = int(query["limit"][0])
+            body = [community(u) for u in self.roots[offset : offset + limit]]
+        elif parts[1] not in self.communities:
+            return make_response(request, 404, {"message": "Not Found"})
+        else:
+            assert query["expand"] == ["subCommunities,collections"]
+            subcommunities, collections = self.communities[parts[1]]
+            body = dict(
+                community(parts[1]),
+                subcommunities=[community(u) for u in subcommunities],
+                collections=[collection(u) for u in collections],
+            )
+        return make_response(request, 200, body)
+
+    def close(self):
+        pass
+
+
+def make_response(request, status, body):
+    response = requests.Response()
+    response.status_code = status
+    response.request = request
+    response.url = request.url
+    response._content = json.dumps(body).encode()
+    return response
+
+
+def community(uuid):
+    return {"uuid": uuid, "handle": f"1721.1/{uuid}", "name": f"Community {uuid}"}
+
+
+def collection(uuid):
+    return {"uuid": uuid, "handle": f"1721.1/{uuid}", "name": f"Collection {uuid}"}
+
+
+def mount(communities, roots, **kwargs):
+    client = DSpaceClient(BASE_URL)
+    adapter = HierarchyAdapter(communities, roots, **kwargs)
+    client.session.mount(BASE_URL, adapter)
+    return client, adapter
+
+
+@pytest.fixture
+def hierarchy():
+    return {
+        "A": (["A1", "A2"], ["cA"]),
+        "A1": (["A11"], ["cA1", "shared"]),
+        "A2": ([], ["shared"]),
+        "A11": ([], ["cA11"]),
+        "B": ([], ["cB"]),
+    }
+
+
+def test_crawl_hierarchy_builds_linked_tree(hierarchy):
+    client, adapter = mount(hierarchy, ["A", "B"])
+    tree = crawl_hierarchy(client, limit=1)
+    assert len(tree) == 10
+    assert [c.uuid for c in tree.roots] == ["A", "B"]
+    a1 = tree.get("1721.1/A1")
+    assert isinstance(a1, Community)
+    assert [c.uuid for c in a1.subcommunities] == ["A11"]
+    assert [c.uuid for c in a1.collections] == ["cA1", "shared"]
+    assert isinstance(tree.get("cA11"), Collection)
+    assert [c.uuid for c in tree.ancestors("1721.1/cA11")] == ["A", "A1", "A11"]
+    assert tree.ancestors("A") == []
+    assert [o.uuid for o in tree.walk()] == [
+        "A", "cA", "B", "cB", "A1", "cA1", "shared", "A2", "A11", "cA11"
+    ]  # fmt: skip
+    assert sorted(p for p in adapter.paths if "top" not in p) == [
+        "/communities/A",
+        "/communities/A1",
+        "/communities/A11",
+        "/communities/A2",
+        "/communities/B",
+    ]
+    with pytest.raises(KeyError):
+        tree.ancestors("missing")
+
+
+def test_crawl_hierarchy_bounds_concurrent_requests():
+    communities = {"root": ([f"c{i}" for i in range(20)], [])}
+    communities.update({f"c{i}": ([], [f"col{i}"]) for i in range(20)})
+    client, adapter = mount(communities, ["root"], delay=0.02)
+    tree = crawl_hierarchy(client, max_workers=4)
+    assert len(tree.collections) == 20
+    assert 1 < adapter.peak <= 4
+
+
+def test_crawl_hierarchy_refreshes_only_stale_communities(hierarchy):
+    client, adapter = mount(hierarchy, ["A", "B"])
+    tree = crawl_hierarchy(client)
+    tree._fetched["A1"] -= 7200
+    adapter.paths.clear()
+    hierarchy["A1"] = (["A11"], ["cA1"])
+    crawl_hierarchy(client, tree, max_age=3600)
+    assert sorted(adapter.paths) == ["/communities/A1", "/communities/top-communities"]
+    assert [c.uuid for c in tree.get("A1").collections] == ["cA1"]
+    assert "shared" in tree
+
+
+def test_crawl_hierarchy_refreshes_subtree_and_prunes_removed_nodes(hierarchy):
+    client, adapter = mount(hierarchy, ["A", "B"])
+    tree = crawl_hierarchy(client)
+    adapter.paths.clear()
+    hierarchy["A1"] = ([], ["cA1", "new"])
+    crawl_hierarchy(client, tree, community_handles=["1721.1/A1"])
+    assert sorted(adapter.paths) == ["/communities/A1", "/handle/1721.1/A1"]
+    assert "A11" not in tree
+    assert "cA11" not in tree
+    assert [c.uuid for c in tree.ancestors("new")] == ["A", "A1"]
+    assert "B" in tree
+
+
+def test_crawl_hierarchy_leaves_tree_unchanged_on_failure(hierarchy):
+    client, adapter = mount(hierarchy, ["A", "B"])
+    tree = crawl_hierarchy(client)
+    before = [o.uuid for o in tree.walk()]
+    hierarchy["A1"] = ([], ["cA1"])
+    hierarchy["A2"] = (["gone"], ["shared"])
+    with pytest.raises(requests.HTTPError):
+        crawl_hierarchy(client, tree)
+    assert [o.uuid for o in tree.walk()] == before
+    assert [c.uuid for c in tree.get("A1").subcommunities] == ["A11"]
+    assert sorted(tree._communities) == ["A", "A1", "A11", "A2", "B"]
+    assert "gone" not in tree._children["A2"][0]
+
+
+def test_community_tree_save_and_load(tmp_path, hierarchy):
+    path = str(tmp_path / "tree.json")
+    client, adapter = mount(hierarchy, ["A", "B"])
+    crawl_hierarchy(client, CommunityTree(path=path)).save()
+    loaded = CommunityTree(path=path)
+    assert len(loaded) == 10
+    assert loaded.get("1721.1/shared").name == "Collection shared"
+    assert [c.uuid for c in loaded.ancestors("cA11")] == ["A", "A1", "A11"]
+    adapter.paths.clear()
+    crawl_hierarchy(client, loaded, max_age=3600)
+    assert adapter.paths == ["/communities/top-communities"]
+    with pytest.raises(ValueError):
+        CommunityTree().save()
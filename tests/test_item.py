@@ -1,9 +1,21 @@
 # tests/test_item.py
+import json
+
 import pytest
 import requests
 
-from dspace.errors import MissingIdentifierError
-from dspace.item import Item, MetadataEntry
+from dspace.client import DSpaceClient
+from dspace.errors import MetadataUpdateError, MissingIdentifierError
+from dspace.item import Item, MetadataDiff, MetadataEntry
+
+ITEM = {
+    "uuid": "229451b3-e943-46e8-a27e-f45d5c8aa0ec",
+    "handle": "1721.1/131194",
+    "lastModified": "Thu Sep 02 14:57:52 UTC 2021",
+    "metadata": None,
+    "bitstreams": None,
+    "parentCollection": None,
+}
 
 
 def test_item_delete(my_vcr, test_client):
@@ -26,11 +38,261 @@ def test_item_delete_nonexistent_item_raises_error(my_vcr, test_client):
             item.delete(test_client)
 
 
+def test_item_from_dict():
+    item = Item.from_dict(
+        {
+            "uuid": "229451b3-e943-46e8-a27e-f45d5c8aa0ec",
+            "handle": "1721.1/131194",
+            "lastModified": "Thu Sep 02 14:57:52 UTC 2021",
+            "metadata": [{"key": "dc.title", "value": "Test Item"}],
+            "bitstreams": [{"uuid": "d1a3ca4f", "name": "test-file-01.pdf"}],
+        }
+    )
+    assert item.uuid == "229451b3-e943-46e8-a27e-f45d5c8aa0ec"
+    assert item.handle == "1721.1/131194"
+    assert item.lastModified == "Thu Sep 02 14:57:52 UTC 2021"
+    assert item.archived is None
+    assert item.metadata[0].key == "dc.title"
+    assert item.bitstreams[0].name == "test-file-01.pdf"
+
+
+def test_item_get_loads_unexpanded_relations_on_access(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(
+        client,
+        (200, ITEM, {}),
+        (200, [{"key": "dc.title", "value": "Test Item"}], {}),
+        (200, [{"uuid": "d1a3ca4f", "name": "test-file-01.pdf"}], {}),
+        (200, {**ITEM, "parentCollection": {"uuid": "72dfcada"}}, {}),
+    )
+    item = Item.get(client, item_uuid=ITEM["uuid"])
+    assert item.handle == "1721.1/131194"
+    assert len(adapter.requests) == 1
+    assert adapter.requests[0].url.endswith(f"/items/{ITEM['uuid']}")
+    assert item.metadata[0].value == "Test Item"
+    assert item.metadata[0].value == "Test Item"
+    assert item.bitstreams[0].name == "test-file-01.pdf"
+    assert item.parentCollection == {"uuid": "72dfcada"}
+    assert [r.path_url for r in adapter.requests[1:]] == [
+        f"/rest/items/{ITEM['uuid']}/metadata",
+        f"/rest/items/{ITEM['uuid']}/bitstreams?limit=100&offset=0",
+        f"/rest/items/{ITEM['uuid']}?expand=parentCollection",
+    ]
+
+
+def test_item_get_with_expand_by_handle(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(
+        client,
+        (200, {**ITEM, "metadata": [{"key": "dc.title", "value": "Test"}]}, {}),
+        (200, ITEM, {}),
+    )
+    item = Item.get(client, item_handle=ITEM["handle"], expand=["metadata"])
+    assert item.metadata[0].value == "Test"
+    assert adapter.requests[0].path_url == (
+        "/rest/handle/1721.1/131194?expand=metadata"
+    )
+    assert client.handle_cache.get(ITEM["handle"]) == ITEM["uuid"]
+    Item.get(client, item_handle=ITEM["handle"], expand=["all"]).bitstreams
+    assert adapter.requests[1].path_url == f"/rest/items/{ITEM['uuid']}?expand=all"
+    assert len(adapter.requests) == 2
+
+
+def test_item_set_relation_is_not_loaded(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(client, (200, ITEM, {}))
+    item = Item.get(client, item_uuid=ITEM["uuid"])
+    item.bitstreams = []
+    assert item.bitstreams == []
+    assert len(adapter.requests) == 1
+
+
+def test_metadata_diff():
+    current = [
+        MetadataEntry("dc.title", "Old Title"),
+        MetadataEntry("dc.subject", "A"),
+        MetadataEntry("dc.subject", "B"),
+        MetadataEntry("dc.type", "Thesis", "en_US"),
+        MetadataEntry("dc.rights", "Open"),
+    ]
+    desired = [
+        MetadataEntry("dc.title", "New Title"),
+        MetadataEntry("dc.subject", "A"),
+        MetadataEntry("dc.subject", "B"),
+        MetadataEntry("dc.type", "Thesis", "en_US"),
+        MetadataEntry("dc.date.issued", "2021"),
+    ]
+    diff = MetadataDiff(current, desired)
+    assert diff
+    assert diff.additions == [MetadataEntry("dc.date.issued", "2021")]
+    assert diff.replacements == [MetadataEntry("dc.title", "New Title")]
+    assert diff.removals == []
+    assert diff.result == [MetadataEntry("dc.rights", "Open")] + desired
+    diff = MetadataDiff(current, desired, remove_missing=True)
+    assert diff.removals == ["dc.rights"]
+    assert diff.result == desired
+
+
+def test_metadata_diff_compares_order_and_language():
+    current = [MetadataEntry("dc.subject", "A"), MetadataEntry("dc.subject", "B")]
+    assert not MetadataDiff(current, list(current))
+    no_language = [MetadataEntry("dc.title", "T", "")]
+    assert not MetadataDiff(no_language, [MetadataEntry("dc.title", "T")])
+    reordered = MetadataDiff(current, [current[1], current[0]])
+    assert reordered.replacements == [current[1], current[0]]
+    language = MetadataDiff(current[:1], [MetadataEntry("dc.subject", "A", "en")])
+    assert len(language.replacements) == 1
+
+
+def test_item_update_metadata_sends_only_changes(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(
+        client,
+        (
+            200,
+            [
+                {"key": "dc.title", "value": "Old", "schema": "dc"},
+                {"key": "dc.type", "value": "Thesis"},
+            ],
+            {},
+        ),
+        (200, b"", {}),
+        (200, b"", {}),
+    )
+    item = Item()
+    item.uuid = ITEM["uuid"]
+    diff = item.update_metadata(
+        client,
+        [
+            MetadataEntry("dc.title", "New"),
+            MetadataEntry("dc.type", "Thesis"),
+            MetadataEntry("dc.subject", "Physics"),
+        ],
+    )
+    assert diff.removals == []
+    assert [(r.method, r.path_url) for r in adapter.requests] == [
+        ("GET", f"/rest/items/{ITEM['uuid']}/metadata"),
+        ("POST", f"/rest/items/{ITEM['uuid']}/metadata"),
+        ("PUT", f"/rest/items/{ITEM['uuid']}/metadata"),
+    ]
+    assert json.loads(adapter.bodies[1]) == [{"key": "dc.subject", "value": "Physics"}]
+    assert json.loads(adapter.bodies[2]) == [{"key": "dc.title", "value": "New"}]
+    assert [m.value for m in item.metadata] == ["New", "Thesis", "Physics"]
+
+
+def test_item_update_metadata_with_current_and_no_changes_sends_nothing(
+    fake_adapter,
+):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(client)
+    item = Item()
+    item.uuid = ITEM["uuid"]
+    current = [MetadataEntry("dc.title", "Title")]
+    diff = item.update_metadata(client, list(current), current=current)
+    assert not diff
+    assert adapter.requests == []
+
+
+def test_item_update_metadata_remove_missing_replaces_all(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(client, (200, b"", {}), (200, b"", {}))
+    item = Item()
+    item.uuid = ITEM["uuid"]
+    item.update_metadata(
+        client,
+        [MetadataEntry("dc.title", "Title")],
+        current=[MetadataEntry("dc.title", "Title"), MetadataEntry("dc.type", "x")],
+        remove_missing=True,
+    )
+    assert [r.method for r in adapter.requests] == ["DELETE", "POST"]
+    assert json.loads(adapter.bodies[1]) == [{"key": "dc.title", "value": "Title"}]
+
+
+def test_item_update_metadata_restores_metadata_if_replacement_fails(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(
+        client, (200, b"", {}), (400, b"", {}), (200, b"", {}), (200, b"", {})
+    )
+    item = Item()
+    item.uuid = ITEM["uuid"]
+    current = [MetadataEntry("dc.title", "Title"), MetadataEntry("dc.type", "x")]
+    with pytest.raises(MetadataUpdateError) as e:
+        item.update_metadata(
+            client, [MetadataEntry("dc.title", "New")], current, remove_missing=True
+        )
+    assert e.value.restored is True
+    assert ITEM["uuid"] in str(e.value)
+    assert isinstance(e.value.__cause__, requests.HTTPError)
+    assert [r.method for r in adapter.requests] == ["DELETE", "POST", "DELETE", "POST"]
+    assert json.loads(adapter.bodies[3]) == [m.to_dict() for m in current]
+
+
+def test_item_update_metadata_reports_failed_restore(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    fake_adapter(client, (200, b"", {}), (500, b"", {}), (500, b"", {}))
+    item = Item()
+    item.uuid = ITEM["uuid"]
+    with pytest.raises(MetadataUpdateError) as e:
+        item.update_metadata(
+            client,
+            [],
+            [MetadataEntry("dc.title", "Title")],
+            remove_missing=True,
+        )
+    assert e.value.restored is False
+
+
+def test_item_update_metadata_without_uuid_raises_error(test_client):
+    with pytest.raises(MissingIdentifierError):
+        Item().update_metadata(test_client, [])
+
+
 def test_item_instantiates_with_expected_values():
     title = MetadataEntry(key="dc.title", value="Test Item")
     item = Item(metadata=[title])
     assert item.bitstreams == []
     assert item.metadata == [title]
+    assert item.type == "item"
+    assert item.__dict__ == {}
+
+
+def test_item_accepts_expand_and_undeclared_attributes():
+    item = Item()
+    item.expand = ["metadata"]
+    item.source = "import.csv"
+    assert Item().expand[0] == "metadata" and Item().expand[-1] == "all"
+    assert item.expand == ["metadata"]
+    assert item.__dict__ == {"source": "import.csv"}
+
+
+def test_item_iter_collection(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(
+        client,
+        (
+            200,
+            [
+                {**ITEM, "metadata": [{"key": "dc.title", "value": "Test Item 1"}]},
+                {**ITEM, "uuid": "a9f1c6b2", "handle": "1721.1/131202"},
+            ],
+            {},
+        ),
+        (200, [{**ITEM, "uuid": "b37e02d4", "handle": "1721.1/131203"}], {}),
+    )
+    items = Item.iter_collection(
+        client, collection_uuid="72dfcada", expand=["metadata"], limit=2
+    )
+    first = next(items)
+    assert isinstance(first, Item)
+    assert first.uuid == ITEM["uuid"]
+    assert first.metadata[0].value == "Test Item 1"
+    assert len(adapter.requests) == 1
+    rest = list(items)
+    assert [i.handle for i in rest] == ["1721.1/131202", "1721.1/131203"]
+    assert [r.path_url for r in adapter.requests] == [
+        "/rest/collections/72dfcada/items?expand=metadata&limit=2&offset=0",
+        "/rest/collections/72dfcada/items?expand=metadata&limit=2&offset=2",
+    ]
 
 
 def test_item_post_success_with_handle(my_vcr, test_client):
@@ -97,6 +359,12 @@ def test_metadata_entry_instantiates_with_expected_values():
     assert metadata_entry.language is None
 
 
+def test_metadata_entry_interns_keys():
+    key = "".join(["dc.", "title"])
+    assert MetadataEntry(key, "First").key is MetadataEntry("dc.title", "Second").key
+    assert not hasattr(MetadataEntry(key, "First"), "__dict__")
+
+
 def test_metadata_entry_to_dict():
     metadata_entry = MetadataEntry("dc.fieldname", "field value")
     metadata_entry_dict = metadata_entry.to_dict()
@@ -0,0 +1,45 @@
+# tests/test_journal.py
+from dspace.bitstream import Bitstream
+from dspace.item import Item, MetadataEntry
+from dspace.journal import DONE, ITEM_POSTED, PENDING, IngestJournal, item_key
+
+
+def test_item_key_is_stable_for_same_item_content():
+    def make_item():
+        return Item(
+            metadata=[MetadataEntry("dc.title", "Test Item")],
+            bitstreams=[Bitstream(name="test.pdf", file_path="s3://bucket/test.pdf")],
+        )
+
+    assert item_key(make_item()) == item_key(make_item())
+    other = Item(metadata=[MetadataEntry("dc.title", "Other Item")])
+    assert item_key(other) != item_key(make_item())
+
+
+def test_ingest_journal_records_item_states(tmp_path):
+    with IngestJournal(str(tmp_path / "journal.db")) as journal:
+        assert journal.get("key-1") == (None, None)
+        journal.record_pending("key-1")
+        assert journal.get("key-1") == (PENDING, None)
+        journal.record_item_posted("key-1", "uuid-1")
+        journal.record_bitstream_posted("key-1", 0, "bitstream-uuid-1")
+        assert journal.get("key-1") == (ITEM_POSTED, "uuid-1")
+        assert journal.posted_bitstreams("key-1") == {0: "bitstream-uuid-1"}
+        journal.record_done("key-1")
+        assert journal.get("key-1") == (DONE, "uuid-1")
+        assert journal.counts() == {DONE: 1}
+
+
+def test_ingest_journal_persists_across_instances(tmp_path):
+    path = str(tmp_path / "journal.db")
+    with IngestJournal(path) as journal:
+        journal.record_item_posted("key-1", "uuid-1")
+    with IngestJournal(path) as journal:
+        assert journal.get("key-1") == (ITEM_POSTED, "uuid-1")
+
+
+def test_ingest_journal_record_pending_does_not_reset_state(tmp_path):
+    with IngestJournal(str(tmp_path / "journal.db")) as journal:
+        journal.record_item_posted("key-1", "uuid-1")
+        journal.record_pending("key-1")
+        assert journal.get("key-1") == (ITEM_POSTED, "uuid-1")
@@ -0,0 +1,105 @@
+# tests/test_metadata.py
+import pytest
+
+from dspace.item import Item, MetadataEntry
+from dspace.metadata import MetadataTable
+
+
+@pytest.fixture
+def metadata_table():
+    table = MetadataTable()
+    table.add("item-1", "dc.title", "First Item", "en_US")
+    table.add("item-1", "dc.type", "Thesis")
+    table.add("item-2", "dc.title", "Second Item", "en_US")
+    table.add("item-2", "dc.type", "Thesis")
+    table.add("item-2", "dc.subject", "Physics")
+    return table
+
+
+def test_metadata_table_stores_rows_in_order(metadata_table):
+    assert len(metadata_table) == 5
+    assert list(metadata_table)[:2] == [
+        ("item-1", "dc.title", "First Item", "en_US"),
+        ("item-1", "dc.type", "Thesis", None),
+    ]
+    assert metadata_table.item_ids == ["item-1", "item-2"]
+    assert metadata_table.keys == ["dc.title", "dc.type", "dc.subject"]
+
+
+def test_metadata_table_deduplicates_short_values(metadata_table):
+    metadata_table.add("item-3", "dc.description.abstract", "a" * 200)
+    metadata_table.add("item-4", "dc.description.abstract", "a" * 200)
+    assert metadata_table.to_dict()["values"] == [
+        "First Item",
+        "Thesis",
+        "Second Item",
+        "Physics",
+        "a" * 200,
+        "a" * 200,
+    ]
+
+
+def test_metadata_table_entries(metadata_table):
+    entries = metadata_table.entries("item-2")
+    assert [(e.key, e.value, e.language) for e in entries] == [
+        ("dc.title", "Second Item", "en_US"),
+        ("dc.type", "Thesis", None),
+        ("dc.subject", "Physics", None),
+    ]
+    assert metadata_table.entries("missing") == []
+
+
+def test_metadata_table_entries_of_interleaved_and_loaded_rows(metadata_table):
+    metadata_table.add("item-1", "dc.subject", "Chemistry")
+    loaded = MetadataTable.from_dict(metadata_table.to_dict())
+    for table in (metadata_table, loaded):
+        assert [e.value for e in table.entries("item-1")] == [
+            "First Item",
+            "Thesis",
+            "Chemistry",
+        ]
+
+
+def test_metadata_table_filter(metadata_table):
+    titles = metadata_table.filter(keys=["dc.title", "dc.missing"])
+    assert [row[2] for row in titles] == ["First Item", "Second Item"]
+    second = metadata_table.filter(item_ids=["item-2"], keys=["dc.type"])
+    assert list(second) == [("item-2", "dc.type", "Thesis", None)]
+    english = metadata_table.filter(predicate=lambda k, v, lang: lang == "en_US")
+    assert len(english) == 2
+
+
+def test_metadata_table_values(metadata_table):
+    assert metadata_table.values("dc.title") == {
+        "item-1": ["First Item"],
+        "item-2": ["Second Item"],
+    }
+    assert metadata_table.values("dc.missing") == {}
+
+
+def test_metadata_table_add_item():
+    item = Item(metadata=[MetadataEntry("dc.title", "Test Item")])
+    item.uuid = "229451b3-e943-46e8-a27e-f45d5c8aa0ec"
+    table = MetadataTable([item])
+    assert table.item_ids == ["229451b3-e943-46e8-a27e-f45d5c8aa0ec"]
+    table.add_item(item, item_id="1721.1/131194")
+    assert table.values("dc.title")["1721.1/131194"] == ["Test Item"]
+    with pytest.raises(ValueError):
+        table.add_item(Item())
+
+
+def test_metadata_table_save_and_load(metadata_table, tmp_path):
+    path = str(tmp_path / "metadata.json")
+    metadata_table.save(path)
+    loaded = MetadataTable.load(path)
+    assert list(loaded) == list(metadata_table)
+    loaded.add("item-3", "dc.type", "Thesis")
+    assert [e.value for e in loaded.entries("item-3")] == ["Thesis"]
+    assert loaded.to_dict()["values"] == metadata_table.to_dict()["values"]
+
+
+def test_metadata_table_from_dict_raises_error_if_columns_differ(metadata_table):
+    table = metadata_table.to_dict()
+    table["columns"]["value"].pop()
+    with pytest.raises(ValueError):
+        MetadataTable.from_dict(table)
@@ -0,0 +1,141 @@
+# tests/test_metrics.py
+import pytest
+import requests
+
+from dspace.cache import HandleCache
+from dspace.client import DSpaceClient
+from dspace.metrics import ClientMetrics, endpoint_template
+from dspace.response_cache import ResponseCache
+from dspace.retry import RetryPolicy
+
+ITEM_UUID = "7c8e7bbc-e36b-4194-87e5-5347e3a69a57"
+
+
+def test_endpoint_template_replaces_identifiers():
+    assert endpoint_template(f"/items/{ITEM_UUID}/bitstreams") == (
+        "/items/{id}/bitstreams"
+    )
+    assert endpoint_template("/handle/1721.1/130883") == "/handle/{handle}"
+    assert endpoint_template("/status") == "/status"
+
+
+def test_client_metrics_records_requests_by_endpoint_and_status():
+    metrics = ClientMetrics()
+    metrics.record_request("GET", f"/items/{ITEM_UUID}", 200, 0.02, 0, 100)
+    metrics.record_request("GET", f"/items/{ITEM_UUID.upper()}", 200, 0.2, 0, 50)
+    metrics.record_request("GET", "/items/other", 404, 0.01)
+    metrics.record_request("POST", "/login", None, 3.0, 40)
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == [
+        {"method": "GET", "endpoint": "/items/other", "status": "404", "count": 1},
+        {"method": "GET", "endpoint": "/items/{id}", "status": "200", "count": 2},
+        {"method": "POST", "endpoint": "/login", "status": "error", "count": 1},
+    ]
+    items = snapshot["endpoints"][1]
+    assert items["endpoint"] == "/items/{id}"
+    assert items["latency_count"] == 2
+    assert items["latency_sum"] == pytest.approx(0.22)
+    assert items["latency_buckets"]["0.025"] == 1
+    assert items["latency_buckets"]["0.25"] == 2
+    assert items["latency_buckets"]["+Inf"] == 2
+    assert items["bytes_received"] == 150
+    assert snapshot["endpoints"][2]["bytes_sent"] == 40
+    assert "handle_cache" not in snapshot
+
+
+def test_client_metrics_reset():
+    metrics = ClientMetrics()
+    metrics.record_request("GET", "/status", 200, 0.01)
+    metrics.record_retry("GET", "/status")
+    metrics.reset()
+    assert metrics.snapshot() == {"requests": [], "endpoints": []}
+
+
+def test_client_metrics_to_prometheus():
+    cache = HandleCache()
+    cache.set("1721.1/130883", ITEM_UUID)
+    cache.get("1721.1/130883")
+    metrics = ClientMetrics(handle_cache=cache, buckets=(0.1, 1.0))
+    metrics.record_request("GET", f"/items/{ITEM_UUID}", 200, 0.5, 0, 10)
+    metrics.record_retry("GET", f"/items/{ITEM_UUID}")
+    text = metrics.to_prometheus()
+    labels = 'method="GET",endpoint="/items/{id}"'
+    assert "# TYPE dspace_client_requests_total counter" in text
+    assert f'dspace_client_requests_total{{{labels},status="200"}} 1' in text
+    assert f'dspace_client_request_duration_seconds_bucket{{{labels},le="0.1"}} 0' in (
+        text
+    )
+    assert f'dspace_client_request_duration_seconds_bucket{{{labels},le="1.0"}} 1' in (
+        text
+    )
+    assert f'dspace_client_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in (
+        text
+    )
+    assert f"dspace_client_request_duration_seconds_sum{{{labels}}} 0.5" in text
+    assert f"dspace_client_response_bytes_received_total{{{labels}}} 10" in text
+    assert f"dspace_client_retries_total{{{labels}}} 1" in text
+    assert "dspace_client_handle_cache_hits_total 1" in text
+    assert text.endswith("\n")
+
+
+def test_client_metrics_to_prometheus_escapes_label_values():
+    metrics = ClientMetrics()
+    metrics.record_request("GET", '/search/"a\\b"\nc', 200, 0.5)
+    text = metrics.to_prometheus()
+    assert 'endpoint="/search/\\"a\\\\b\\"\\nc",status="200"} 1' in text
+
+
+def test_client_metrics_to_prometheus_includes_response_cache():
+    cache = ResponseCache()
+    cache.lookup("missing")
+    text = ClientMetrics(response_cache=cache).to_prometheus()
+    assert "dspace_client_response_cache_misses_total 1" in text
+    assert "dspace_client_response_cache_revalidations_total 0" in text
+
+
+def test_client_records_request_metrics(fake_adapter):
+    client = DSpaceClient("mock://dspace.edu/rest")
+    fake_adapter(
+        client,
+        (200, {"uuid": ITEM_UUID}, {}),
+        (201, {"uuid": "bitstream"}, {}),
+        (404, b"", {}),
+    )
+    client.get(f"/items/{ITEM_UUID}")
+    client.post(f"/items/{ITEM_UUID}/bitstreams", data=b"content")
+    with pytest.raises(requests.HTTPError):
+        client.get(f"/items/{ITEM_UUID}/metadata")
+    snapshot = client.metrics.snapshot()
+    assert [
+        (r["method"], r["endpoint"], r["status"]) for r in snapshot["requests"]
+    ] == [
+        ("GET", "/items/{id}", "200"),
+        ("GET", "/items/{id}/metadata", "404"),
+        ("POST", "/items/{id}/bitstreams", "201"),
+    ]
+    post = snapshot["endpoints"][2]
+    assert post["bytes_sent"] == len(b"content")
+    assert post["bytes_received"] == len(b'{"uuid": "bitstream"}')
+    assert snapshot["handle_cache"] == {"hits": 0, "misses": 0}
+
+
+def test_client_records_retries_and_errors(fake_adapter, monkeypatch):
+    monkeypatch.setattr("dspace.client.time.sleep", lambda delay: None)
+    client = DSpaceClient(
+        "mock://dspace.edu/rest", retry_policies={"GET": RetryPolicy(total=2)}
+    )
+    fake_adapter(
+        client,
+        requests.exceptions.ConnectionError("refused"),
+        (503, b"", {}),
+        (200, {}, {}),
+    )
+    client.get("/status")
+    snapshot = client.metrics.snapshot()
+    assert [(r["status"], r["count"]) for r in snapshot["requests"]] == [
+        ("200", 1),
+        ("503", 1),
+        ("error", 1),
+    ]
+    assert snapshot["endpoints"][0]["retries"] == 2
+    assert snapshot["endpoints"][0]["latency_count"] == 3
@@ -0,0 +1,74 @@
+# tests/test_progress.py
+import pytest
+
+from dspace.errors import TransferStalledError
+from dspace.progress import ProgressMeter, TransferProgress
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr("dspace.progress.time", clock)
+    return clock
+
+
+def test_transfer_progress_eta_and_fraction():
+    progress = TransferProgress(250, 1000, 5.0, 40.0, 50.0)
+    assert progress.eta == 15.0
+    assert progress.fraction == 0.25
+    assert TransferProgress(250, None, 5.0, 40.0, 50.0).eta is None
+    assert TransferProgress(0, 1000, 0.0, 0.0, 0.0).eta is None
+    assert TransferProgress(1000, 1000, 20.0, 50.0, 50.0, done=True).eta == 0.0
+
+
+def test_progress_meter_reports_at_most_once_per_interval(clock):
+    reports = []
+    meter = ProgressMeter(reports.append, interval=1.0)
+    meter.start(total_bytes=1000)
+    for _ in range(10):
+        clock.now += 0.25
+        meter.update(50)
+    assert [r.bytes_transferred for r in reports] == [200, 400]
+    assert reports[1].rate == 200.0
+    assert reports[1].average_rate == 200.0
+    assert reports[1].eta == 3.0
+    final = meter.finish()
+    assert final.done
+    assert final.bytes_transferred == 500
+    assert reports[-1] is final
+
+
+def test_progress_meter_aborts_transfer_below_min_rate(clock):
+    meter = ProgressMeter(interval=1.0, min_rate=100, stall_timeout=3.0)
+    meter.start(expression="bitstream.post(client, uuid)")
+    clock.now += 1
+    meter.update(1000)
+    clock.now += 2
+    meter.update(10)
+    clock.now += 1
+    meter.update(1000)
+    clock.now += 2
+    meter.update(10)
+    clock.now += 1
+    with pytest.raises(TransferStalledError) as e:
+        meter.update(10)
+    assert e.value.expression == "bitstream.post(client, uuid)"
+    assert e.value.rate == 10.0
+    assert e.value.duration == 3.0
+
+
+def test_progress_meter_start_resets_transfer(clock):
+    meter = ProgressMeter()
+    meter.start(total_bytes=10)
+    meter.update(10)
+    meter.start(total_bytes=20)
+    assert meter.bytes_transferred == 0
+    assert meter.total_bytes == 20
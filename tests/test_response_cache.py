@@ -0,0 +1,184 @@
+# tests/test_response_cache.py
+import pytest
+
+from dspace.client import DSpaceClient
+from dspace.response_cache import (
+    CacheEntry,
+    DiskCacheBackend,
+    MemoryCacheBackend,
+    ResponseCache,
+)
+
+BASE_URL = "https://dspace.example.edu/rest"
+ITEM_UUID = "229451b3-e943-46e8-a27e-f45d5c8aa0ec"
+ITEM = {"uuid": ITEM_UUID, "handle": "1721.1/131194", "name": "Item"}
+
+
+@pytest.fixture
+def cached_client():
+    return DSpaceClient(BASE_URL, response_cache=ResponseCache(ttl=60))
+
+
+def test_cache_entry_freshness():
+    entry = CacheEntry(200, {}, b"{}", stored=1000.0)
+    assert entry.is_fresh(60, now=1059.0)
+    assert not entry.is_fresh(60, now=1060.0)
+    entry = CacheEntry(200, {"cache-control": "max-age=5"}, b"{}", stored=1000.0)
+    assert not entry.is_fresh(60, now=1005.0)
+
+
+def test_cache_entry_validators():
+    entry = CacheEntry(
+        200, {"ETag": '"v1"', "Last-Modified": "Thu, 02 Sep 2021 14:57:52 GMT"}, b""
+    )
+    assert entry.validators() == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Thu, 02 Sep 2021 14:57:52 GMT",
+    }
+
+
+def test_cache_entry_round_trips_bytes():
+    entry = CacheEntry(200, {"ETag": '"v1"'}, b'{"a":\n1}', tags=[ITEM_UUID])
+    restored = CacheEntry.from_bytes(entry.to_bytes())
+    assert restored.content == b'{"a":\n1}'
+    assert restored.headers["etag"] == '"v1"'
+    assert restored.tags == (ITEM_UUID,)
+    assert restored.stored == entry.stored
+
+
+def test_memory_backend_evicts_least_recently_used_by_size():
+    backend = MemoryCacheBackend(max_bytes=10)
+    backend.set("a", CacheEntry(200, {}, b"aaaa"))
+    backend.set("b", CacheEntry(200, {}, b"bbbb"))
+    backend.get("a")
+    backend.set("c", CacheEntry(200, {}, b"cccc"))
+    assert backend.get("b") is None
+    assert backend.get("a") is not None
+    assert backend.size == 8
+    backend.set("d", CacheEntry(200, {}, b"d" * 11))
+    assert backend.get("d") is None
+
+
+def test_disk_backend_persists_and_evicts(tmp_path):
+    directory = str(tmp_path / "cache")
+    backend = DiskCacheBackend(directory)
+    backend.set("a", CacheEntry(200, {}, b"aaaa", tags=[ITEM_UUID]))
+    reopened = DiskCacheBackend(directory, max_bytes=backend.size * 2)
+    assert reopened.get("a").content == b"aaaa"
+    reopened.set("b", CacheEntry(200, {}, b"bbbb"))
+    reopened.set("c", CacheEntry(200, {}, b"cccc"))
+    assert reopened.get("a") is None
+    assert len(reopened) == 2
+    cache = ResponseCache(DiskCacheBackend(directory))
+    assert len(cache) == 2
+
+
+def test_disk_backend_invalidates_persisted_entries(tmp_path):
+    directory = str(tmp_path / "cache")
+    ResponseCache(DiskCacheBackend(directory)).backend.set(
+        "a", CacheEntry(200, {}, b"aaaa", tags=[ITEM_UUID])
+    )
+    cache = ResponseCache(DiskCacheBackend(directory))
+    assert cache.invalidate(f"/items/{ITEM_UUID}/metadata") == 1
+    assert cache.backend.get("a") is None
+
+
+def test_client_get_serves_fresh_response_from_cache(cached_client, fake_adapter):
+    adapter = fake_adapter(cached_client, (200, ITEM, {}))
+    first = cached_client.get(f"/items/{ITEM_UUID}", params={"expand": "metadata"})
+    second = cached_client.get(f"/items/{ITEM_UUID}", params={"expand": "metadata"})
+    assert first.json() == second.json() == ITEM
+    assert len(adapter.requests) == 1
+    assert cached_client.response_cache.hits == 1
+    assert cached_client.metrics.snapshot()["response_cache"] == {
+        "hits": 1,
+        "misses": 1,
+        "revalidations": 0,
+    }
+
+
+def test_client_get_revalidates_stale_response(fake_adapter):
+    client = DSpaceClient(BASE_URL, response_cache=ResponseCache(ttl=0))
+    adapter = fake_adapter(
+        client,
+        (200, ITEM, {"ETag": '"v1"'}),
+        (304, b"", {"ETag": '"v1"'}),
+        (200, dict(ITEM, name="Renamed"), {"ETag": '"v2"'}),
+    )
+    client.get(f"/items/{ITEM_UUID}")
+    assert client.get(f"/items/{ITEM_UUID}").json() == ITEM
+    assert adapter.requests[1].headers["If-None-Match"] == '"v1"'
+    assert client.get(f"/items/{ITEM_UUID}").json()["name"] == "Renamed"
+    assert client.response_cache.revalidations == 1
+
+
+def test_client_write_invalidates_cached_object(cached_client, fake_adapter):
+    adapter = fake_adapter(
+        cached_client,
+        (200, ITEM, {}),
+        (200, ITEM, {}),
+        (200, b"", {}),
+        (200, ITEM, {}),
+        (200, ITEM, {}),
+    )
+    cached_client.get("/handle/1721.1/131194")
+    cached_client.get(f"/items/{ITEM_UUID}")
+    cached_client.put(f"/items/{ITEM_UUID}/metadata", json=[])
+    cached_client.get("/handle/1721.1/131194")
+    cached_client.get(f"/items/{ITEM_UUID}")
+    assert len(adapter.requests) == 5
+
+
+def test_client_get_does_not_cache_streams_or_errors(cached_client, fake_adapter):
+    adapter = fake_adapter(
+        cached_client,
+        (200, ITEM, {}),
+        (200, ITEM, {}),
+        (200, ITEM, {"Cache-Control": "no-store"}),
+        (200, ITEM, {}),
+    )
+    cached_client.get(f"/items/{ITEM_UUID}", stream=True).close()
+    cached_client.get(f"/items/{ITEM_UUID}", headers={"Range": "bytes=0-1"})
+    cached_client.get(f"/items/{ITEM_UUID}")
+    cached_client.get(f"/items/{ITEM_UUID}")
+    assert len(adapter.requests) == 4
+
+
+def test_client_get_never_caches_status_and_separates_users(
+    cached_client, fake_adapter
+):
+    adapter = fake_adapter(
+        cached_client,
+        (200, {"authenticated": False}, {}),
+        (200, ITEM, {}),
+        (200, b"", {"Set-Cookie": "JSESSIONID=session; Path=/"}),
+        (200, {"authenticated": True}, {}),
+        (200, dict(ITEM, name="Restricted"), {}),
+        (200, dict(ITEM, name="Restricted"), {}),
+    )
+    assert cached_client.status().json()["authenticated"] is False
+    cached_client.get(f"/items/{ITEM_UUID}")
+    cached_client.login("user@example.edu", "password")
+    assert cached_client.status().json()["authenticated"] is True
+    assert cached_client.get(f"/items/{ITEM_UUID}").json()["name"] == "Restricted"
+    assert cached_client.get(f"/items/{ITEM_UUID}").json()["name"] == "Restricted"
+    assert len(adapter.requests) == 5
+
+
+@pytest.mark.parametrize("backend", ["memory", "disk"])
+def test_response_cache_prunes_tags_of_evicted_entries(backend, tmp_path, fake_adapter):
+    if backend == "memory":
+        storage = MemoryCacheBackend(max_bytes=1000)
+    else:
+        storage = DiskCacheBackend(str(tmp_path / "cache"), max_bytes=1000)
+    client = DSpaceClient(BASE_URL, response_cache=ResponseCache(storage))
+    cache = client.response_cache
+    responses = []
+    for i in range(50):
+        uuid = f"{i:08d}-e943-46e8-a27e-f45d5c8aa0ec"
+        responses.append((200, dict(ITEM, uuid=uuid, name="x" * 100), {}))
+    fake_adapter(client, *responses)
+    for i in range(50):
+        client.get(f"/items/{i:08d}-e943-46e8-a27e-f45d5c8aa0ec")
+    assert 0 < len(cache) < 50
+    assert len(cache._tagged) == len(cache._entry_tags) == len(cache)
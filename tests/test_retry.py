@@ -0,0 +1,173 @@
+# tests/test_retry.py
+import io
+
+import pytest
+import requests
+
+from dspace.client import DSpaceClient
+from dspace.retry import RetryPolicy, default_retry_policies, parse_retry_after
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("dspace.client.time.sleep", sleeps.append)
+    return sleeps
+
+
+@pytest.fixture
+def retrying_client():
+    return DSpaceClient(
+        "https://dspace-example.com/rest", retry_policies=default_retry_policies()
+    )
+
+
+def test_retry_policy_delay_backs_off_exponentially():
+    policy = RetryPolicy(backoff_factor=1.0, backoff_max=5.0, jitter=False)
+    assert [policy.delay(n) for n in range(4)] == [1.0, 2.0, 4.0, 5.0]
+
+
+def test_retry_policy_delay_with_jitter_is_bounded():
+    policy = RetryPolicy(backoff_factor=1.0)
+    assert all(0 <= policy.delay(2) <= 4.0 for _ in range(50))
+
+
+def test_retry_policy_delay_respects_retry_after_header():
+    response = requests.Response()
+    response.headers["Retry-After"] = "7"
+    assert RetryPolicy().delay(0, response) == 7.0
+    assert RetryPolicy(backoff_max=2.0).delay(0, response) == 2.0
+    assert (
+        RetryPolicy(respect_retry_after=False, jitter=False).delay(0, response) == 0.5
+    )
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not a date") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_client_retries_get_on_server_error(retrying_client, fake_adapter, sleeps):
+    adapter = fake_adapter(
+        retrying_client,
+        (503, {}, {"Retry-After": "1"}),
+        (502, {}, {}),
+        (200, {"okay": True}, {}),
+    )
+    response = retrying_client.get("/status")
+    assert response.json() == {"okay": True}
+    assert len(adapter.requests) == 3
+    assert sleeps[0] == 1.0
+    assert len(sleeps) == 2
+
+
+def test_client_retries_get_on_connection_error(retrying_client, fake_adapter, sleeps):
+    fake_adapter(
+        retrying_client,
+        requests.ConnectionError("connection reset"),
+        (200, {"okay": True}, {}),
+    )
+    assert retrying_client.get("/status").json() == {"okay": True}
+
+
+def test_client_raises_after_retries_exhausted(fake_adapter, sleeps):
+    client = DSpaceClient(
+        "https://dspace-example.com/rest", retry_policies={"get": RetryPolicy(total=2)}
+    )
+    adapter = fake_adapter(client, *[(500, {}, {})] * 3)
+    with pytest.raises(requests.HTTPError):
+        client.get("/status")
+    assert len(adapter.requests) == 3
+
+
+def test_client_does_not_retry_without_policy(fake_adapter, sleeps):
+    client = DSpaceClient("https://dspace-example.com/rest")
+    adapter = fake_adapter(client, (503, {}, {}))
+    with pytest.raises(requests.HTTPError):
+        client.get("/status")
+    assert len(adapter.requests) == 1
+    assert sleeps == []
+
+
+def test_client_does_not_retry_post_on_server_error(
+    retrying_client, fake_adapter, sleeps
+):
+    adapter = fake_adapter(retrying_client, (500, {}, {}))
+    with pytest.raises(requests.HTTPError):
+        retrying_client.post("/items/123/metadata", json=[])
+    assert len(adapter.requests) == 1
+
+
+def test_client_retries_post_with_seekable_body(retrying_client, fake_adapter, sleeps):
+    adapter = fake_adapter(retrying_client, (503, {}, {}), (200, {}, {}))
+    body = io.BytesIO(b"Test content")
+    body.read(5)
+    retrying_client.post("/items/123/bitstreams", data=body)
+    assert adapter.bodies == [b"content", b"content"]
+
+
+def test_client_does_not_retry_unseekable_body(retrying_client, fake_adapter, sleeps):
+    class Stream:
+        def read(self, size=-1):
+            return b""
+
+    adapter = fake_adapter(retrying_client, (503, {}, {}))
+    with pytest.raises(requests.HTTPError):
+        retrying_client.post("/items/123/bitstreams", data=Stream())
+    assert len(adapter.requests) == 1
+
+
+def test_client_does_not_retry_iterable_body(retrying_client, fake_adapter, sleeps):
+    retrying_client.retry_policies["POST"] = RetryPolicy(total=2)
+    adapter = fake_adapter(retrying_client, (503, {}, {}), (200, {}, {}))
+    body = (chunk for chunk in [b"Test ", b"content"])
+    with pytest.raises(requests.HTTPError):
+        retrying_client.post("/items/123/bitstreams", data=body)
+    assert len(adapter.requests) == 1
+    assert sleeps == []
+
+
+def test_client_reauthenticates_and_replays_on_unauthorized(fake_adapter, sleeps):
+    client = DSpaceClient("https://dspace-example.com/rest")
+    adapter = fake_adapter(
+        client,
+        (200, {}, {"Set-Cookie": "JSESSIONID=first; Path=/rest"}),
+        (401, {}, {}),
+        (200, {}, {"Set-Cookie": "JSESSIONID=second; Path=/rest"}),
+        (200, {"authenticated": True}, {}),
+    )
+    client.login("user@example.com", "password")
+    assert client.cookies["JSESSIONID"] == "first"
+    assert client.status().json() == {"authenticated": True}
+    assert client.cookies["JSESSIONID"] == "second"
+    assert [r.path_url for r in adapter.requests] == [
+        "/rest/login",
+        "/rest/status",
+        "/rest/login",
+        "/rest/status",
+    ]
+    assert "JSESSIONID=second" in adapter.requests[-1].headers["Cookie"]
+
+
+def test_client_reauthenticates_only_once_per_request(fake_adapter, sleeps):
+    client = DSpaceClient("https://dspace-example.com/rest")
+    fake_adapter(
+        client,
+        (200, {}, {"Set-Cookie": "JSESSIONID=first; Path=/rest"}),
+        (403, {}, {}),
+        (200, {}, {"Set-Cookie": "JSESSIONID=second; Path=/rest"}),
+        (403, {}, {}),
+    )
+    client.login("user@example.com", "password")
+    with pytest.raises(requests.HTTPError):
+        client.status()
+
+
+def test_client_without_login_does_not_reauthenticate(fake_adapter, sleeps):
+    client = DSpaceClient("https://dspace-example.com/rest")
+    adapter = fake_adapter(client, (401, {}, {}))
+    with pytest.raises(requests.HTTPError):
+        client.status()
+    assert len(adapter.requests) == 1
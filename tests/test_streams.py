@@ -0,0 +1,150 @@
+# tests/test_streams.py
+import hashlib
+import io
+import time
+
+import pytest
+
+from dspace.streams import BufferReader, HashingReader, ReadAheadReader, map_file
+
+
+def test_hashing_reader_hashes_bytes_read():
+    reader = HashingReader(io.BytesIO(b"Test content"), algorithms=["md5", "SHA256"])
+    assert reader.len == 12
+    assert reader.read(4) == b"Test"
+    assert reader.read() == b" content"
+    assert reader.hexdigests() == {
+        "md5": "8bfa8e0684108f419933a5995264d150",
+        "sha256": hashlib.sha256(b"Test content").hexdigest(),
+    }
+
+
+def test_hashing_reader_iterates_in_blocks():
+    reader = HashingReader(io.BytesIO(b"x" * 10), block_size=4)
+    assert list(reader) == [b"xxxx", b"xxxx", b"xx"]
+    assert reader.hexdigests()["md5"] == hashlib.md5(b"x" * 10).hexdigest()
+
+
+def test_hashing_reader_close_closes_wrapped_file():
+    raw = io.BytesIO(b"Test content")
+    HashingReader(raw).close()
+    assert raw.closed
+
+
+def test_hashing_reader_close_raw_false_leaves_wrapped_file_open():
+    raw = io.BytesIO(b"Test content")
+    HashingReader(raw, close_raw=False).close()
+    assert not raw.closed
+
+
+def test_buffer_reader_reads_views_without_copying():
+    content = b"Test content"
+    reader = BufferReader(content)
+    data = reader.read(4)
+    assert isinstance(data, memoryview)
+    assert data.obj is content
+    assert data == b"Test"
+    assert reader.tell() == 4
+    assert reader.read() == b" content"
+    assert reader.read(4) == b""
+    assert reader.seek(-7, io.SEEK_END) == 5
+    assert b"".join(reader) == b"content"
+
+
+def test_buffer_reader_sets_content_length_from_position():
+    reader = BufferReader(bytearray(b"Test content"))
+    reader.seek(5)
+    hashing_reader = HashingReader(reader)
+    assert hashing_reader.len == 7
+    assert hashing_reader.read() == b"content"
+    assert hashing_reader.hexdigests()["md5"] == hashlib.md5(b"content").hexdigest()
+
+
+def test_buffer_reader_close_releases_view_and_calls_on_close():
+    closed = []
+    reader = BufferReader(b"Test content", on_close=lambda: closed.append(True))
+    reader.close()
+    reader.close()
+    assert reader.closed
+    assert closed == [True]
+    with pytest.raises(ValueError):
+        reader.read()
+
+
+def test_map_file_reads_file_and_closes_map(tmp_path):
+    path = tmp_path / "file.bin"
+    path.write_bytes(b"Test content")
+    reader = map_file(str(path))
+    assert len(reader) == 12
+    assert reader.read() == b"Test content"
+    reader.close()
+    assert reader.closed
+
+
+def test_map_file_empty_file(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    assert map_file(str(path)).read() == b""
+
+
+class SlowReader(io.BytesIO):
+    def __init__(self, content, fail_after=None):
+        super().__init__(content)
+        self.reads = 0
+        self.fail_after = fail_after
+
+    def read(self, size=-1):
+        self.reads += 1
+        if self.fail_after is not None and self.reads > self.fail_after:
+            raise OSError("connection reset")
+        return super().read(size)
+
+
+def test_read_ahead_reader_reads_all_bytes_in_order():
+    content = bytes(range(256)) * 100
+    reader = ReadAheadReader(io.BytesIO(content), buffer_size=1000, depth=2)
+    assert reader.len == len(content)
+    chunks = []
+    while True:
+        data = reader.read(700)
+        if not data:
+            break
+        chunks.append(data)
+    assert b"".join(chunks) == content
+    assert reader.read(700) == b""
+
+
+def test_read_ahead_reader_read_all():
+    reader = ReadAheadReader(io.BytesIO(b"Test content"), buffer_size=5)
+    assert reader.read(2) == b"Te"
+    assert reader.read() == b"st content"
+    assert reader.read() == b""
+
+
+def test_read_ahead_reader_bounds_buffers_read_ahead():
+    raw = SlowReader(b"x" * 100)
+    reader = ReadAheadReader(raw, buffer_size=10, depth=2)
+    time.sleep(0.1)
+    assert raw.reads <= 4
+    reader.close()
+    assert raw.closed
+
+
+def test_read_ahead_reader_raises_source_errors():
+    reader = ReadAheadReader(SlowReader(b"x" * 100, fail_after=1), buffer_size=10)
+    assert reader.read(10) == b"x" * 10
+    with pytest.raises(OSError):
+        reader.read(10)
+
+
+def test_hashing_reader_wraps_read_ahead_reader():
+    reader = HashingReader(ReadAheadReader(io.BytesIO(b"Test content"), buffer_size=3))
+    assert reader.len == 12
+    assert b"".join(reader) == b"Test content"
+    assert reader.hexdigests()["md5"] == "8bfa8e0684108f419933a5995264d150"
+
+
+def test_read_ahead_reader_close_raw_false_leaves_wrapped_file_open():
+    raw = io.BytesIO(b"Test content")
+    ReadAheadReader(raw, close_raw=False).close()
+    assert not raw.closed
@@ -0,0 +1,140 @@
+# tests/test_throttle.py
+import threading
+import time
+
+import pytest
+import requests
+
+from dspace.client import DSpaceClient
+from dspace.throttle import RateLimiter
+
+
+def test_rate_limiter_limits_requests_per_second(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("dspace.throttle.time.sleep", sleeps.append)
+    limiter = RateLimiter(requests_per_second=10, burst=2)
+    for _ in range(4):
+        limiter.release(limiter.acquire())
+    assert len(sleeps) == 2
+    assert sleeps[0] == pytest.approx(0.1, abs=0.01)
+    assert sleeps[1] == pytest.approx(0.2, abs=0.01)
+
+
+def test_rate_limiter_without_rate_does_not_wait(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("dspace.throttle.time.sleep", sleeps.append)
+    limiter = RateLimiter()
+    for _ in range(100):
+        limiter.release(limiter.acquire())
+    assert sleeps == []
+
+
+def test_rate_limiter_grows_limit_additively_when_healthy():
+    limiter = RateLimiter(initial_concurrency=2, max_concurrency=3)
+    for _ in range(2):
+        limiter.release(limiter.acquire())
+    assert limiter.limit == pytest.approx(2.0 + 1 / 2 + 1 / 2.5)
+    for _ in range(10):
+        limiter.release(limiter.acquire())
+    assert limiter.limit == 3
+
+
+def test_rate_limiter_decreases_limit_multiplicatively_when_overloaded():
+    limiter = RateLimiter(initial_concurrency=16, min_concurrency=2, cooldown=0)
+    limiter.release(limiter.acquire(), overloaded=True)
+    assert limiter.limit == 8
+    for _ in range(5):
+        limiter.release(limiter.acquire(), overloaded=True)
+    assert limiter.limit == 2
+
+
+def test_rate_limiter_decreases_at_most_once_per_cooldown():
+    limiter = RateLimiter(initial_concurrency=16, cooldown=60)
+    limiter.release(limiter.acquire(), overloaded=True)
+    limiter.release(limiter.acquire(), overloaded=True)
+    assert limiter.limit == 8
+
+
+def test_rate_limiter_treats_high_latency_as_overload(monkeypatch):
+    limiter = RateLimiter(initial_concurrency=8, cooldown=0)
+    clock = iter([0.0, 0.1, 1.0, 2.0])
+    monkeypatch.setattr("dspace.throttle.time.monotonic", lambda: next(clock))
+    limiter.release(limiter.acquire())
+    limit = limiter.limit
+    limiter.release(limiter.acquire())
+    assert limiter.limit == limit * 0.5
+
+
+def test_rate_limiter_compares_latency_per_key(monkeypatch):
+    limiter = RateLimiter(initial_concurrency=8, cooldown=0)
+    clock = iter([0.0, 0.01, 1.0, 2.0, 3.0, 4.1])
+    monkeypatch.setattr("dspace.throttle.time.monotonic", lambda: next(clock))
+    limiter.release(limiter.acquire(), key="GET /status")
+    limiter.release(limiter.acquire(), key="GET /collections/{id}/items")
+    limiter.release(limiter.acquire(), key="GET /collections/{id}/items")
+    assert limiter.limit > 8
+
+
+def test_rate_limiter_ignores_latency_when_not_sampled(monkeypatch):
+    limiter = RateLimiter(initial_concurrency=8, cooldown=0)
+    clock = iter([0.0, 0.1, 1.0, 2.0])
+    monkeypatch.setattr("dspace.throttle.time.monotonic", lambda: next(clock))
+    limiter.release(limiter.acquire())
+    limit = limiter.limit
+    limiter.release(limiter.acquire(), sample_latency=False)
+    assert limiter.limit > limit
+
+
+def test_rate_limiter_bounds_requests_in_flight():
+    limiter = RateLimiter(initial_concurrency=2, max_concurrency=2)
+    peak = []
+
+    def work():
+        started = limiter.acquire()
+        peak.append(limiter.in_flight)
+        time.sleep(0.02)
+        limiter.release(started)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(peak) <= 2
+    assert limiter.in_flight == 0
+
+
+def test_client_requests_go_through_rate_limiter(fake_adapter):
+    limiter = RateLimiter(initial_concurrency=8, cooldown=0)
+    client = DSpaceClient("https://dspace-example.com/rest", rate_limiter=limiter)
+    fake_adapter(client, (200, {}, {}), (503, {}, {}))
+    client.get("/status")
+    with pytest.raises(requests.HTTPError):
+        client.get("/status")
+    assert limiter.in_flight == 0
+    assert limiter.limit < 8
+
+
+def test_client_releases_rate_limiter_on_connection_error(fake_adapter):
+    limiter = RateLimiter(initial_concurrency=8, cooldown=0)
+    client = DSpaceClient("https://dspace-example.com/rest", rate_limiter=limiter)
+    fake_adapter(client, requests.ConnectionError("connection reset"))
+    with pytest.raises(requests.ConnectionError):
+        client.get("/status")
+    assert limiter.in_flight == 0
+    assert limiter.limit == 4
+
+
+def test_client_holds_rate_limiter_slot_until_stream_closed(fake_adapter):
+    limiter = RateLimiter(initial_concurrency=8)
+    client = DSpaceClient("https://dspace-example.com/rest", rate_limiter=limiter)
+    fake_adapter(client, (200, b"content", {}), (200, [1, 2], {}))
+    with client.get("/bitstreams/1/retrieve", stream=True) as response:
+        assert limiter.in_flight == 1
+        assert response.raw.read() == b"content"
+    assert limiter.in_flight == 0
+    response.close()
+    assert limiter.in_flight == 0
+    items = client.iter_json("/items")
+    assert next(items) == 1
+    assert limiter.in_flight == 0
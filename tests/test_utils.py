@@ -1,8 +1,11 @@
 # tests/test_utils.py
+import json
+
 import pytest
 
+from dspace.client import DSpaceClient
 from dspace.errors import MissingIdentifierError
-from dspace.utils import select_identifier
+from dspace.utils import iter_community_collections, paginate, select_identifier
 
 
 def test_select_identifier_with_handle(my_vcr, test_client, vcr_env):
@@ -11,6 +14,15 @@ def test_select_identifier_with_handle(my_vcr, test_client, vcr_env):
         assert id == "72dfcada-de27-4ce7-99cc-68266ebfd00c"
 
 
+def test_select_identifier_with_handle_uses_cache(my_vcr, test_client):
+    with my_vcr.use_cassette("tests/vcr_cassettes/client/get_object_by_handle.yaml"):
+        first = select_identifier(test_client, handle="1721.1/130884", uuid=None)
+        second = select_identifier(test_client, handle="1721.1/130884", uuid=None)
+    assert first == second == "72dfcada-de27-4ce7-99cc-68266ebfd00c"
+    assert test_client.handle_cache.misses == 1
+    assert test_client.handle_cache.hits == 1
+
+
 def test_select_identifier_with_uuid(test_client):
     id = select_identifier(test_client, handle=None, uuid="123456")
     assert id == "123456"
@@ -19,3 +31,72 @@ def test_select_identifier_with_uuid(test_client):
 def test_select_identifier_without_id_raises_error(test_client):
     with pytest.raises(MissingIdentifierError):
         select_identifier(test_client, None, None)
+
+
+def test_paginate_requests_pages_until_short_page(monkeypatch, test_client):
+    requested = []
+
+    class FakeResponse:
+        def __init__(self, page):
+            self.content = json.dumps(page).encode()
+
+    def fake_get(endpoint, params=None):
+        requested.append(params)
+        offset = params["offset"]
+        return FakeResponse(list(range(offset, min(offset + params["limit"], 5))))
+
+    monkeypatch.setattr(test_client, "get", fake_get)
+    objects = list(paginate(test_client, "/items", params={"expand": "none"}, limit=2))
+    assert objects == [0, 1, 2, 3, 4]
+    assert requested == [
+        {"expand": "none", "limit": 2, "offset": 0},
+        {"expand": "none", "limit": 2, "offset": 2},
+        {"expand": "none", "limit": 2, "offset": 4},
+    ]
+
+
+def test_paginate_without_prefetch(monkeypatch, test_client):
+    class FakeResponse:
+        def __init__(self, page):
+            self.content = json.dumps(page).encode()
+
+    pages = iter([[1, 2], [3, 4], []])
+    monkeypatch.setattr(
+        test_client, "get", lambda endpoint, params=None: FakeResponse(next(pages))
+    )
+    assert list(paginate(test_client, "/items", limit=2, prefetch=False)) == [
+        1,
+        2,
+        3,
+        4,
+    ]
+
+
+def test_paginate_with_stream_decodes_pages_incrementally(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(client, (200, [1, 2], {}), (200, [3], {}))
+    assert list(paginate(client, "/items", limit=2, stream=True)) == [1, 2, 3]
+    assert [r.url.split("?")[1] for r in adapter.requests] == [
+        "limit=2&offset=0",
+        "limit=2&offset=2",
+    ]
+
+
+def test_iter_community_collections(fake_adapter):
+    client = DSpaceClient("https://dspace.example.edu/rest")
+    adapter = fake_adapter(
+        client,
+        (
+            200,
+            [
+                {"uuid": "5c1e7a0b", "name": "Collection 1", "type": "collection"},
+                {"uuid": "8d2f4e19", "name": "Collection 2", "type": "collection"},
+            ],
+            {},
+        ),
+    )
+    collections = list(iter_community_collections(client, community_uuid="c8a2c6f1"))
+    assert [c["name"] for c in collections] == ["Collection 1", "Collection 2"]
+    assert adapter.requests[0].path_url == (
+        "/rest/communities/c8a2c6f1/collections?limit=100&offset=0"
+    )